@@ -0,0 +1,45 @@
+"""
+Micro-benchmark of the per-set cost of `WorkingSet.__str__`.
+
+Compares the per-class formatters with the cost of `model_dump()` alone, which the previous
+implementation formatted (its output is checked in tests/unit_tests/test_sets.py).
+
+    python benchmarks/bench_set_formatting.py
+"""
+
+import datetime
+import timeit
+
+from pr_pro.sets import (
+    DurationSet,
+    PowerExerciseSet,
+    RepsAndWeightsSet,
+    RepsDistanceSet,
+    RepsRPESet,
+    RepsSet,
+    WorkingSet,
+)
+
+SETS: list[WorkingSet] = [
+    RepsSet(reps=5),
+    RepsRPESet(reps=3, rpe=8),
+    RepsAndWeightsSet(reps=5, weight=102.5, percentage=0.8, relative_percentage=0.9),
+    PowerExerciseSet(reps=2, weight=60, percentage=0.7),
+    RepsDistanceSet(reps=4, distance=20.0),
+    DurationSet(duration=datetime.timedelta(seconds=45)),
+]
+
+
+def main(number: int = 20_000, repeat: int = 5):
+    print(f'{"set type":<20}{"model_dump (us)":>18}{"str (us)":>12}{"ratio":>10}')
+    for ws in SETS:
+        dump = min(timeit.repeat(ws.model_dump, number=number, repeat=repeat))
+        formatted = min(timeit.repeat(lambda: str(ws), number=number, repeat=repeat))
+        print(
+            f'{type(ws).__name__:<20}{dump / number * 1e6:>18.2f}'
+            f'{formatted / number * 1e6:>12.2f}{dump / formatted:>9.1f}x'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+"""
+Benchmark suite measuring wall time and peak memory across synthetic program sizes.
+
+    python benchmarks/run_benchmarks.py                   # run and compare with the baseline
+    python benchmarks/run_benchmarks.py --sizes 1000      # quick run
+    python benchmarks/run_benchmarks.py --save-baseline   # store the results as new baseline
+
+Results are written to `benchmarks/results.json`. A benchmark is flagged as regression when its
+time or peak memory exceeds the baseline by more than `--threshold` (and a small absolute
+tolerance), in which case the script exits with code 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import gc
+import importlib.metadata
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+from pr_pro.configs import ComputeConfig
+from pr_pro.program import Program
+from pr_pro.sets import create_sets_dataframe
+from pr_pro.synthetic import SyntheticProgramConfig, generate_program
+from pr_pro.workout_component import SingleExercise
+
+BENCHMARK_DIR = Path(__file__).parent
+DEFAULT_RESULTS_FILE = BENCHMARK_DIR / 'results.json'
+DEFAULT_BASELINE_FILE = BENCHMARK_DIR / 'baseline.json'
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Modules of the core modeling api (as in tests/test_import_time.py) and the budget of their
+# import time in a fresh interpreter (including pydantic, without pandas)
+CORE_MODULES = (
+    'pr_pro.program',
+    'pr_pro.example',
+    'pr_pro.progression',
+    'pr_pro.storage',
+    'pr_pro.synthetic',
+)
+IMPORT_TIME_BUDGET = 0.6  # seconds
+
+# Differences below these are considered noise
+TIME_TOLERANCE = 0.002  # seconds
+MEMORY_TOLERANCE = 0.5  # MB
+
+# Setup (not measured) that returns the function to measure
+Setup = Callable[[Program, Path], Callable[[], object]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    setup: Setup
+    computed: bool = True  # Whether the benchmark runs on a computed program
+    max_sets: int | None = None  # Skipped for larger programs unless run with --all
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    n_sets: int
+    time: float  # Minimum wall time over the repeats in seconds
+    peak_memory: float  # Peak traced memory in MB
+
+
+def _setup_compute(program: Program, tmp_dir: Path) -> Callable[[], object]:
+    program = program.model_copy(deep=True)
+    return lambda: program.compute_values(ComputeConfig())
+
+
+def _setup_compute_versioned(program: Program, tmp_dir: Path) -> Callable[[], object]:
+    # A new best value of every exercise every 4 weeks (about 12 sessions)
+    program = program.model_copy(deep=True)
+    session_ids = list(program.workout_session_dict)
+    for i, session_id in enumerate(session_ids[::12]):
+        for exercise, value in list(program.best_exercise_values.items()):
+            program.add_best_exercise_value(
+                exercise, value * (1 + 0.02 * i), from_session=session_id
+            )
+    return lambda: program.compute_values(ComputeConfig())
+
+
+def _setup_json_round_trip(program: Program, tmp_dir: Path) -> Callable[[], object]:
+    file_path = tmp_dir / 'program.json'
+
+    def run():
+        program.write_json_file(file_path)
+        return Program.from_json_file(file_path)
+
+    return run
+
+
+def _setup_str(program: Program, tmp_dir: Path) -> Callable[[], object]:
+    return lambda: str(program)
+
+
+def _setup_sets_dataframes(program: Program, tmp_dir: Path) -> Callable[[], object]:
+    sets = [
+        component.sets
+        for session in program.workout_session_dict.values()
+        for component in session.workout_components
+        if isinstance(component, SingleExercise)
+    ]
+    return lambda: [create_sets_dataframe(s) for s in sets]
+
+
+def _setup_pdf_export(program: Program, tmp_dir: Path) -> Callable[[], object]:
+    file_path = tmp_dir / 'program.pdf'
+    return lambda: program.export_to_pdf(file_path)
+
+
+def _setup_from_prev_chain(program: Program, tmp_dir: Path) -> Callable[[], object]:
+    # Progression over one component per session, as in week by week programs
+    component = next(
+        c
+        for session in program.workout_session_dict.values()
+        for c in session.workout_components
+        if isinstance(c, SingleExercise) and c.sets and hasattr(c.sets[0], 'reps')
+    )
+    n_steps = len(program.workout_session_dict)
+
+    def run():
+        current = component
+        for _ in range(n_steps):
+            current = SingleExercise.from_prev_component(current, reps=+0)
+        return current
+
+    return run
+
+
+BENCHMARKS = [
+    Benchmark('compute_values', _setup_compute, computed=False),
+    Benchmark('compute_values_versioned', _setup_compute_versioned, computed=False),
+    Benchmark('json_round_trip', _setup_json_round_trip),
+    Benchmark('str', _setup_str),
+    Benchmark('create_sets_dataframe', _setup_sets_dataframes, max_sets=10_000),
+    Benchmark('export_program_to_pdf', _setup_pdf_export, max_sets=10_000),
+    Benchmark('from_prev_component_chain', _setup_from_prev_chain),
+]
+
+
+def measure(setup: Callable[[], Callable[[], object]], repeat: int) -> tuple[float, float]:
+    """Returns the minimum wall time over `repeat` runs and the peak memory of a traced run."""
+    times = []
+    for _ in range(repeat):
+        run = setup()
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    # Tracing slows down the execution, hence memory is measured in a separate run
+    run = setup()
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak / 1e6
+
+
+def measure_import_time(module: str, repeat: int) -> float:
+    """Import time in a fresh interpreter (minimum over the repeats)."""
+    code = (
+        'import time; start = time.perf_counter(); '
+        f'import {module}; print(time.perf_counter() - start)'
+    )
+    times = [
+        float(subprocess.run([sys.executable, '-c', code], capture_output=True, check=True).stdout)
+        for _ in range(repeat)
+    ]
+    return min(times)
+
+
+def run_benchmarks(
+    sizes: list[int], repeat: int, names: list[str] | None, run_all: bool
+) -> list[BenchmarkResult]:
+    results = []
+    for module in ('pr_pro', 'pr_pro.program', ', '.join(CORE_MODULES)):
+        name = 'import core modules' if module.startswith('pr_pro.program,') else f'import {module}'
+        if names is None or name in names:
+            results.append(BenchmarkResult(name, 0, measure_import_time(module, repeat), 0.0))
+            print(f'{name:<30}{results[-1].time:>10.4f}s')
+
+    benchmarks = [b for b in BENCHMARKS if names is None or b.name in names]
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        for n_sets in sizes:
+            program = generate_program(SyntheticProgramConfig(n_sets=n_sets), seed=0)
+            computed_program = program.model_copy(deep=True)
+            computed_program.compute_values(ComputeConfig())
+
+            for benchmark in benchmarks:
+                if benchmark.max_sets is not None and n_sets > benchmark.max_sets and not run_all:
+                    continue
+                benchmark_program = computed_program if benchmark.computed else program
+                try:
+                    wall_time, peak_memory = measure(
+                        lambda: benchmark.setup(benchmark_program, tmp_dir), repeat
+                    )
+                except ImportError as e:
+                    print(f'Skipping {benchmark.name}: {e}')
+                    continue
+                results.append(BenchmarkResult(benchmark.name, n_sets, wall_time, peak_memory))
+                print(
+                    f'{benchmark.name:<30}{n_sets:>8} sets{wall_time:>10.4f}s'
+                    f'{peak_memory:>10.1f} MB'
+                )
+    return results
+
+
+def compare_with_baseline(
+    results: list[BenchmarkResult], baseline: list[BenchmarkResult], threshold: float
+) -> list[str]:
+    """Returns a description of every result that regressed compared to the baseline."""
+    baseline_by_key = {(b.name, b.n_sets): b for b in baseline}
+    regressions = []
+    for result in results:
+        base = baseline_by_key.get((result.name, result.n_sets))
+        if base is None:
+            continue
+        if result.time > base.time * threshold and result.time - base.time > TIME_TOLERANCE:
+            regressions.append(
+                f'{result.name} ({result.n_sets} sets): time {base.time:.4f}s -> '
+                f'{result.time:.4f}s ({result.time / base.time:.2f}x)'
+            )
+        if (
+            result.peak_memory > base.peak_memory * threshold
+            and result.peak_memory - base.peak_memory > MEMORY_TOLERANCE
+        ):
+            regressions.append(
+                f'{result.name} ({result.n_sets} sets): peak memory {base.peak_memory:.1f} MB '
+                f'-> {result.peak_memory:.1f} MB'
+            )
+    return regressions
+
+
+def check_import_time_budget(results: list[BenchmarkResult]) -> list[str]:
+    """Returns a description of the core modules' import time, if it exceeds the budget."""
+    return [
+        f'{r.name}: {r.time:.4f}s exceeds the budget of {IMPORT_TIME_BUDGET}s'
+        for r in results
+        if r.name == 'import core modules' and r.time > IMPORT_TIME_BUDGET
+    ]
+
+
+def write_results(file_path: Path, results: list[BenchmarkResult]) -> None:
+    data = {
+        'metadata': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'pr_pro': importlib.metadata.version('pr-pro'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': [asdict(r) for r in results],
+    }
+    with open(file_path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def read_results(file_path: Path) -> list[BenchmarkResult]:
+    with open(file_path, 'r') as f:
+        return [BenchmarkResult(**r) for r in json.load(f)['results']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--benchmarks', nargs='+', help='Only run the given benchmarks.')
+    parser.add_argument('--all', action='store_true', help='Ignore the size limits.')
+    parser.add_argument('--output', type=Path, default=DEFAULT_RESULTS_FILE)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=1.25)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.repeat, args.benchmarks, args.all)
+    write_results(args.output, results)
+    print(f'Results written to {args.output}')
+
+    regressions = check_import_time_budget(results)
+    if args.save_baseline:
+        write_results(args.baseline, results)
+        print(f'Baseline written to {args.baseline}')
+    elif not args.baseline.exists():
+        print(f'No baseline found at {args.baseline}, run with --save-baseline to create one.')
+    else:
+        regressions += compare_with_baseline(results, read_results(args.baseline), args.threshold)
+
+    if regressions:
+        print('Regressions:')
+        for regression in regressions:
+            print(f'  {regression}')
+        sys.exit(1)
+    print('No regressions compared to the baseline.')
+
+
+if __name__ == '__main__':
+    main()
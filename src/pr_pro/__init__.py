@@ -0,0 +1,5 @@
+def main() -> int:
+    """Entry point of the `pr-pro` command, see `pr_pro.cli`."""
+    from pr_pro.cli import main
+
+    return main()
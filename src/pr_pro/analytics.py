@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+
+from pr_pro.workout_component import SingleExercise
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+    from pr_pro.program import Program
+
+# Lower bounds of the intensity zones (percentage of the best exercise value)
+INTENSITY_ZONES = (0.0, 0.6, 0.7, 0.8, 0.9)
+INTENSITY_ZONE_LABELS = ('<60%', '60-70%', '70-80%', '80-90%', '>=90%')
+HIGH_INTENSITY = 0.8
+
+Grouping = Literal['exercise', 'session', 'phase', 'week', 'category']
+
+
+@dataclass(frozen=True)
+class VolumeStats:
+    n_sets: int
+    volume: int  # reps
+    tonnage: float  # reps x weight
+    mean_intensity: float | None  # mean percentage of the best value, weighted by reps
+    lifts_above_80: int  # reps at or above 80% of the best value
+    max_weight: float | None
+
+
+@dataclass(frozen=True)
+class ProgramAnalytics:
+    """
+    Columnar (one row per set) representation of a computed program for volume, tonnage and
+    intensity statistics. Statistics are aggregated with vectorized group-bys over the columns.
+    Use `get_program_analytics` to get the cached analytics of a program.
+    """
+
+    session_ids: tuple[str, ...]
+    exercise_names: tuple[str, ...]
+    exercise_categories: tuple[str, ...]  # per exercise
+    phases: dict[str, tuple[int, ...]]  # session codes per phase
+    session_weeks: tuple[str | None, ...]  # per session
+    session_codes: np.ndarray
+    exercise_codes: np.ndarray
+    reps: np.ndarray  # 0 for sets without reps
+    weight: np.ndarray  # nan for sets without (computed) weight
+    percentage: np.ndarray  # nan for sets without (computed) percentage
+
+    @staticmethod
+    def from_program(
+        program: Program, categories: dict[str, str] | None = None
+    ) -> ProgramAnalytics:
+        """
+        Collects the columns in a single pass over all sets. `categories` maps exercise names to a
+        category (e.g., muscle group), exercises without category use their exercise type.
+        """
+        categories = categories or {}
+        session_ids = list(program.workout_session_dict)
+        exercise_codes_by_name: dict[str, int] = {}
+        exercise_categories: list[str] = []
+
+        session_codes, exercise_codes, rows = [], [], []
+        for session_code, session in enumerate(program.workout_session_dict.values()):
+            for component in session.workout_components:
+                if isinstance(component, SingleExercise):
+                    exercise_sets = {component.exercise: component.sets}
+                else:
+                    exercise_sets = component.exercise_sets_dict
+
+                for exercise, sets in exercise_sets.items():
+                    exercise_code = exercise_codes_by_name.get(exercise.name)
+                    if exercise_code is None:
+                        exercise_code = exercise_codes_by_name[exercise.name] = len(
+                            exercise_codes_by_name
+                        )
+                        exercise_categories.append(
+                            categories.get(exercise.name, type(exercise).__name__)
+                        )
+
+                    for working_set in sets:
+                        reps = getattr(working_set, 'reps', None)
+                        weight = getattr(working_set, 'weight', None)
+                        percentage = getattr(working_set, 'percentage', None)
+                        rows.append(
+                            (
+                                0 if reps is None else reps,
+                                math.nan if weight is None else weight,
+                                math.nan if percentage is None else percentage,
+                            )
+                        )
+                    session_codes.extend([session_code] * len(sets))
+                    exercise_codes.extend([exercise_code] * len(sets))
+
+        values = np.array(rows, dtype=float).reshape(len(rows), 3)
+        session_positions = {s: i for i, s in enumerate(session_ids)}
+        week_of_session = program.get_session_index().week_of_session
+        return ProgramAnalytics(
+            session_ids=tuple(session_ids),
+            exercise_names=tuple(exercise_codes_by_name),
+            exercise_categories=tuple(exercise_categories),
+            phases={
+                phase: tuple(session_positions[s] for s in phase_session_ids)
+                for phase, phase_session_ids in program.program_phases.items()
+            },
+            session_weeks=tuple(week_of_session.get(s) for s in session_ids),
+            session_codes=np.array(session_codes, dtype=np.intp),
+            exercise_codes=np.array(exercise_codes, dtype=np.intp),
+            reps=values[:, 0],
+            weight=values[:, 1],
+            percentage=values[:, 2],
+        )
+
+    def __len__(self) -> int:
+        return len(self.reps)
+
+    def _aggregate(
+        self, rows: np.ndarray | slice, codes: np.ndarray, n_groups: int
+    ) -> list[VolumeStats]:
+        """Aggregates the given rows into `n_groups` groups by their group codes."""
+        reps, weight, percentage = self.reps[rows], self.weight[rows], self.percentage[rows]
+        has_percentage = ~np.isnan(percentage)
+
+        n_sets = np.bincount(codes, minlength=n_groups)
+        volume = np.bincount(codes, weights=reps, minlength=n_groups)
+        tonnage = np.bincount(codes, weights=reps * np.nan_to_num(weight), minlength=n_groups)
+        intensity_reps = np.bincount(codes, weights=reps * has_percentage, minlength=n_groups)
+        intensity_sum = np.bincount(
+            codes, weights=reps * np.nan_to_num(percentage), minlength=n_groups
+        )
+        lifts_above_80 = np.bincount(
+            codes,
+            weights=reps * (np.nan_to_num(percentage) >= HIGH_INTENSITY - 1e-9),
+            minlength=n_groups,
+        )
+        max_weight = np.full(n_groups, np.nan)
+        np.fmax.at(max_weight, codes, weight)
+
+        return [
+            VolumeStats(
+                n_sets=int(n_sets[i]),
+                volume=int(volume[i]),
+                tonnage=float(tonnage[i]),
+                mean_intensity=(
+                    float(intensity_sum[i] / intensity_reps[i]) if intensity_reps[i] > 0 else None
+                ),
+                lifts_above_80=int(lifts_above_80[i]),
+                max_weight=None if np.isnan(max_weight[i]) else float(max_weight[i]),
+            )
+            for i in range(n_groups)
+        ]
+
+    def _get_group_codes(
+        self, by: Grouping
+    ) -> tuple[np.ndarray | slice, np.ndarray, tuple[str, ...]]:
+        """Returns the selected rows, their group codes and the group names."""
+        if by == 'exercise':
+            return slice(None), self.exercise_codes, self.exercise_names
+        if by == 'session':
+            return slice(None), self.session_codes, self.session_ids
+        if by == 'category':
+            names = tuple(dict.fromkeys(self.exercise_categories))
+            category_codes = np.array(
+                [names.index(c) for c in self.exercise_categories], dtype=np.intp
+            )
+            return slice(None), category_codes[self.exercise_codes], names
+        if by == 'week':
+            names = tuple(dict.fromkeys(w for w in self.session_weeks if w is not None))
+            week_codes = np.array(
+                [-1 if w is None else names.index(w) for w in self.session_weeks], dtype=np.intp
+            )
+            session_week_codes = week_codes[self.session_codes]
+            rows = np.flatnonzero(session_week_codes >= 0)
+            return rows, session_week_codes[rows], names
+        if by == 'phase':
+            # Sessions can be part of multiple phases, hence the rows are gathered per phase
+            rows_per_phase = [
+                np.flatnonzero(np.isin(self.session_codes, session_codes))
+                for session_codes in self.phases.values()
+            ]
+            rows = np.concatenate([np.empty(0, dtype=np.intp), *rows_per_phase])
+            codes = np.repeat(np.arange(len(rows_per_phase)), [len(r) for r in rows_per_phase])
+            return rows, codes, tuple(self.phases)
+        raise ValueError(f'Unknown grouping: {by}')
+
+    def get_stats(self, by: Grouping = 'exercise') -> dict[str, VolumeStats]:
+        """Volume statistics per exercise, session, phase, week or category."""
+        rows, codes, names = self._get_group_codes(by)
+        return dict(zip(names, self._aggregate(rows, codes, len(names)), strict=True))
+
+    def get_total(self) -> VolumeStats:
+        return self._aggregate(slice(None), np.zeros(len(self), dtype=np.intp), 1)[0]
+
+    def get_intensity_distribution(self, by: Grouping = 'exercise') -> dict[str, dict[str, int]]:
+        """Reps per intensity zone (see `INTENSITY_ZONE_LABELS`), for sets with a percentage."""
+        rows, codes, names = self._get_group_codes(by)
+        percentage, reps = self.percentage[rows], self.reps[rows]
+        has_percentage = ~np.isnan(percentage)
+        zones = np.searchsorted(INTENSITY_ZONES, percentage[has_percentage] + 1e-9, 'right') - 1
+
+        n_zones = len(INTENSITY_ZONES)
+        counts = np.bincount(
+            codes[has_percentage] * n_zones + zones,
+            weights=reps[has_percentage],
+            minlength=len(names) * n_zones,
+        ).reshape(len(names), n_zones)
+        return {
+            name: dict(zip(INTENSITY_ZONE_LABELS, map(int, counts[i]), strict=True))
+            for i, name in enumerate(names)
+        }
+
+    def to_dataframe(self, by: Grouping = 'exercise') -> pd.DataFrame:
+        import pandas as pd
+
+        stats = self.get_stats(by)
+        df = pd.DataFrame([vars(s) for s in stats.values()], index=list(stats))
+        df.index.name = by.capitalize()
+        return df
+
+
+def get_program_analytics(
+    program: Program, categories: dict[str, str] | None = None
+) -> ProgramAnalytics:
+    """Returns the analytics of a (computed) program, cached on the program until its sets change."""
+    return program.get_analytics(categories)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pr_pro.exercise import Exercise_t
+
+
+@dataclass(frozen=True)
+class BestValueTimeline:
+    """
+    Best exercise values that change during a program, e.g., after a max test or per phase.
+
+    Per exercise, the positions (in session index order) from which a value is valid are stored
+    sorted, so the value of a session is found by binary search. Before the first change, the
+    base values (`Program.best_exercise_values`) are valid. The values of a session are cached and
+    shared between sessions with the same versions, hence they must not be modified.
+    """
+
+    base_values: dict[Exercise_t, float]
+    positions: dict[str, int]
+    starts: dict[Exercise_t, list[int]]
+    values: dict[Exercise_t, list[float]]
+    _session_values: dict[str, dict[Exercise_t, float]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    _version_values: dict[tuple[int, ...], dict[Exercise_t, float]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    @staticmethod
+    def build(
+        base_values: dict[Exercise_t, float],
+        history: dict[Exercise_t, dict[str, float]],
+        positions: dict[str, int],
+    ) -> BestValueTimeline:
+        starts: dict[Exercise_t, list[int]] = {}
+        values: dict[Exercise_t, list[float]] = {}
+        for exercise, changes in history.items():
+            unknown = [s for s in changes if s not in positions]
+            if unknown:
+                raise ValueError(
+                    f'Best values of {exercise.name} refer to unknown sessions: {", ".join(unknown)}.'
+                )
+            items = sorted((positions[s], v) for s, v in changes.items())
+            starts[exercise] = [p for p, _ in items]
+            values[exercise] = [v for _, v in items]
+        return BestValueTimeline(dict(base_values), positions, starts, values)
+
+    def get_value(self, exercise: Exercise_t, session_id: str) -> float | None:
+        """Best value of an exercise valid at a session."""
+        starts = self.starts.get(exercise)
+        if starts:
+            i = bisect_right(starts, self.positions[session_id])
+            if i:
+                return self.values[exercise][i - 1]
+        return self.base_values.get(exercise)
+
+    def get_values(self, session_id: str) -> dict[Exercise_t, float]:
+        """Best values of all exercises valid at a session (cached)."""
+        session_values = self._session_values.get(session_id)
+        if session_values is None:
+            position = self.positions[session_id]
+            versions = tuple(bisect_right(s, position) for s in self.starts.values())
+            session_values = self._version_values.get(versions)
+            if session_values is None:
+                session_values = dict(self.base_values)
+                for (exercise, values), i in zip(self.values.items(), versions):
+                    if i:
+                        session_values[exercise] = values[i - 1]
+                self._version_values[versions] = session_values
+            self._session_values[session_id] = session_values
+        return session_values
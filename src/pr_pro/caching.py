@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import weakref
+from typing import Any, Sequence
+
+
+class ModelCache(dict):
+    """
+    Dict for caching derived values on pydantic models (as private attribute).
+
+    Pydantic compares private attributes in `__eq__`, so a model with warm caches would not be
+    equal to an otherwise identical model. All `ModelCache` instances compare equal to avoid that.
+    """
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ModelCache)
+
+    def __ne__(self, other: object) -> bool:
+        return not self.__eq__(other)
+
+    __hash__ = None  # type: ignore
+
+    def __reduce__(self):
+        # Weak references (e.g., of a set to its component) are neither pickled nor copied, the
+        # referenced objects restore them (see `WorkoutComponent._adopt_sets`)
+        items = [(k, v) for k, v in self.items() if not isinstance(v, weakref.ref)]
+        return ModelCache, (), None, None, iter(items)
+
+
+def get_revisions_key(components: Sequence[Any]) -> list[tuple[Any, int]]:
+    """Key of objects with a `revision` (e.g., components), to validate caches derived from them."""
+    return [(c, c.revision) for c in components]
+
+
+def is_revisions_key_valid(key: list[tuple[Any, int]] | None, components: Sequence[Any]) -> bool:
+    """
+    Whether the objects are the same (by identity, as ids can be reused after garbage collection)
+    and unchanged since the key was created. The key keeps the objects alive.
+    """
+    return (
+        key is not None
+        and len(key) == len(components)
+        and all(
+            c is cached and c.revision == revision for c, (cached, revision) in zip(components, key)
+        )
+    )
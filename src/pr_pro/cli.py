@@ -0,0 +1,335 @@
+"""
+Command line interface, installed as `pr-pro`.
+
+    pr-pro show program.json --calculator epley
+    pr-pro export programs/ -f text -f pdf -o out --workers 4 --profile
+
+Only the standard library is imported at module level, the modeling api is imported by the
+commands, so `pr-pro --help` starts fast.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pr_pro.configs import ComputeConfig
+    from pr_pro.program import Program
+
+EXPORT_FORMATS = {'text': '.txt', 'json': '.json', 'pdf': '.pdf', 'table': '.csv'}
+
+
+def get_calculators() -> dict[str, type]:
+    """One-rep max calculators by name, e.g., 'brzycki' for `Brzycki1RMCalculator`."""
+    from pr_pro import functions
+    from pr_pro.functions import OneRMCalculator
+
+    return {
+        name.removesuffix('1RMCalculator').lower(): cls
+        for name, cls in vars(functions).items()
+        if isinstance(cls, type) and issubclass(cls, OneRMCalculator) and cls is not OneRMCalculator
+    }
+
+
+def _load_json(file_path: Path) -> Program:
+    from pr_pro.program import Program
+
+    return Program.from_json_file(file_path)
+
+
+# Program loaders by file suffix
+LOADERS: dict[str, Callable[[Path], Program]] = {'.json': _load_json}
+
+
+def load_program(file_path: Path) -> Program:
+    loader = LOADERS.get(file_path.suffix.lower())
+    if loader is None:
+        raise ValueError(f'Unsupported program file format: {file_path.suffix}')
+    return loader(file_path)
+
+
+def collect_program_files(paths: Sequence[Path]) -> list[Path]:
+    """Expands directories to the program files they contain."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in LOADERS))
+        else:
+            files.append(path)
+    return files
+
+
+@dataclass(frozen=True)
+class ComputeOptions:
+    calculator: str = 'brzycki'
+    associations: tuple[tuple[str, str], ...] = ()  # (exercise, associated exercise) names
+    compute: bool = True
+
+
+def create_compute_config(program: Program, options: ComputeOptions) -> ComputeConfig:
+    """Creates the compute config, resolving the associations by exercise name."""
+    from pr_pro.configs import ComputeConfig
+    from pr_pro.workout_component import SingleExercise
+
+    exercises_by_name = {exercise.name: exercise for exercise in program.best_exercise_values}
+    for session in program.workout_session_dict.values():
+        for component in session.workout_components:
+            exercises = (
+                [component.exercise]
+                if isinstance(component, SingleExercise)
+                else component.exercises
+            )
+            for exercise in exercises:
+                exercises_by_name.setdefault(exercise.name, exercise)
+
+    # Associations only apply to programs that contain both exercises, as with many athletes
+    # not every program contains every exercise
+    associations = {
+        exercises_by_name[name]: exercises_by_name[associated_name]
+        for name, associated_name in options.associations
+        if name in exercises_by_name and associated_name in exercises_by_name
+    }
+
+    return ComputeConfig(
+        one_rm_calculator=get_calculators()[options.calculator](),
+        exercise_associations=associations,
+    )
+
+
+def write_table(program: Program, file_path: Path) -> None:
+    """Writes all sets as csv, one row per set."""
+    import csv
+
+    from pr_pro.workout_component import SingleExercise
+
+    rows = []
+    fields: dict[str, None] = {}
+    for session in program.workout_session_dict.values():
+        for component in session.workout_components:
+            if isinstance(component, SingleExercise):
+                exercise_sets = {component.exercise: component.sets}
+            else:
+                exercise_sets = component.exercise_sets_dict
+            title = component.get_summary().title
+            for exercise, sets in exercise_sets.items():
+                for i, working_set in enumerate(sets):
+                    values = {f: getattr(working_set, f) for f in type(working_set).model_fields}
+                    fields.update(dict.fromkeys(values))
+                    rows.append(
+                        {
+                            'session': session.id,
+                            'component': title,
+                            'exercise': exercise.name,
+                            'set': i + 1,
+                            **values,
+                        }
+                    )
+
+    with open(file_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['session', 'component', 'exercise', 'set', *fields])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def export_program(program: Program, file_path: Path, export_format: str) -> None:
+    from pr_pro.instrumentation import span
+
+    with span(f'export.{export_format}'):
+        if export_format == 'text':
+            with open(file_path, 'w') as f:
+                program.write_text(f)
+        elif export_format == 'json':
+            program.write_json_file(file_path)
+        elif export_format == 'pdf':
+            program.export_to_pdf(file_path)
+        elif export_format == 'table':
+            write_table(program, file_path)
+        else:
+            raise ValueError(f'Unknown export format: {export_format}')
+
+
+@dataclass
+class JobResult:
+    file_path: Path
+    outputs: list[Path] = field(default_factory=list)
+    error: str | None = None
+    span_totals: dict[str, tuple[int, float]] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+
+
+def process_file(
+    file_path: Path,
+    output_dir: Path,
+    formats: Sequence[str],
+    options: ComputeOptions,
+    profile: bool = False,
+) -> JobResult:
+    """Loads, computes and exports a single program file (run in the worker processes)."""
+    from pr_pro.instrumentation import CollectorSink, add_sink, remove_sink
+
+    result = JobResult(file_path)
+    collector = CollectorSink()
+    if profile:
+        add_sink(collector)
+    try:
+        program = load_program(file_path)
+        if options.compute:
+            program.compute_values(create_compute_config(program, options))
+
+        for export_format in formats:
+            output_path = output_dir / (file_path.stem + EXPORT_FORMATS[export_format])
+            if output_path.resolve() == file_path.resolve():
+                raise ValueError(f'Exporting to {output_path} would overwrite the input file.')
+            export_program(program, output_path, export_format)
+            result.outputs.append(output_path)
+    except Exception as e:
+        result.error = f'{type(e).__name__}: {e}'
+    finally:
+        remove_sink(collector)
+
+    result.span_totals = collector.get_span_totals()
+    result.counters = collector.counters
+    return result
+
+
+def print_profile(results: Sequence[JobResult]) -> None:
+    span_totals: dict[str, tuple[int, float]] = {}
+    counters: dict[str, int] = {}
+    for result in results:
+        for name, (n_calls, total) in result.span_totals.items():
+            prev_calls, prev_total = span_totals.get(name, (0, 0.0))
+            span_totals[name] = (prev_calls + n_calls, prev_total + total)
+        for name, value in result.counters.items():
+            counters[name] = counters.get(name, 0) + value
+
+    print(f'{"stage":<28}{"calls":>8}{"total ms":>12}', file=sys.stderr)
+    for name, (n_calls, total) in sorted(span_totals.items(), key=lambda item: -item[1][1]):
+        print(f'{name:<28}{n_calls:>8}{total * 1e3:>12.1f}', file=sys.stderr)
+    for name, value in sorted(counters.items()):
+        print(f'{name:<28}{value:>8}', file=sys.stderr)
+
+
+def _parse_association(value: str) -> tuple[str, str]:
+    if '=' not in value:
+        raise argparse.ArgumentTypeError(f"Association '{value}' must be 'Exercise=Associated'.")
+    name, associated_name = value.split('=', 1)
+    return name.strip(), associated_name.strip()
+
+
+def _add_compute_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--calculator',
+        default='brzycki',
+        help='One-rep max calculator (brzycki, epley, landers, lombardi, mayhew, oconner, wathan).',
+    )
+    parser.add_argument(
+        '--associate',
+        type=_parse_association,
+        action='append',
+        default=[],
+        metavar='EXERCISE=ASSOCIATED',
+        help='Compute an exercise from the max of another, e.g., "Split Squat=Backsquat".',
+    )
+    parser.add_argument('--no-compute', action='store_true', help='Do not compute values.')
+
+
+def _get_compute_options(args: argparse.Namespace) -> ComputeOptions:
+    if args.calculator not in get_calculators():
+        raise SystemExit(f'Unknown calculator: {args.calculator}')
+    return ComputeOptions(
+        calculator=args.calculator,
+        associations=tuple(args.associate),
+        compute=not args.no_compute,
+    )
+
+
+def run_show(args: argparse.Namespace) -> int:
+    program = load_program(args.file)
+    options = _get_compute_options(args)
+    if options.compute:
+        program.compute_values(create_compute_config(program, options))
+    program.write_text(sys.stdout)
+    return 0
+
+
+def run_export(args: argparse.Namespace) -> int:
+    options = _get_compute_options(args)
+    files = collect_program_files(args.paths)
+    if not files:
+        print('No program files found.', file=sys.stderr)
+        return 1
+
+    formats = args.format or ['text']
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    job = partial(
+        process_file,
+        output_dir=args.output_dir,
+        formats=formats,
+        options=options,
+        profile=args.profile,
+    )
+
+    workers = min(args.workers or os.cpu_count() or 1, len(files))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(job, files))
+    else:
+        results = [job(f) for f in files]
+
+    n_failed = 0
+    for result in results:
+        if result.error is not None:
+            n_failed += 1
+            print(f'{result.file_path}: {result.error}', file=sys.stderr)
+        else:
+            print(f'{result.file_path} -> {", ".join(str(p) for p in result.outputs)}')
+
+    if args.profile:
+        print_profile(results)
+    return 1 if n_failed else 0
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='pr-pro', description='Compute and export pr_pro training programs.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    show_parser = subparsers.add_parser('show', help='Print a program as text.')
+    show_parser.add_argument('file', type=Path)
+    _add_compute_arguments(show_parser)
+    show_parser.set_defaults(func=run_show)
+
+    export_parser = subparsers.add_parser(
+        'export', help='Compute and export program files (or directories of program files).'
+    )
+    export_parser.add_argument('paths', type=Path, nargs='+')
+    export_parser.add_argument(
+        '-f',
+        '--format',
+        choices=list(EXPORT_FORMATS),
+        action='append',
+        help='Output format, can be given multiple times (default: text).',
+    )
+    export_parser.add_argument('-o', '--output-dir', type=Path, default=Path('pr_pro_output'))
+    export_parser.add_argument(
+        '-w', '--workers', type=int, default=None, help='Number of worker processes.'
+    )
+    export_parser.add_argument(
+        '--profile', action='store_true', help='Print the time spent per stage.'
+    )
+    _add_compute_arguments(export_parser)
+    export_parser.set_defaults(func=run_export)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = create_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
+
+from pr_pro.workout_component import ExerciseGroup, SingleExercise
+from pr_pro.workout_session import WorkoutSession
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+    from pr_pro.program import Program
+
+# Compared values per set, tonnage is reps x weight (the volume load of the set)
+COMPARISON_FIELDS = ('reps', 'weight', 'percentage', 'relative_percentage', 'rpe', 'tonnage')
+
+# (session id, component, occurrence of the component in the session, exercise, set index)
+SetKey = tuple[str, str, int, str, int]
+
+
+@dataclass(frozen=True)
+class SetTable:
+    """Columnar representation of all sets of a sequence of sessions."""
+
+    keys: list[SetKey]
+    values: np.ndarray  # shape (n_sets, len(COMPARISON_FIELDS)), nan for missing values
+    positions: list[int]  # position of the set's session in the given sessions
+
+    @staticmethod
+    def from_sessions(sessions: Iterable[WorkoutSession]) -> SetTable:
+        keys: list[SetKey] = []
+        rows: list[tuple[float, ...]] = []
+        positions: list[int] = []
+        for position, session in enumerate(sessions):
+            occurrences: dict[frozenset[str], int] = {}
+            for component in session.workout_components:
+                if isinstance(component, SingleExercise):
+                    exercise_sets = {component.exercise: component.sets}
+                elif isinstance(component, ExerciseGroup):
+                    exercise_sets = component.exercise_sets_dict
+                else:
+                    continue
+
+                # Groups are aligned independent of the order of their exercises
+                component_key = frozenset(e.name for e in exercise_sets)
+                occurrence = occurrences.get(component_key, 0)
+                occurrences[component_key] = occurrence + 1
+                title = ' + '.join(sorted(component_key))
+
+                for exercise, sets in exercise_sets.items():
+                    for set_idx, working_set in enumerate(sets):
+                        keys.append((session.id, title, occurrence, exercise.name, set_idx))
+                        rows.append(_get_set_values(working_set))
+                    positions.extend([position] * len(sets))
+
+        values = np.array(rows, dtype=float).reshape(len(rows), len(COMPARISON_FIELDS))
+        return SetTable(keys=keys, values=values, positions=positions)
+
+
+def _get_set_values(working_set) -> tuple[float, ...]:
+    reps = getattr(working_set, 'reps', None)
+    weight = getattr(working_set, 'weight', None)
+    tonnage = reps * weight if reps is not None and weight is not None else None
+    values = (
+        reps,
+        weight,
+        getattr(working_set, 'percentage', None),
+        getattr(working_set, 'relative_percentage', None),
+        getattr(working_set, 'rpe', None),
+        tonnage,
+    )
+    return tuple(math.nan if v is None else v for v in values)
+
+
+@dataclass(frozen=True)
+class SessionComparison:
+    """
+    Structured diff between (sequences of) sessions.
+
+    Matched sets are aligned by component (exercise or exercise group), exercise and set index.
+    `values_a`, `values_b` and `deltas` (b - a) have one row per matched set and one column per
+    field in `fields`. Missing values are nan.
+    """
+
+    session_pairs: list[tuple[str, str]]
+    fields: tuple[str, ...]
+    keys: list[SetKey]  # keys of the matched sets in a
+    pair_indices: list[int]  # index in `session_pairs` of the matched sets
+    values_a: np.ndarray
+    values_b: np.ndarray
+    deltas: np.ndarray
+    only_in_a: list[SetKey]
+    only_in_b: list[SetKey]
+
+    def get_field_deltas(self, field: str) -> np.ndarray:
+        return self.deltas[:, self.fields.index(field)]
+
+    def get_changed_mask(self, tol: float = 1e-9) -> np.ndarray:
+        """Boolean mask of matched sets with at least one changed value."""
+        changed_values = np.abs(np.nan_to_num(self.deltas, nan=0.0)) > tol
+        changed_presence = np.isnan(self.values_a) != np.isnan(self.values_b)
+        return (changed_values | changed_presence).any(axis=1)
+
+    def get_unmatched_sets(self) -> list[tuple[str, str, int]]:
+        """Returns (session id, exercise, number of sets) for sets only present on one side."""
+        counts: dict[tuple[str, str], int] = {}
+        for session_id, _, _, exercise, _ in self.only_in_a + self.only_in_b:
+            counts[(session_id, exercise)] = counts.get((session_id, exercise), 0) + 1
+        return [(session_id, exercise, n) for (session_id, exercise), n in counts.items()]
+
+    def get_total_deltas(self) -> dict[str, float]:
+        """Sum of the per-set deltas per field (e.g., the change in total tonnage of matched sets)."""
+        return {
+            field: float(total)
+            for field, total in zip(self.fields, np.nansum(self.deltas, axis=0), strict=True)
+        }
+
+    def to_dataframe(self, changed_only: bool = False) -> pd.DataFrame:
+        """
+        One row per matched set with the values of a, b and their deltas.
+        Columns are (field, 'a' | 'b' | 'delta'), fields without any values are dropped.
+        """
+        import pandas as pd
+
+        rows = (
+            np.flatnonzero(self.get_changed_mask()) if changed_only else np.arange(len(self.keys))
+        )
+        index = pd.MultiIndex.from_tuples(
+            [(self.keys[i][0], self.keys[i][3], self.keys[i][4] + 1) for i in rows],
+            names=['Session', 'Exercise', 'Set'],
+        )
+        columns = pd.MultiIndex.from_product([self.fields, ['a', 'b', 'delta']])
+        data = np.stack([self.values_a, self.values_b, self.deltas], axis=2)[rows].reshape(
+            len(rows), 3 * len(self.fields)
+        )
+        return pd.DataFrame(data, index=index, columns=columns).dropna(axis=1, how='all')
+
+    def __str__(self) -> str:
+        lines = []
+        changed = self.get_changed_mask()
+        current_pair = None
+        for i, (_, title, _, exercise, set_idx) in enumerate(self.keys):
+            if not changed[i]:
+                continue
+            if self.pair_indices[i] != current_pair:
+                current_pair = self.pair_indices[i]
+                session_a, session_b = self.session_pairs[current_pair]
+                lines.append(f'--- {session_a} vs {session_b} ---')
+
+            field_changes = []
+            for j, field in enumerate(self.fields):
+                a, b = self.values_a[i, j], self.values_b[i, j]
+                if np.isnan(a) and np.isnan(b) or a == b:
+                    continue
+                field_changes.append(f'{field} {_format_value(a)} -> {_format_value(b)}')
+            lines.append(f'{exercise} set {set_idx + 1}: ' + ', '.join(field_changes))
+
+        lines.extend(
+            f'Only in {session_id}: {exercise} ({n_sets} sets)'
+            for session_id, exercise, n_sets in self.get_unmatched_sets()
+        )
+        if not lines:
+            return 'No differences.'
+        return '\n'.join(lines)
+
+
+def _format_value(value: float) -> str:
+    if np.isnan(value):
+        return '-'
+    value = float(value)
+    return f'{int(value)}' if value.is_integer() else f'{round(value, 3)}'
+
+
+def compare_session_pairs(pairs: list[tuple[WorkoutSession, WorkoutSession]]) -> SessionComparison:
+    """
+    Compares each session of a pair with its counterpart. All sets of all pairs are aligned in
+    a single pass and the deltas are computed as one vectorized operation.
+    """
+    table_a = SetTable.from_sessions(a for a, _ in pairs)
+    table_b = SetTable.from_sessions(b for _, b in pairs)
+
+    # Align on keys relative to the session pair, i.e., replace the session id by the pair index
+    # (a session can be part of several pairs)
+    row_b_by_key = {
+        (pair,) + key[1:]: row
+        for row, (pair, key) in enumerate(zip(table_b.positions, table_b.keys))
+    }
+
+    rows_a, rows_b = [], []
+    only_in_a = []
+    for row_a, (pair, key) in enumerate(zip(table_a.positions, table_a.keys)):
+        row_b = row_b_by_key.pop((pair,) + key[1:], None)
+        if row_b is None:
+            only_in_a.append(key)
+        else:
+            rows_a.append(row_a)
+            rows_b.append(row_b)
+    only_in_b = [table_b.keys[row] for row in sorted(row_b_by_key.values())]
+
+    values_a = table_a.values[np.array(rows_a, dtype=int)]
+    values_b = table_b.values[np.array(rows_b, dtype=int)]
+    return SessionComparison(
+        session_pairs=[(a.id, b.id) for a, b in pairs],
+        fields=COMPARISON_FIELDS,
+        keys=[table_a.keys[row] for row in rows_a],
+        pair_indices=[table_a.positions[row] for row in rows_a],
+        values_a=values_a,
+        values_b=values_b,
+        deltas=values_b - values_a,
+        only_in_a=only_in_a,
+        only_in_b=only_in_b,
+    )
+
+
+def compare_sessions(session_a: WorkoutSession, session_b: WorkoutSession) -> SessionComparison:
+    return compare_session_pairs([(session_a, session_b)])
+
+
+def compare_phases(program: Program, phase_a: str, phase_b: str) -> SessionComparison:
+    """
+    Compares two program phases (e.g., week 1 and week 4) session by session, pairing sessions
+    by their position in the phase.
+    """
+    session_ids_a = program.program_phases[phase_a]
+    session_ids_b = program.program_phases[phase_b]
+    if len(session_ids_a) != len(session_ids_b):
+        raise ValueError(
+            f'Phases {phase_a} and {phase_b} have a different number of sessions '
+            f'({len(session_ids_a)} and {len(session_ids_b)}).'
+        )
+    return compare_session_pairs(
+        [
+            (program.workout_session_dict[a], program.workout_session_dict[b])
+            for a, b in zip(session_ids_a, session_ids_b, strict=True)
+        ]
+    )
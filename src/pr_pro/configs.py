@@ -1,6 +1,23 @@
 from __future__ import annotations
-from pydantic import BaseModel, ConfigDict
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field
 from pr_pro.functions import Brzycki1RMCalculator, OneRMCalculator
+from pr_pro.loading import BarbellLoading, Loading
+from pr_pro.rpe import RPEChart
+
+
+class LoadingConfig(BaseModel):
+    """Loadings to round computed weights to, per exercise or by default (see `pr_pro.loading`)."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    default_loading: Loading | None = Field(default_factory=BarbellLoading)
+    # Exercise -> Loading, e.g., dumbbell increments (no exercise type hint due to circular imports)
+    exercise_loadings: dict[Any, Loading] = Field(default_factory=dict)
+
+    def get_loading(self, exercise) -> Loading | None:
+        return self.exercise_loadings.get(exercise, self.default_loading)
 
 
 class ComputeConfig(BaseModel):
@@ -11,3 +28,9 @@ class ComputeConfig(BaseModel):
     # Store associations, so the values ofr one exercise can be derived from the max of another
     # Cannot give type hint due to circular imports ...
     exercise_associations: dict = {}
+
+    # Percentages of RepsRPESets, derived from the one rep max calculator if None
+    rpe_chart: RPEChart | None = None
+
+    # Rounds the computed weights to loadable weights (stored as `loaded_weight`)
+    loading_config: LoadingConfig | None = None
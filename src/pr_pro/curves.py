@@ -0,0 +1,195 @@
+"""
+Custom one rep max calculators, e.g., blending formulas or an athlete-specific rep-max curve:
+
+    calculator = Ensemble1RMCalculator(
+        (
+            EnsembleMember(Brzycki1RMCalculator(), max_reps=8),
+            EnsembleMember(Epley1RMCalculator(), max_reps=8),
+            EnsembleMember(Mayhew1RMCalculator(), min_reps=8),
+        )
+    )
+    curve = Curve1RMCalculator.fit({1: 140, 3: 130, 5: 122.5, 8: 110})
+    program.compute_values(ComputeConfig(one_rm_calculator=curve))
+
+Both are described by the ratio weight / 1RM per reps, which is precomputed on whole reps
+(`TABLE_REPS`), so an evaluation at whole reps is a dict lookup like a closed-form formula. Other
+reps are computed on demand. They are frozen and hashable, e.g., as keys of the cached RPE charts.
+"""
+
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from itertools import pairwise
+from typing import Mapping, Sequence
+
+from pr_pro.functions import Brzycki1RMCalculator, OneRMCalculator, invert_one_rep_max
+
+TABLE_REPS = tuple(range(1, 31))
+
+
+@dataclass(frozen=True)
+class _RatioCalculator(ABC):
+    """Calculator from a decreasing ratio (weight / 1RM) per reps, validated on `TABLE_REPS`."""
+
+    _ratios: dict[float, float] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        ratios = [self._compute_ratio(r) for r in TABLE_REPS]
+        if any(a <= b for a, b in pairwise(ratios)) or ratios[-1] <= 0:
+            raise ValueError('The ratio weight / 1RM must be positive and decrease with the reps.')
+        self._ratios.update(zip(TABLE_REPS, ratios))
+
+    @abstractmethod
+    def _compute_ratio(self, reps: float) -> float: ...
+
+    def _get_ratio(self, reps: float) -> float:
+        # Only whole reps are cached, the inversion evaluates arbitrary reps
+        ratio = self._ratios.get(reps)
+        return self._compute_ratio(reps) if ratio is None else ratio
+
+    def one_rep_max(self, weight: float, reps: float) -> float:
+        return weight / self._get_ratio(reps)
+
+    def max_weight_from_reps(self, one_rm_weight: float, reps: float) -> float:
+        return one_rm_weight * self._get_ratio(reps)
+
+    def max_reps_from_weight(self, one_rm_weight: float, weight: float) -> float:
+        return invert_one_rep_max(self.one_rep_max, one_rm_weight, weight)
+
+
+@dataclass(frozen=True)
+class EnsembleMember:
+    """A calculator of an ensemble, used for reps in [`min_reps`, `max_reps`]."""
+
+    calculator: OneRMCalculator
+    weight: float = 1.0
+    min_reps: float = 0.0
+    max_reps: float = math.inf
+
+
+@dataclass(frozen=True)
+class Ensemble1RMCalculator(_RatioCalculator):
+    """
+    Weighted mean of the one rep maxes of the members applying to the reps (as the ensembles of
+    `EstimationConfig`). Members with reps ranges blend formulas, e.g., one for low reps and
+    another for high reps, the members of both ranges apply at the boundary.
+    """
+
+    members: tuple[EnsembleMember, ...]
+
+    def __post_init__(self):
+        if not self.members or any(m.weight <= 0 for m in self.members):
+            raise ValueError('At least one member is required and all weights must be positive.')
+        # The reps ranges must cover all reps without gaps
+        covered = 0.0
+        for member in sorted(self.members, key=lambda m: m.min_reps):
+            if member.min_reps > covered:
+                break
+            covered = max(covered, member.max_reps)
+        if covered < math.inf:
+            raise ValueError(f'No member of the ensemble applies to reps above {covered}.')
+        super().__post_init__()
+
+    @staticmethod
+    def from_calculators(
+        calculators: Sequence[OneRMCalculator], weights: Sequence[float] | None = None
+    ) -> Ensemble1RMCalculator:
+        """Ensemble of calculators applying to all reps, by default with equal weights."""
+        weights = weights or [1.0] * len(calculators)
+        if len(weights) != len(calculators):
+            raise ValueError('The number of weights must match the number of calculators.')
+        return Ensemble1RMCalculator(
+            tuple(EnsembleMember(c, w) for c, w in zip(calculators, weights))
+        )
+
+    def _compute_ratio(self, reps: float) -> float:
+        total_weight = one_rep_max = 0.0
+        for member in self.members:
+            if member.min_reps <= reps <= member.max_reps:
+                total_weight += member.weight
+                one_rep_max += member.weight * member.calculator.one_rep_max(1.0, reps)
+        if not total_weight:
+            raise ValueError(f'No member of the ensemble applies to {reps} reps.')
+        return total_weight / one_rep_max
+
+
+def _pool_adjacent_violators(
+    reps: list[float], ratios: list[float], counts: list[int]
+) -> tuple[list[float], list[float]]:
+    """Least squares decreasing fit, pooled points are merged to one point at their mean reps."""
+    blocks: list[list[float]] = []  # [reps sum, ratio sum, count]
+    for r, ratio, n in zip(reps, ratios, counts):
+        blocks.append([r * n, ratio * n, n])
+        while len(blocks) > 1 and blocks[-2][1] / blocks[-2][2] <= blocks[-1][1] / blocks[-1][2]:
+            last = blocks.pop()
+            blocks[-1] = [a + b for a, b in zip(blocks[-1], last)]
+    return [b[0] / b[2] for b in blocks], [b[1] / b[2] for b in blocks]
+
+
+@dataclass(frozen=True)
+class Curve1RMCalculator(_RatioCalculator):
+    """
+    Rep-max curve given by ratios (weight / 1RM) at knots of reps, interpolated linearly between
+    the knots. Beyond the knots, the curve follows the `extrapolation` calculator, scaled to
+    match the first and last knot.
+    """
+
+    reps: tuple[float, ...]
+    ratios: tuple[float, ...]
+    extrapolation: OneRMCalculator = field(default_factory=Brzycki1RMCalculator)
+
+    def __post_init__(self):
+        if not self.reps or len(self.reps) != len(self.ratios):
+            raise ValueError('The curve needs at least one knot and one ratio per knot.')
+        if any(a >= b for a, b in pairwise(self.reps)):
+            raise ValueError('The reps of the knots must be ascending.')
+        super().__post_init__()
+
+    @staticmethod
+    def fit(
+        rep_maxes: Mapping[float, float | Sequence[float]],
+        one_rm_weight: float | None = None,
+        extrapolation: OneRMCalculator | None = None,
+    ) -> Curve1RMCalculator:
+        """
+        Fits a curve to tested rep maxes `{reps: weight(s)}`, e.g., `{1: 140, 3: 130, 5: 122.5}`.
+        The ratios are relative to `one_rm_weight`, by default the (best) 1 rep max. Rep maxes
+        that violate the decreasing order are pooled (isotonic regression). Beyond the knots, the
+        curve follows `extrapolation` (by default Brzycki).
+        """
+        weights = {
+            float(r): [w] if isinstance(w, (int, float)) else list(w) for r, w in rep_maxes.items()
+        }
+        if not weights or not all(weights.values()):
+            raise ValueError('At least one rep max is required.')
+        if one_rm_weight is None:
+            if 1.0 not in weights:
+                raise ValueError('Without a 1 rep max, the one rep max weight is required.')
+            one_rm_weight = max(weights[1.0])
+
+        reps = sorted(weights)
+        knots, ratios = _pool_adjacent_violators(
+            reps,
+            [sum(weights[r]) / len(weights[r]) / one_rm_weight for r in reps],
+            [len(weights[r]) for r in reps],
+        )
+        if extrapolation is None:
+            extrapolation = Brzycki1RMCalculator()
+        return Curve1RMCalculator(tuple(knots), tuple(ratios), extrapolation)
+
+    def _compute_ratio(self, reps: float) -> float:
+        knots, ratios = self.reps, self.ratios
+        if reps <= knots[0] or reps >= knots[-1]:
+            i = 0 if reps <= knots[0] else -1
+            extrapolation = self.extrapolation
+            return (
+                ratios[i]
+                * extrapolation.max_weight_from_reps(1.0, reps)
+                / extrapolation.max_weight_from_reps(1.0, knots[i])
+            )
+        i = bisect_right(knots, reps) - 1
+        t = (reps - knots[i]) / (knots[i + 1] - knots[i])
+        return (1 - t) * ratios[i] + t * ratios[i + 1]
@@ -0,0 +1,255 @@
+"""
+Estimation of one-rep maxes (e1RM) from logged performance, e.g., to update the best exercise
+values of a program:
+
+    estimates = estimate_one_rep_maxes(log, EstimationConfig(half_life=60))
+    update_best_values(program, estimates, ComputeConfig())
+
+Every logged set with weight is converted to an e1RM, where the reps in reserve (10 - RPE) are
+added to the reps if an RPE was logged. Per exercise, outliers are rejected by their modified
+z-score (median absolute deviation) and the estimate is a weighted quantile of the remaining
+e1RMs, weighted by an exponential time decay. All steps are vectorized over all sets, so whole
+rosters are estimated at once.
+"""
+
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+import numpy as np
+
+from pr_pro.functions import Brzycki1RMCalculator, OneRMCalculator
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pr_pro.configs import ComputeConfig
+    from pr_pro.exercise import Exercise_t
+    from pr_pro.program import Program
+    from pr_pro.workout_log import WorkoutLog
+
+SECONDS_PER_DAY = 86_400
+
+
+@dataclass(frozen=True)
+class OneRMEstimate:
+    value: float
+    n_sets: int  # sets the estimate is based on
+    n_outliers: int  # rejected sets
+
+
+@dataclass(frozen=True)
+class EstimationConfig:
+    """
+    Parameters of the e1RM estimation. With an ensemble of calculators, the mean of their
+    estimates is used. Sets with more (effective) reps than `max_reps` are ignored, as the
+    formulas get unreliable. `half_life` is in days (None disables the time decay).
+    """
+
+    calculators: Sequence[OneRMCalculator] = field(
+        default_factory=lambda: (Brzycki1RMCalculator(),)
+    )
+    half_life: float | None = 90.0
+    quantile: float = 0.9
+    max_reps: float = 12
+    outlier_threshold: float = 3.5
+
+    def __post_init__(self):
+        if not self.calculators:
+            raise ValueError('At least one calculator is required.')
+        if not 0 < self.quantile <= 1:
+            raise ValueError('The quantile must be in (0, 1].')
+
+
+def compute_e1rms(
+    weights: np.ndarray, reps: np.ndarray, calculators: Sequence[OneRMCalculator]
+) -> np.ndarray:
+    """
+    e1RM per set (mean over the calculators). The calculators are evaluated once per unique
+    (weight, reps) pair, which are few compared to the number of logged sets.
+    """
+    pairs, inverse = np.unique(np.stack([weights, reps], axis=1), axis=0, return_inverse=True)
+    unique_e1rms = np.array(
+        [
+            sum(c.one_rep_max(float(weight), float(r)) for c in calculators) / len(calculators)
+            for weight, r in pairs
+        ],
+        dtype=float,
+    )
+    return unique_e1rms[inverse.reshape(-1)]
+
+
+def _group_starts(sorted_groups: np.ndarray) -> np.ndarray:
+    """Start index of every group in a sorted group array (and the end as last element)."""
+    changes = np.flatnonzero(np.diff(sorted_groups)) + 1
+    return np.concatenate([[0], changes, [len(sorted_groups)]])
+
+
+def _group_medians(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Median of the values per row's group, for values sorted by (group, value)."""
+    starts = _group_starts(groups)
+    lengths = np.diff(starts)
+    medians = (values[starts[:-1] + (lengths - 1) // 2] + values[starts[:-1] + lengths // 2]) / 2
+    return np.repeat(medians, lengths)
+
+
+def _estimate_groups(
+    groups: np.ndarray,
+    weights: np.ndarray,
+    reps: np.ndarray,
+    rpe: np.ndarray,
+    timestamps: np.ndarray,
+    config: EstimationConfig,
+    now: float,
+) -> dict[int, OneRMEstimate]:
+    # Reps in reserve count as reps
+    effective_reps = reps + np.where(np.isnan(rpe), 0.0, np.clip(10 - rpe, 0, None))
+    valid = (weights > 0) & (reps >= 1) & (effective_reps <= config.max_reps)
+    groups, weights, effective_reps, timestamps = (
+        groups[valid],
+        weights[valid],
+        effective_reps[valid],
+        timestamps[valid],
+    )
+    if not len(groups):
+        return {}
+
+    e1rms = compute_e1rms(weights, effective_reps, config.calculators)
+    if config.half_life is None:
+        decay = np.ones_like(e1rms)
+    else:
+        # Sets without timestamp are not decayed
+        age = np.clip((now - np.nan_to_num(timestamps, nan=now)) / SECONDS_PER_DAY, 0, None)
+        decay = 0.5 ** (age / config.half_life)
+
+    order = np.lexsort((e1rms, groups))
+    groups, e1rms, decay = groups[order], e1rms[order], decay[order]
+
+    # Outlier rejection by the modified z-score, per group
+    medians = _group_medians(e1rms, groups)
+    deviations = np.abs(e1rms - medians)
+    deviation_order = np.lexsort((deviations, groups))
+    mad = np.empty_like(deviations)
+    mad[deviation_order] = _group_medians(deviations[deviation_order], groups[deviation_order])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_scores = np.where(mad > 0, 0.6745 * deviations / mad, 0.0)
+    inliers = z_scores <= config.outlier_threshold
+    n_per_group = np.bincount(groups)
+    n_inliers_per_group = np.bincount(groups[inliers], minlength=len(n_per_group))
+    groups, e1rms, decay = groups[inliers], e1rms[inliers], decay[inliers]
+
+    # Weighted quantile per group, the values are still sorted by (group, e1rm)
+    starts = _group_starts(groups)
+    cumulative = np.cumsum(decay)
+    before = np.concatenate([[0.0], cumulative])[starts[:-1]]
+    totals = cumulative[starts[1:] - 1] - before
+    indices = np.searchsorted(cumulative, before + config.quantile * totals - 1e-12 * totals)
+    indices = np.clip(indices, starts[:-1], starts[1:] - 1)
+
+    return {
+        int(group): OneRMEstimate(
+            value=float(e1rms[i]),
+            n_sets=int(n_inliers_per_group[group]),
+            n_outliers=int(n_per_group[group] - n_inliers_per_group[group]),
+        )
+        for group, i in zip(groups[starts[:-1]], indices)
+    }
+
+
+def _get_now(now: datetime.datetime | None) -> float:
+    return (now or datetime.datetime.now()).timestamp()
+
+
+def estimate_roster_one_rep_maxes(
+    logs: Mapping[str, WorkoutLog],
+    config: EstimationConfig | None = None,
+    now: datetime.datetime | None = None,
+) -> dict[str, dict[str, OneRMEstimate]]:
+    """e1RM estimates per athlete and exercise name, estimated for all athletes at once."""
+    config = config or EstimationConfig()
+    if not logs:
+        return {}
+
+    exercise_codes: dict[str, int] = {}
+    columns: dict[str, list[np.ndarray]] = {
+        name: [] for name in ('athlete', 'exercise', 'weight', 'reps', 'rpe', 'timestamp')
+    }
+    for athlete_index, log in enumerate(logs.values()):
+        # Map the codes of the log to codes over the exercises of all logs
+        global_codes = np.array(
+            [exercise_codes.setdefault(s, len(exercise_codes)) for s in log.strings],
+            dtype=np.intp,
+        )
+        log_exercises = log.get_column('exercise')
+        columns['athlete'].append(np.full(len(log_exercises), athlete_index, dtype=np.intp))
+        columns['exercise'].append(global_codes[log_exercises])
+        for name in ('weight', 'reps', 'rpe', 'timestamp'):
+            columns[name].append(log.get_column(name))
+    data = {name: np.concatenate(arrays) for name, arrays in columns.items()}
+
+    n_exercises = max(len(exercise_codes), 1)
+    estimates = _estimate_groups(
+        data['athlete'] * n_exercises + data['exercise'],
+        np.nan_to_num(data['weight']),
+        np.nan_to_num(data['reps']),
+        data['rpe'],
+        data['timestamp'],
+        config,
+        _get_now(now),
+    )
+
+    exercise_names = list(exercise_codes)
+    athletes = list(logs)
+    results: dict[str, dict[str, OneRMEstimate]] = {athlete: {} for athlete in athletes}
+    for group, estimate in sorted(estimates.items()):
+        athlete_index, exercise_code = divmod(group, n_exercises)
+        results[athletes[athlete_index]][exercise_names[exercise_code]] = estimate
+    return results
+
+
+def estimate_one_rep_maxes(
+    log: WorkoutLog, config: EstimationConfig | None = None, now: datetime.datetime | None = None
+) -> dict[str, OneRMEstimate]:
+    """e1RM estimates per exercise name of a single log."""
+    return estimate_roster_one_rep_maxes({'': log}, config, now)['']
+
+
+def update_best_values(
+    program: Program,
+    estimates: Mapping[str, OneRMEstimate],
+    compute_config: ComputeConfig,
+    min_sets: int = 1,
+) -> dict[Exercise_t, float]:
+    """
+    Sets the best values of the program's exercises to their estimates (if based on at least
+    `min_sets` sets) and recomputes the components of the changed exercises.
+
+    Returns:
+        The changed best values.
+    """
+    from pr_pro.workout_component import SingleExercise
+
+    exercises_by_name: dict[str, Exercise_t] = {e.name: e for e in program.best_exercise_values}
+    for session in program.workout_session_dict.values():
+        for component in session.workout_components:
+            exercises = (
+                [component.exercise]
+                if isinstance(component, SingleExercise)
+                else component.exercises
+            )
+            for exercise in exercises:
+                exercises_by_name.setdefault(exercise.name, exercise)
+
+    changed = {}
+    for name, estimate in estimates.items():
+        exercise = exercises_by_name.get(name)
+        if exercise is None or estimate.n_sets < min_sets:
+            continue
+        if program.best_exercise_values.get(exercise) != estimate.value:
+            changed[exercise] = estimate.value
+
+    for exercise, value in changed.items():
+        program.add_best_exercise_value(exercise, value)
+    if changed:
+        program.recompute_values(compute_config, changed)
+    return changed
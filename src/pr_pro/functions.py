@@ -1,9 +1,17 @@
 import math
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Protocol, runtime_checkable
+from functools import lru_cache
+from itertools import pairwise
+from typing import Callable, Protocol, runtime_checkable
 
 # Source: https://www.vcalc.com/wiki/brzycki, https://www.vcalc.com/wiki/body-building-weight-lifting-calculator
 
+# Reps grid of the inversion tables (geometric), inverted reps are clipped to it
+INVERSE_MIN_REPS = 0.01
+INVERSE_MAX_REPS = 36.0
+INVERSE_GRID_SIZE = 256
+
 
 @runtime_checkable
 @dataclass(frozen=True)
@@ -16,6 +24,58 @@ class OneRMCalculator(Protocol):
     def max_reps_from_weight(one_rm_weight: float, weight: float) -> float: ...
 
 
+@lru_cache(maxsize=32)
+def _get_inverse_table(
+    one_rep_max: Callable[[float, float], float],
+) -> tuple[list[float], list[float]]:
+    """One rep max factors (1RM / weight) on the reps grid, increasing with the reps."""
+    ratio = (INVERSE_MAX_REPS / INVERSE_MIN_REPS) ** (1 / (INVERSE_GRID_SIZE - 1))
+    reps = [INVERSE_MIN_REPS * ratio**i for i in range(INVERSE_GRID_SIZE - 1)] + [INVERSE_MAX_REPS]
+    factors = [one_rep_max(1.0, r) for r in reps]
+    if any(a >= b for a, b in pairwise(factors)):
+        raise ValueError(f'{one_rep_max.__qualname__} is not increasing in the reps.')
+    return factors, reps
+
+
+def invert_one_rep_max(
+    one_rep_max: Callable[[float, float], float],
+    one_rm_weight: float,
+    weight: float,
+    tolerance: float = 1e-12,
+) -> float:
+    """
+    Reps at which `one_rep_max(weight, reps)` equals the one rep max, for any forward formula
+    that scales with the weight and increases with the reps. The bracketing grid cell is found in
+    a table cached per formula and then refined on the formula itself (Illinois method). Outside
+    the reps grid, the result is clipped to `INVERSE_MIN_REPS` or `INVERSE_MAX_REPS`.
+    """
+    factors, reps = _get_inverse_table(one_rep_max)
+    target = one_rm_weight / weight
+    if target <= factors[0]:
+        return reps[0]
+    if target >= factors[-1]:
+        return reps[-1]
+
+    i = bisect_left(factors, target)
+    if factors[i] == target:
+        return reps[i]
+    low, high = reps[i - 1], reps[i]
+    f_low, f_high = factors[i - 1] - target, factors[i] - target
+    x = low
+    for _ in range(100):
+        x = high - f_high * (high - low) / (f_high - f_low)
+        f_x = one_rep_max(weight, x) / weight - target
+        if abs(f_x) <= tolerance * target or high - low <= tolerance * x:
+            break
+        if (f_x < 0) == (f_low < 0):
+            low, f_low = x, f_x
+            f_high /= 2
+        else:
+            high, f_high = x, f_x
+            f_low /= 2
+    return x
+
+
 @dataclass(frozen=True)
 class Epley1RMCalculator(OneRMCalculator):
     @staticmethod
@@ -74,7 +134,7 @@ class Lombardi1RMCalculator(OneRMCalculator):
 
     @staticmethod
     def max_reps_from_weight(one_rm_weight: float, weight: float) -> float:
-        return one_rm_weight / weight**10
+        return (one_rm_weight / weight) ** 10
 
 
 @dataclass(frozen=True)
@@ -104,7 +164,7 @@ class Wathan1RMCalculator(OneRMCalculator):
 
     @staticmethod
     def max_reps_from_weight(one_rm_weight: float, weight: float) -> float:
-        return -0.075 * (48.8 - 100 * weight / one_rm_weight) ** -1
+        return invert_one_rep_max(Wathan1RMCalculator.one_rep_max, one_rm_weight, weight)
 
 
 @dataclass(frozen=True)
@@ -119,4 +179,4 @@ class Mayhew1RMCalculator(OneRMCalculator):
 
     @staticmethod
     def max_reps_from_weight(one_rm_weight: float, weight: float) -> float:
-        return -1 / 0.055 * math.log((52.2 - 100 * weight / one_rm_weight) / 41.9)
+        return invert_one_rep_max(Mayhew1RMCalculator.one_rep_max, one_rm_weight, weight)
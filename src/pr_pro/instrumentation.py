@@ -0,0 +1,181 @@
+"""
+Lightweight instrumentation of the pipeline (computing, loading, rendering and exporting).
+
+Spans time named stages, counters count events such as computed sets or copied components.
+Both are forwarded to the registered sinks. Without sinks, `span` returns a shared no-op
+context manager and `count` returns immediately, so instrumentation is free when disabled.
+
+    collector = CollectorSink()
+    with instrument(collector):
+        program.compute_values(ComputeConfig())
+    print(collector.get_summary())
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SpanRecord:
+    name: str
+    duration: float  # seconds
+    path: tuple[str, ...]  # names of the enclosing spans and this span
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+class Sink:
+    """Receives finished spans and counter increments. Subclasses override what they need."""
+
+    def on_span(self, record: SpanRecord) -> None:
+        pass
+
+    def on_count(self, name: str, value: int) -> None:
+        pass
+
+
+class LoggingSink(Sink):
+    def __init__(self, log: logging.Logger | None = None, level: int = logging.DEBUG):
+        self.log = log or logger
+        self.level = level
+
+    def on_span(self, record: SpanRecord) -> None:
+        attributes = ''.join(f' {k}={v}' for k, v in record.attributes.items())
+        self.log.log(
+            self.level, f'{"/".join(record.path)}{attributes}: {record.duration * 1e3:.2f} ms'
+        )
+
+    def on_count(self, name: str, value: int) -> None:
+        self.log.log(self.level, f'{name} +{value}')
+
+
+class CollectorSink(Sink):
+    """Collects all spans and counter totals in memory."""
+
+    def __init__(self):
+        self.spans: list[SpanRecord] = []
+        self.counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def on_span(self, record: SpanRecord) -> None:
+        with self._lock:
+            self.spans.append(record)
+
+    def on_count(self, name: str, value: int) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def get_span_totals(self) -> dict[str, tuple[int, float]]:
+        """Returns (number of calls, total duration) per span name."""
+        totals: dict[str, tuple[int, float]] = {}
+        for record in self.spans:
+            n_calls, total = totals.get(record.name, (0, 0.0))
+            totals[record.name] = (n_calls + 1, total + record.duration)
+        return totals
+
+    def get_summary(self) -> str:
+        lines = [
+            f'{name}: {n_calls} calls, {total * 1e3:.2f} ms'
+            for name, (n_calls, total) in sorted(
+                self.get_span_totals().items(), key=lambda item: -item[1][1]
+            )
+        ]
+        lines.extend(f'{name}: {value}' for name, value in sorted(self.counters.items()))
+        return '\n'.join(lines)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+            self.counters.clear()
+
+
+class CallbackSink(Sink):
+    def __init__(
+        self,
+        on_span: Callable[[SpanRecord], None] | None = None,
+        on_count: Callable[[str, int], None] | None = None,
+    ):
+        self._on_span = on_span
+        self._on_count = on_count
+
+    def on_span(self, record: SpanRecord) -> None:
+        if self._on_span is not None:
+            self._on_span(record)
+
+    def on_count(self, name: str, value: int) -> None:
+        if self._on_count is not None:
+            self._on_count(name, value)
+
+
+# Replaced (not mutated) on changes, so readers never need a lock
+_sinks: tuple[Sink, ...] = ()
+_sinks_lock = threading.Lock()
+_span_path: ContextVar[tuple[str, ...]] = ContextVar('span_path', default=())
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def add_sink(sink: Sink) -> None:
+    global _sinks
+    with _sinks_lock:
+        _sinks = _sinks + (sink,)
+
+
+def remove_sink(sink: Sink) -> None:
+    global _sinks
+    with _sinks_lock:
+        _sinks = tuple(s for s in _sinks if s is not sink)
+
+
+def is_enabled() -> bool:
+    """Whether any sink is registered. Use it to guard expensive attribute computations."""
+    return bool(_sinks)
+
+
+@contextlib.contextmanager
+def instrument(*sinks: Sink) -> Iterator[None]:
+    """Registers the sinks for the duration of the context."""
+    for sink in sinks:
+        add_sink(sink)
+    try:
+        yield
+    finally:
+        for sink in sinks:
+            remove_sink(sink)
+
+
+@contextlib.contextmanager
+def _span(name: str, attributes: dict[str, Any]) -> Iterator[None]:
+    path = _span_path.get() + (name,)
+    token = _span_path.set(path)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        _span_path.reset(token)
+        record = SpanRecord(name, duration, path, attributes)
+        for sink in _sinks:
+            sink.on_span(record)
+
+
+def span(name: str, **attributes: Any) -> ContextManager[None]:
+    """Times the enclosed block as span `name`, e.g., `with span('pdf.session', id=...):`."""
+    if not _sinks:
+        return _NULL_SPAN
+    return _span(name, attributes)
+
+
+def count(name: str, value: int = 1) -> None:
+    """Increments counter `name`, e.g., `count('sets.computed', len(sets))`."""
+    if not _sinks:
+        return
+    for sink in _sinks:
+        sink.on_count(name, value)
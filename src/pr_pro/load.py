@@ -0,0 +1,291 @@
+"""
+Rolling training-load metrics (acute:chronic workload ratio, monotony and strain).
+
+Sessions are mapped to training days and the daily loads (by default the session tonnage) are
+tracked in rolling windows. Appending or editing a day only updates the windows containing that
+day, so updates cost O(window size) independent of the length of the history.
+
+    tracker = ProgramLoadTracker(program)
+    tracker.series.get_metrics(-1)  # Metrics of the last day
+    program.add_workout_session(session)
+    tracker.update_session(session.id)
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable, Literal
+
+import numpy as np
+
+from pr_pro.session_index import DEFAULT_WEEK_PATTERN
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+    from pr_pro.program import Program
+    from pr_pro.workout_session import WorkoutSession
+
+ACUTE_WINDOW = 7  # days
+CHRONIC_WINDOW = 28  # days
+
+SessionLoad = Callable[['WorkoutSession'], float]
+
+
+def tonnage_load(session: WorkoutSession) -> float:
+    return session.get_summary().tonnage
+
+
+def volume_load(session: WorkoutSession) -> float:
+    return float(session.get_summary().volume)
+
+
+LOAD_FUNCTIONS: dict[str, SessionLoad] = {'tonnage': tonnage_load, 'volume': volume_load}
+
+
+@dataclass(frozen=True)
+class LoadMetrics:
+    day: int
+    load: float
+    acute: float  # load over the acute window
+    chronic: float  # mean load per acute window over the chronic window
+    acwr: float | None  # acute:chronic workload ratio
+    monotony: float | None  # mean / standard deviation of the daily loads in the acute window
+    strain: float | None  # acute load x monotony
+
+
+class LoadSeries:
+    """
+    Daily loads with rolling window sums (acute, chronic and acute sum of squares) per day.
+    Days are consecutive integers starting at 0, days without training have a load of 0.
+    """
+
+    def __init__(self, acute_window: int = ACUTE_WINDOW, chronic_window: int = CHRONIC_WINDOW):
+        if not 0 < acute_window <= chronic_window:
+            raise ValueError('The acute window must be positive and not exceed the chronic window.')
+        self.acute_window = acute_window
+        self.chronic_window = chronic_window
+        self._loads: list[float] = []
+        self._acute: list[float] = []
+        self._acute_squares: list[float] = []
+        self._chronic: list[float] = []
+
+    @staticmethod
+    def from_daily_loads(
+        loads: Iterable[float],
+        acute_window: int = ACUTE_WINDOW,
+        chronic_window: int = CHRONIC_WINDOW,
+    ) -> LoadSeries:
+        """Builds the series at once with cumulative sums (faster than appending day by day)."""
+        series = LoadSeries(acute_window, chronic_window)
+        values = np.asarray(list(loads), dtype=float)
+
+        def rolling_sum(x: np.ndarray, window: int) -> list[float]:
+            cumsum = np.concatenate([[0.0], np.cumsum(x)])
+            start = np.maximum(np.arange(1, len(x) + 1) - window, 0)
+            return (cumsum[1:] - cumsum[start]).tolist()
+
+        series._loads = values.tolist()
+        series._acute = rolling_sum(values, acute_window)
+        series._acute_squares = rolling_sum(values**2, acute_window)
+        series._chronic = rolling_sum(values, chronic_window)
+        return series
+
+    def __len__(self) -> int:
+        return len(self._loads)
+
+    def append(self, load: float) -> None:
+        """Appends the load of the next day."""
+        day = len(self._loads)
+        self._loads.append(load)
+        self._acute.append(self._window_sum(self._acute, day, self.acute_window, load))
+        self._acute_squares.append(
+            self._window_sum(self._acute_squares, day, self.acute_window, load * load, square=True)
+        )
+        self._chronic.append(self._window_sum(self._chronic, day, self.chronic_window, load))
+
+    def _window_sum(
+        self, sums: list[float], day: int, window: int, value: float, square: bool = False
+    ) -> float:
+        """Window sum ending at `day` from the sum of the previous day."""
+        if day == 0:
+            return value
+        total = sums[day - 1] + value
+        if day >= window:
+            leaving = self._loads[day - window]
+            total -= leaving * leaving if square else leaving
+        return total
+
+    def set_load(self, day: int, load: float) -> None:
+        """Sets the load of a day, days up to `day` are added with a load of 0 if needed."""
+        while len(self._loads) <= day:
+            self.append(0.0)
+
+        previous = self._loads[day]
+        self._loads[day] = load
+        delta, delta_squares = load - previous, load * load - previous * previous
+        n_days = len(self._loads)
+        for i in range(day, min(day + self.acute_window, n_days)):
+            self._acute[i] += delta
+            self._acute_squares[i] += delta_squares
+        for i in range(day, min(day + self.chronic_window, n_days)):
+            self._chronic[i] += delta
+
+    def add_load(self, day: int, load: float) -> None:
+        """Adds load to a day, e.g., of a second session on the same day."""
+        self.set_load(day, (self._loads[day] if day < len(self._loads) else 0.0) + load)
+
+    def get_load(self, day: int) -> float:
+        return self._loads[day]
+
+    def get_metrics(self, day: int) -> LoadMetrics:
+        if day < 0:
+            day += len(self._loads)
+        acute, chronic = self._acute[day], self._chronic[day]
+        acute_days = min(day + 1, self.acute_window)
+        chronic_days = min(day + 1, self.chronic_window)
+
+        # Mean load per acute window over the chronic window (a partial window at the start)
+        chronic_per_window = chronic * acute_days / chronic_days
+        mean = acute / acute_days
+        # Clipped, since incremental updates can accumulate small negative rounding errors
+        variance = max(self._acute_squares[day] / acute_days - mean * mean, 0.0)
+        std = math.sqrt(variance)
+        monotony = mean / std if std > 1e-9 * max(mean, 1.0) else None
+        return LoadMetrics(
+            day=day,
+            load=self._loads[day],
+            acute=acute,
+            chronic=chronic_per_window,
+            acwr=acute / chronic_per_window if chronic_per_window > 0 else None,
+            monotony=monotony,
+            strain=acute * monotony if monotony is not None else None,
+        )
+
+    def get_series(self) -> dict[str, np.ndarray]:
+        """All metrics per day as arrays (nan where undefined), e.g., for plotting."""
+        days = np.arange(len(self._loads))
+        acute = np.array(self._acute)
+        acute_days = np.minimum(days + 1, self.acute_window)
+        chronic = np.array(self._chronic) * acute_days / np.minimum(days + 1, self.chronic_window)
+        mean = acute / acute_days
+        std = np.sqrt(np.maximum(np.array(self._acute_squares) / acute_days - mean**2, 0.0))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            acwr = np.where(chronic > 0, acute / chronic, np.nan)
+            monotony = np.where(std > 1e-9 * np.maximum(mean, 1.0), mean / std, np.nan)
+        return {
+            'day': days,
+            'load': np.array(self._loads),
+            'acute': acute,
+            'chronic': chronic,
+            'acwr': acwr,
+            'monotony': monotony,
+            'strain': acute * monotony,
+        }
+
+    def to_dataframe(self, start_date: datetime.date | None = None) -> pd.DataFrame:
+        """The series as dataframe, indexed by date if a start date is given."""
+        import pandas as pd
+
+        df = pd.DataFrame(self.get_series()).set_index('day')
+        if start_date is not None:
+            df.index = pd.date_range(start_date, periods=len(df), freq='D', name='date')
+        return df
+
+
+class ProgramLoadTracker:
+    """
+    Keeps the load series of a program in sync with its sessions.
+
+    Without `dates`, sessions are ordered as in the session index (by program phase) and placed
+    on consecutive days within their week (from ids like 'W3D2'), sessions without week follow
+    on the next days. With `dates`, sessions are placed on their date. After appending or editing
+    a session, call `update_session`, which only updates the windows of the affected day.
+    """
+
+    def __init__(
+        self,
+        program: Program,
+        dates: dict[str, datetime.date] | None = None,
+        load: Literal['tonnage', 'volume'] | SessionLoad = 'tonnage',
+        acute_window: int = ACUTE_WINDOW,
+        chronic_window: int = CHRONIC_WINDOW,
+        week_pattern: str = DEFAULT_WEEK_PATTERN,
+    ):
+        self.program = program
+        self.dates = dict(dates) if dates is not None else None
+        self.load_function = LOAD_FUNCTIONS[load] if isinstance(load, str) else load
+        self._week_regex = re.compile(week_pattern)
+        self.start_date = min(self.dates.values()) if self.dates else None
+
+        self.session_days: dict[str, int] = {}
+        self.session_loads: dict[str, float] = {}
+        self._sessions_per_week: dict[int, int] = {}
+        self._last_day = -1
+
+        session_ids = program.get_session_index().session_ids
+        for session_id in session_ids:
+            self.session_days[session_id] = self._get_day(session_id)
+            self.session_loads[session_id] = self.load_function(
+                program.workout_session_dict[session_id]
+            )
+
+        days = np.array([self.session_days[s] for s in session_ids], dtype=np.intp)
+        loads = np.array([self.session_loads[s] for s in session_ids], dtype=float)
+        daily_loads = np.bincount(days, weights=loads, minlength=self._last_day + 1)
+        self.series = LoadSeries.from_daily_loads(daily_loads, acute_window, chronic_window)
+
+    def _get_day(self, session_id: str) -> int:
+        if self.dates is not None:
+            if session_id not in self.dates:
+                raise ValueError(f'No date for session {session_id}.')
+            if self.start_date is None:
+                self.start_date = self.dates[session_id]
+            day = (self.dates[session_id] - self.start_date).days
+            if day < 0:
+                raise ValueError(
+                    f'Session {session_id} is dated before the start date {self.start_date}.'
+                )
+        else:
+            match = self._week_regex.match(session_id)
+            if match:
+                week = int(match.group(1))
+                position = self._sessions_per_week.get(week, 0)
+                self._sessions_per_week[week] = position + 1
+                day = (week - 1) * 7 + position
+            else:
+                day = self._last_day + 1
+        self._last_day = max(self._last_day, day)
+        return day
+
+    def update_session(self, session_id: str, date: datetime.date | None = None) -> None:
+        """Updates the load of an edited or appended session (optionally with its date)."""
+        if date is not None:
+            if self.dates is None:
+                raise ValueError('Dates can only be given if the tracker uses dates.')
+            if self.start_date is not None and date < self.start_date:
+                raise ValueError(
+                    f'Session {session_id} is dated before the start date {self.start_date}.'
+                )
+            if session_id in self.session_days:
+                self.remove_session(session_id)
+            self.dates[session_id] = date
+
+        load = self.load_function(self.program.workout_session_dict[session_id])
+        if session_id not in self.session_days:
+            self.session_days[session_id] = self._get_day(session_id)
+            self.session_loads[session_id] = 0.0
+
+        previous = self.session_loads[session_id]
+        self.session_loads[session_id] = load
+        self.series.add_load(self.session_days[session_id], load - previous)
+
+    def remove_session(self, session_id: str) -> None:
+        day = self.session_days.pop(session_id)
+        self.series.add_load(day, -self.session_loads.pop(session_id))
+
+    def get_session_metrics(self, session_id: str) -> LoadMetrics:
+        return self.series.get_metrics(self.session_days[session_id])
@@ -0,0 +1,169 @@
+"""
+Rounding of computed weights to weights that can actually be loaded, e.g., a barbell with plates
+or dumbbells in fixed increments. Set `ComputeConfig.loading_config` to round after computing:
+
+    loading_config = LoadingConfig(
+        default_loading=BarbellLoading(bar_weight=20, plates=(25, 20, 10, 5, 2.5, 1.25)),
+        exercise_loadings={split_squat: IncrementLoading(increment=2, minimum=2)},
+    )
+    program.compute_values(ComputeConfig(loading_config=loading_config))
+
+The rounded weight is stored as `loaded_weight`, the computed weight is kept.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Literal, Protocol, runtime_checkable
+
+Rounding = Literal['nearest', 'down', 'up']
+
+DEFAULT_PLATES = (25.0, 20.0, 15.0, 10.0, 5.0, 2.5, 1.25)  # kg
+
+# Weights are solved to the gram, at most this many solutions are cached per loading
+MAX_CACHED_SOLUTIONS = 4096
+
+
+@runtime_checkable
+class Loading(Protocol):
+    def round(self, weight: float) -> float: ...
+
+
+@dataclass(frozen=True)
+class PlateLoading:
+    weight: float  # total weight including the bar
+    plates: tuple[float, ...]  # plates per side, heaviest first
+
+
+def _round_to(values: list[float], weight: float, rounding: Rounding) -> int:
+    """Index of the value the weight is rounded to, for sorted values (ties round down)."""
+    if rounding == 'up':
+        return min(bisect_left(values, weight - 1e-9), len(values) - 1)
+    i = max(bisect_right(values, weight + 1e-9) - 1, 0)
+    if (
+        rounding == 'nearest'
+        and i + 1 < len(values)
+        and values[i + 1] - weight < weight - values[i] - 1e-9
+    ):
+        i += 1
+    return i
+
+
+@lru_cache(maxsize=32)
+def _get_plate_loadings(
+    bar_weight: float,
+    plates: tuple[float, ...],
+    plate_pairs: tuple[int, ...] | None,
+    max_weight: float,
+) -> tuple[list[float], list[tuple[float, ...]]]:
+    """
+    All loadable weights (sorted) with the plates per side, using the fewest plates. Solved once
+    per plate inventory as bounded knapsack over the per side loads in units of the plates' gcd.
+    """
+    grams = [round(p * 1000) for p in plates]
+    unit = math.gcd(*grams)
+    max_units = max(int((max_weight - bar_weight) * 1000 / 2) // unit, 0)
+
+    # Fewest plates per reachable load (in units), ties are broken towards heavier plates
+    best: list[tuple[float, ...] | None] = [()] + [None] * max_units
+
+    def add_plate(load: int, plate: float, plate_units: int) -> None:
+        previous = best[load]
+        if previous is None:
+            return
+        candidate = previous + (plate,)
+        current = best[load + plate_units]
+        if current is None or (-len(candidate), candidate) > (-len(current), current):
+            best[load + plate_units] = candidate
+
+    for i, (plate, plate_grams) in enumerate(sorted(zip(plates, grams), reverse=True)):
+        plate_units = plate_grams // unit
+        if plate_pairs is None:
+            # Ascending loads reuse the plate (unbounded)
+            for load in range(max_units - plate_units + 1):
+                add_plate(load, plate, plate_units)
+        else:
+            # Descending loads use the plate at most once per pass
+            for _ in range(plate_pairs[i]):
+                for load in range(max_units - plate_units, -1, -1):
+                    add_plate(load, plate, plate_units)
+
+    loads = [load for load, plates_per_side in enumerate(best) if plates_per_side is not None]
+    weights = [round(bar_weight + 2 * load * unit / 1000, 6) for load in loads]
+    return weights, [best[load] for load in loads]  # type: ignore
+
+
+@dataclass(frozen=True)
+class BarbellLoading:
+    """
+    A bar loaded symmetrically with plates. `plate_pairs` limits the available pairs per plate
+    (same order as `plates`), by default every plate is available as often as needed.
+    """
+
+    bar_weight: float = 20.0
+    plates: tuple[float, ...] = DEFAULT_PLATES
+    plate_pairs: tuple[int, ...] | None = None
+    rounding: Rounding = 'nearest'
+    max_weight: float = 500.0
+    _solutions: dict[float, PlateLoading] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if not self.plates or min(self.plates) <= 0:
+            raise ValueError('At least one plate with a positive weight is required.')
+        if self.plate_pairs is not None and len(self.plate_pairs) != len(self.plates):
+            raise ValueError('The number of plate pairs must match the number of plates.')
+
+    def _get_loadings(self) -> tuple[list[float], list[tuple[float, ...]]]:
+        plate_pairs = self.plate_pairs
+        if plate_pairs is not None:
+            # Same order as the sorted plates of the solver
+            plate_pairs = tuple(n for _, n in sorted(zip(self.plates, plate_pairs), reverse=True))
+        return _get_plate_loadings(self.bar_weight, self.plates, plate_pairs, self.max_weight)
+
+    def solve(self, weight: float) -> PlateLoading:
+        """The loadable weight the weight is rounded to and its plates (cached per gram)."""
+        weight = round(weight, 3)
+        solution = self._solutions.get(weight)
+        if solution is None:
+            if len(self._solutions) >= MAX_CACHED_SOLUTIONS:
+                self._solutions.clear()
+            weights, plates = self._get_loadings()
+            i = _round_to(weights, weight, self.rounding)
+            solution = self._solutions[weight] = PlateLoading(weights[i], plates[i])
+        return solution
+
+    def round(self, weight: float) -> float:
+        return self.solve(weight).weight
+
+
+@dataclass(frozen=True)
+class IncrementLoading:
+    """Weights in fixed increments, e.g., dumbbells or machines (`minimum` + k x `increment`)."""
+
+    increment: float = 2.0
+    minimum: float = 0.0
+    maximum: float | None = None
+    rounding: Rounding = 'nearest'
+
+    def __post_init__(self):
+        if self.increment <= 0:
+            raise ValueError('The increment must be positive.')
+
+    def round(self, weight: float) -> float:
+        steps = (weight - self.minimum) / self.increment
+        if self.rounding == 'down':
+            steps = math.floor(steps + 1e-9)
+        elif self.rounding == 'up':
+            steps = math.ceil(steps - 1e-9)
+        else:
+            # Ties round down
+            steps = math.ceil(steps - 0.5 - 1e-9)
+        rounded = self.minimum + max(steps, 0) * self.increment
+        if self.maximum is not None:
+            rounded = min(rounded, self.maximum)
+        return round(rounded, 6)
@@ -1,7 +1,10 @@
 from pathlib import Path
 from fpdf import FPDF
+from pr_pro.analytics import get_program_analytics
+from pr_pro.instrumentation import span
 from pr_pro.program import Program
 from pr_pro.workout_component import SingleExercise, ExerciseGroup
+from pr_pro.workout_session import WorkoutSession
 
 
 class WorkoutPDF(FPDF):
@@ -157,9 +160,194 @@ class WorkoutPDF(FPDF):
 
         self.ln(3)
 
+    def add_table(self, header: list[str], rows: list[list[str]], first_col_width: float = 50):
+        """Add a plain table, the first column is wider (row labels)."""
+        table_width = self.w - 2 * self.l_margin
+        col_width = (table_width - first_col_width) / (len(header) - 1)
+        widths = [first_col_width] + [col_width] * (len(header) - 1)
 
-def export_program_to_pdf(program: Program, output_path: Path) -> None:
-    """Export a workout program to PDF format"""
+        for i, row in enumerate([header, *rows]):
+            if i == 0 or self.get_y() + 6 > self.h - self.b_margin:
+                if i > 0:
+                    self.add_page()
+                self.set_font('Arial', 'B', 10)
+                for width, value in zip(widths, header):
+                    self.cell(width, 6, value, 1, 0, 'C')
+                self.ln()
+                self.set_font('Arial', '', 10)
+                if i == 0:
+                    continue
+            for width, value in zip(widths, row):
+                self.cell(width, 6, value, 1, 0, 'C')
+            self.ln()
+        self.ln(3)
+
+
+def _add_training_summary(pdf: WorkoutPDF, program: Program) -> None:
+    analytics = get_program_analytics(program)
+    pdf.add_heading('Training Summary', level=1)
+    total = analytics.get_total()
+    pdf.add_text(f'Sets: {total.n_sets}, Reps: {total.volume}, Tonnage: {total.tonnage:.0f} kg')
+
+    header = ['Exercise', 'Sets', 'Reps', 'Tonnage', 'Avg %', 'Reps >= 80%']
+    rows = [
+        [
+            name,
+            str(stats.n_sets),
+            str(stats.volume),
+            f'{stats.tonnage:.0f}' if stats.tonnage else '',
+            f'{stats.mean_intensity:.0%}' if stats.mean_intensity is not None else '',
+            str(stats.lifts_above_80) if stats.mean_intensity is not None else '',
+        ]
+        for name, stats in analytics.get_stats('exercise').items()
+    ]
+    pdf.add_table(header, rows)
+
+    if analytics.phases:
+        pdf.add_text('Per phase', bold=True)
+        rows = [
+            [name, str(stats.n_sets), str(stats.volume), f'{stats.tonnage:.0f}']
+            for name, stats in analytics.get_stats('phase').items()
+        ]
+        pdf.add_table(['Phase', 'Sets', 'Reps', 'Tonnage'], rows)
+
+
+def _add_session(pdf: WorkoutPDF, session: WorkoutSession) -> None:
+    pdf.add_heading(f'Session: {session.id}', level=2)
+
+    if session.notes:
+        pdf.add_text(f'Notes: {session.notes}')
+        pdf.ln(1)
+
+    # Session stats
+    summary = session.get_summary()
+    pdf.add_text(f'Exercises: {summary.n_exercises}, Sets: {summary.n_sets}')
+    pdf.ln(2)
+
+    # Components
+    for component in session.workout_components:
+        if isinstance(component, SingleExercise):
+            # Convert sets to dict format for table
+            sets_data = []
+            for workout_set in component.sets:
+                set_dict = workout_set.model_dump()
+                # Filter out None values and rest_between
+                set_dict = {
+                    k: v for k, v in set_dict.items() if v is not None and k != 'rest_between'
+                }
+                sets_data.append(set_dict)
+
+            # Use full page width for single exercises
+            full_width = pdf.w - 2 * pdf.l_margin
+            pdf.add_exercise_table(component.exercise.name, sets_data, table_width=full_width)
+
+            # Add notes underneath if provided
+            if component.notes:
+                pdf.set_font('Arial', 'I', 10)
+                pdf.cell(0, 6, f'Notes: {component.notes}', 0, 1, 'L')
+
+            pdf.ln(2)
+
+        elif isinstance(component, ExerciseGroup):
+            pdf.add_heading(component.get_summary().title, level=3)
+
+            # Add group notes underneath if provided
+            if component.notes:
+                pdf.set_font('Arial', 'I', 10)
+                pdf.cell(0, 6, f'Notes: {component.notes}', 0, 1, 'L')
+                pdf.ln(1)
+
+            # For exercise groups with 2 exercises, place side by side
+            if len(component.exercises) == 2:
+                # Collect sets data for each exercise individually (no unified columns)
+                all_sets_data = {}
+
+                for exercise in component.exercises:
+                    sets = component.exercise_sets_dict.get(exercise, [])
+                    sets_data = []
+                    for workout_set in sets:
+                        set_dict = workout_set.model_dump()
+                        set_dict = {
+                            k: v
+                            for k, v in set_dict.items()
+                            if v is not None and k != 'rest_between'
+                        }
+                        sets_data.append(set_dict)
+                    all_sets_data[exercise] = sets_data
+
+                # Estimate table height to check if it fits on current page
+                # Use the exercise with more sets for height estimation
+                max_sets = max(len(data) for data in all_sets_data.values())
+                estimated_table_height = 6 + (max_sets + 1) * 7  # header + data rows
+                current_y = pdf.get_y()
+                page_height = pdf.h - pdf.b_margin
+
+                # If tables won't fit on current page, start a new page
+                if current_y + estimated_table_height > page_height:
+                    pdf.add_page()
+
+                # Calculate table positioning for side-by-side layout
+                table_width = (
+                    pdf.w - 2 * pdf.l_margin - 10
+                ) / 2  # Leave some margin between tables
+                start_y = pdf.get_y()
+
+                # First exercise table (left side) - use only its own columns
+                exercise = component.exercises[0]
+                pdf.add_exercise_table(
+                    exercise.name,
+                    all_sets_data[exercise],
+                    table_width=table_width,
+                    start_x=pdf.l_margin,
+                    part_of_group=True,
+                )
+                first_table_bottom = pdf.get_y()
+
+                # Second exercise table (right side) - use only its own columns
+                pdf.set_y(start_y)  # Reset to same Y position
+                exercise = component.exercises[1]
+                second_table_start_x = pdf.l_margin + table_width + 10
+                pdf.add_exercise_table(
+                    exercise.name,
+                    all_sets_data[exercise],
+                    table_width=table_width,
+                    start_x=second_table_start_x,
+                    part_of_group=True,
+                )
+                second_table_bottom = pdf.get_y()
+
+                # Move to bottom of both tables
+                pdf.set_y(max(first_table_bottom, second_table_bottom))
+            else:
+                # For other cases, stack vertically
+                for exercise in component.exercises:
+                    sets = component.exercise_sets_dict.get(exercise, [])
+                    sets_data = []
+                    for workout_set in sets:
+                        set_dict = workout_set.model_dump()
+                        set_dict = {
+                            k: v
+                            for k, v in set_dict.items()
+                            if v is not None and k != 'rest_between'
+                        }
+                        sets_data.append(set_dict)
+
+                    full_width = pdf.w - 2 * pdf.l_margin
+                    pdf.add_exercise_table(exercise.name, sets_data, table_width=full_width)
+                    pdf.ln(1)
+
+            pdf.ln(2)
+
+
+def export_program_to_pdf(
+    program: Program, output_path: Path, include_summary: bool = False
+) -> None:
+    """Export a workout program to PDF format, optionally with a volume and tonnage summary"""
+    with span('pdf.export'):
+        _export_program_to_pdf(program, output_path, include_summary)
+
+
+def _export_program_to_pdf(program: Program, output_path: Path, include_summary: bool) -> None:
     pdf = WorkoutPDF()
     pdf.add_page()
 
@@ -168,148 +356,30 @@ def export_program_to_pdf(program: Program, output_path: Path) -> None:
 
     # Best exercise values section
     if program.best_exercise_values:
-        pdf.add_heading('Best Exercise Values', level=1)
-        for exercise, value in program.best_exercise_values.items():
-            pdf.add_text(f'{exercise.name}: {value} kg', bold=False)
-        pdf.ln(2)
+        with span('pdf.best_exercise_values'):
+            pdf.add_heading('Best Exercise Values', level=1)
+            for exercise, value in program.best_exercise_values.items():
+                pdf.add_text(f'{exercise.name}: {value} kg', bold=False)
+            pdf.ln(2)
 
     # Program phases (if any)
     if program.program_phases:
-        pdf.add_heading('Program Phases', level=1)
-        for phase_name, session_ids in program.program_phases.items():
-            pdf.add_text(f'{phase_name}: {", ".join(session_ids)}', bold=True)
-        pdf.ln(2)
+        with span('pdf.program_phases'):
+            pdf.add_heading('Program Phases', level=1)
+            for phase_name, session_ids in program.program_phases.items():
+                pdf.add_text(f'{phase_name}: {", ".join(session_ids)}', bold=True)
+            pdf.ln(2)
+
+    if include_summary:
+        with span('pdf.training_summary'):
+            _add_training_summary(pdf, program)
 
     # Workout sessions
     pdf.add_heading('Workout Sessions', level=1)
 
     for session_id, session in program.workout_session_dict.items():
-        pdf.add_heading(f'Session: {session.id}', level=2)
-
-        if session.notes:
-            pdf.add_text(f'Notes: {session.notes}')
-            pdf.ln(1)
-
-        # Session stats
-        pdf.add_text(
-            f'Exercises: {session.get_number_of_exercises()}, Sets: {session.get_number_of_sets()}'
-        )
-        pdf.ln(2)
-
-        # Components
-        for component in session.workout_components:
-            if isinstance(component, SingleExercise):
-                # Convert sets to dict format for table
-                sets_data = []
-                for workout_set in component.sets:
-                    set_dict = workout_set.model_dump()
-                    # Filter out None values and rest_between
-                    set_dict = {
-                        k: v for k, v in set_dict.items() if v is not None and k != 'rest_between'
-                    }
-                    sets_data.append(set_dict)
-
-                # Use full page width for single exercises
-                full_width = pdf.w - 2 * pdf.l_margin
-                pdf.add_exercise_table(component.exercise.name, sets_data, table_width=full_width)
-
-                # Add notes underneath if provided
-                if component.notes:
-                    pdf.set_font('Arial', 'I', 10)
-                    pdf.cell(0, 6, f'Notes: {component.notes}', 0, 1, 'L')
-
-                pdf.ln(2)
-
-            elif isinstance(component, ExerciseGroup):
-                group_title = ' + '.join([ex.name for ex in component.exercises])
-                pdf.add_heading(group_title, level=3)
-
-                # Add group notes underneath if provided
-                if component.notes:
-                    pdf.set_font('Arial', 'I', 10)
-                    pdf.cell(0, 6, f'Notes: {component.notes}', 0, 1, 'L')
-                    pdf.ln(1)
-
-                # For exercise groups with 2 exercises, place side by side
-                if len(component.exercises) == 2:
-                    # Collect sets data for each exercise individually (no unified columns)
-                    all_sets_data = {}
-
-                    for exercise in component.exercises:
-                        sets = component.exercise_sets_dict.get(exercise, [])
-                        sets_data = []
-                        for workout_set in sets:
-                            set_dict = workout_set.model_dump()
-                            set_dict = {
-                                k: v
-                                for k, v in set_dict.items()
-                                if v is not None and k != 'rest_between'
-                            }
-                            sets_data.append(set_dict)
-                        all_sets_data[exercise] = sets_data
-
-                    # Estimate table height to check if it fits on current page
-                    # Use the exercise with more sets for height estimation
-                    max_sets = max(len(data) for data in all_sets_data.values())
-                    estimated_table_height = 6 + (max_sets + 1) * 7  # header + data rows
-                    current_y = pdf.get_y()
-                    page_height = pdf.h - pdf.b_margin
-
-                    # If tables won't fit on current page, start a new page
-                    if current_y + estimated_table_height > page_height:
-                        pdf.add_page()
-
-                    # Calculate table positioning for side-by-side layout
-                    table_width = (
-                        pdf.w - 2 * pdf.l_margin - 10
-                    ) / 2  # Leave some margin between tables
-                    start_y = pdf.get_y()
-
-                    # First exercise table (left side) - use only its own columns
-                    exercise = component.exercises[0]
-                    pdf.add_exercise_table(
-                        exercise.name,
-                        all_sets_data[exercise],
-                        table_width=table_width,
-                        start_x=pdf.l_margin,
-                        part_of_group=True,
-                    )
-                    first_table_bottom = pdf.get_y()
-
-                    # Second exercise table (right side) - use only its own columns
-                    pdf.set_y(start_y)  # Reset to same Y position
-                    exercise = component.exercises[1]
-                    second_table_start_x = pdf.l_margin + table_width + 10
-                    pdf.add_exercise_table(
-                        exercise.name,
-                        all_sets_data[exercise],
-                        table_width=table_width,
-                        start_x=second_table_start_x,
-                        part_of_group=True,
-                    )
-                    second_table_bottom = pdf.get_y()
-
-                    # Move to bottom of both tables
-                    pdf.set_y(max(first_table_bottom, second_table_bottom))
-                else:
-                    # For other cases, stack vertically
-                    for exercise in component.exercises:
-                        sets = component.exercise_sets_dict.get(exercise, [])
-                        sets_data = []
-                        for workout_set in sets:
-                            set_dict = workout_set.model_dump()
-                            set_dict = {
-                                k: v
-                                for k, v in set_dict.items()
-                                if v is not None and k != 'rest_between'
-                            }
-                            sets_data.append(set_dict)
-
-                        full_width = pdf.w - 2 * pdf.l_margin
-                        pdf.add_exercise_table(exercise.name, sets_data, table_width=full_width)
-                        pdf.ln(1)
-
-                pdf.ln(2)
+        with span('pdf.session', id=session.id):
+            _add_session(pdf, session)
 
         # Add page break between sessions if not the last one
         # session_ids = list(program.workout_session_dict.keys())
@@ -317,4 +387,5 @@ def export_program_to_pdf(program: Program, output_path: Path) -> None:
         #     pdf.add_page()
 
     # Save the PDF
-    pdf.output(str(output_path))
+    with span('pdf.output'):
+        pdf.output(str(output_path))
@@ -1,33 +1,83 @@
 from __future__ import annotations
+import hashlib
+import json
 from pathlib import Path
-from typing import Self
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Self, TextIO
 
-from pydantic import BaseModel, field_serializer
+from pydantic import (
+    BaseModel,
+    ModelWrapValidatorHandler,
+    PrivateAttr,
+    SerializationInfo,
+    SerializerFunctionWrapHandler,
+    field_serializer,
+    model_serializer,
+    model_validator,
+)
 
+from pr_pro.best_values import BestValueTimeline
+from pr_pro.caching import ModelCache, get_revisions_key, is_revisions_key_valid
+from pr_pro.instrumentation import count, is_enabled, span
+from pr_pro.session_index import SessionIndex
+from pr_pro.workout_component import SingleExercise
 from pr_pro.workout_session import WorkoutSession
 from pr_pro.configs import ComputeConfig
 from pr_pro.exercise import Exercise, Exercise_t
 
+if TYPE_CHECKING:  # pragma: no cover
+    from pr_pro.analytics import ProgramAnalytics
+    from pr_pro.query import SetIndex, SetRef
+    from pr_pro.sets import WorkingSet_t
+
+
+# Key of the computed fields of the sets in the json of a program, so a loaded program can be
+# recomputed, e.g., {"weight,relative_percentage": [0, 1, 4]} (by position of the set)
+COMPUTED_FIELDS_KEY = 'computed_fields'
+
+# Number of cached analytics (per categories) of a program
+ANALYTICS_CACHE_SIZE = 16
+
 
 class Program(BaseModel):
     name: str
     best_exercise_values: dict[Exercise_t, float] = {}
+    # Best values that change during the program: exercise -> {session id: value valid from it on}
+    best_exercise_value_history: dict[Exercise_t, dict[str, float]] = {}
     workout_session_dict: dict[str, WorkoutSession] = {}
     program_phases: dict[str, list[str]] = {}
+    _cache: ModelCache = PrivateAttr(default_factory=ModelCache)
 
     def __str__(self) -> str:
-        workout_str = f'--- Workout {self.name} ---\n'
-        best_exercise_str = (
-            'Best exercise values\n  '
-            + '\n  '.join([f'{e.name}: {value}' for e, value in self.best_exercise_values.items()])
-            + '\n\n'
-        )
-        workout_sessions_str = (
-            'Workout sessions\n'
-            + '\n'.join(ws.__str__() for ws in self.workout_session_dict.values())
-            + '\n'
-        )
-        return workout_str + best_exercise_str + workout_sessions_str
+        with span('program.render_text'):
+            return ''.join(f'{line}\n' for line in self.iter_lines())
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yields the lines (without line breaks) of the text representation."""
+        yield f'--- Workout {self.name} ---'
+        yield 'Best exercise values'
+        if not self.best_exercise_values:
+            yield '  '
+        for exercise, value in self.best_exercise_values.items():
+            yield f'  {exercise.name}: {value}'
+        for exercise, changes in self.best_exercise_value_history.items():
+            for session_id, value in changes.items():
+                yield f'  {exercise.name}: {value} (from {session_id})'
+        yield ''
+
+        yield 'Workout sessions'
+        if not self.workout_session_dict:
+            yield ''
+        for session in self.workout_session_dict.values():
+            yield from session.iter_lines()
+            yield ''
+
+    def write_text(self, stream: TextIO) -> None:
+        """
+        Writes the text representation (same as `str(program)`) to a stream, e.g. a file or
+        `sys.stdout`, line by line without building the full string.
+        """
+        with span('program.render_text'):
+            stream.writelines(f'{line}\n' for line in self.iter_lines())
 
     def add_workout_session(self, workout_session: WorkoutSession) -> Self:
         if workout_session.id in self.workout_session_dict:
@@ -35,6 +85,7 @@ class Program(BaseModel):
                 f'Workout session with id {workout_session.id} already exists in the program.'
             )
         self.workout_session_dict[workout_session.id] = workout_session
+        self._cache.clear()
         return self
 
     def add_program_phase(self, phase_id: str, session_ids: list[str]) -> Self:
@@ -43,37 +94,268 @@ class Program(BaseModel):
         if not all(session_id in self.workout_session_dict for session_id in session_ids):
             raise ValueError('One or more session IDs do not exist in the program.')
         self.program_phases[phase_id] = session_ids
+        self._cache.clear()
         return self
 
     def get_workout_session_by_id(self, session_id: str) -> WorkoutSession | None:
         return self.workout_session_dict.get(session_id, None)
 
-    def add_best_exercise_value(self, exercise: Exercise_t, value: float) -> Self:
-        self.best_exercise_values[exercise] = value
+    def _get_phases_key(self) -> tuple[tuple[str, tuple[str, ...]], ...]:
+        """Contents of the phases, to validate caches that depend on them."""
+        return tuple((phase, tuple(ids)) for phase, ids in self.program_phases.items())
+
+    def get_session_index(self) -> SessionIndex:
+        """Returns the cached, ordered index over all sessions (by phase, week, id search)."""
+        cache_key = (tuple(self.workout_session_dict), self._get_phases_key())
+        if self._cache.get('session_index_key') != cache_key:
+            self._cache['session_index'] = SessionIndex.build(
+                list(self.workout_session_dict.keys()), self.program_phases
+            )
+            self._cache['session_index_key'] = cache_key
+        return self._cache['session_index']
+
+    def add_best_exercise_value(
+        self, exercise: Exercise_t, value: float, from_session: str | None = None
+    ) -> Self:
+        """
+        Adds a best value of an exercise. With `from_session`, the value is valid from that session
+        on (in session index order), e.g., after a max test.
+        """
+        if from_session is None:
+            self.best_exercise_values[exercise] = value
+        elif from_session not in self.workout_session_dict:
+            raise ValueError(f'Workout session with id {from_session} does not exist.')
+        else:
+            self.best_exercise_value_history.setdefault(exercise, {})[from_session] = value
         return self
 
+    def add_phase_best_exercise_value(
+        self, phase_id: str, exercise: Exercise_t, value: float
+    ) -> Self:
+        """Adds a best value of an exercise that is valid from the first session of a phase on."""
+        index = self.get_session_index()
+        if not index.phases.get(phase_id):
+            raise ValueError(f'Program phase with id {phase_id} does not exist or is empty.')
+        first_session = min(index.phases[phase_id], key=index.positions.__getitem__)
+        return self.add_best_exercise_value(exercise, value, from_session=first_session)
+
+    def get_best_value_timeline(self) -> BestValueTimeline:
+        """
+        Returns the cached as-of lookup of the best values per session. The cache is rebuilt when
+        the best values, sessions or phases change (also by in-place edits).
+        """
+        positions = self.get_session_index().positions
+        cache_key = (
+            tuple(self.best_exercise_values.items()),
+            tuple(
+                (exercise, tuple(changes.items()))
+                for exercise, changes in self.best_exercise_value_history.items()
+            ),
+        )
+        timeline = self._cache.get('best_value_timeline')
+        if (
+            timeline is None
+            or timeline.positions is not positions
+            or self._cache['best_value_timeline_key'] != cache_key
+        ):
+            timeline = self._cache['best_value_timeline'] = BestValueTimeline.build(
+                self.best_exercise_values, self.best_exercise_value_history, positions
+            )
+            self._cache['best_value_timeline_key'] = cache_key
+        return timeline
+
+    def get_best_exercise_values(self, session_id: str) -> dict[Exercise_t, float]:
+        """Best exercise values valid at a session."""
+        if not self.best_exercise_value_history:
+            return self.best_exercise_values
+        return self.get_best_value_timeline().get_values(session_id)
+
     def compute_values(self, compute_config: ComputeConfig) -> None:
+        with span('program.compute_values'):
+            timeline = self.get_best_value_timeline() if self.best_exercise_value_history else None
+            for session in self.workout_session_dict.values():
+                best_values = (
+                    timeline.get_values(session.id) if timeline else self.best_exercise_values
+                )
+                with span('session.compute_values', id=session.id):
+                    session.compute_values(best_values, compute_config)
+
+    def recompute_values(
+        self, compute_config: ComputeConfig, exercises: Iterable[Exercise_t] | None = None
+    ) -> None:
+        """
+        Recomputes the values after best exercise values changed, starting from the prescribed
+        values of the sets (see `WorkingSet.reset_computed_values`). With `exercises`, only the
+        components that contain them (or exercises associated with them) are recomputed.
+        """
+        affected = None
+        if exercises is not None:
+            affected = set(exercises)
+            affected.update(
+                exercise
+                for exercise, associated in compute_config.exercise_associations.items()
+                if associated in affected
+            )
+
+        with span('program.recompute_values'):
+            timeline = self.get_best_value_timeline() if self.best_exercise_value_history else None
+            for session in self.workout_session_dict.values():
+                best_values = (
+                    timeline.get_values(session.id) if timeline else self.best_exercise_values
+                )
+                for component in session.workout_components:
+                    if isinstance(component, SingleExercise):
+                        exercise_sets = {component.exercise: component.sets}
+                    else:
+                        exercise_sets = component.exercise_sets_dict
+                    if affected is not None and affected.isdisjoint(exercise_sets):
+                        continue
+
+                    for sets in exercise_sets.values():
+                        for working_set in sets:
+                            working_set.reset_computed_values()
+                    component.compute_values(best_values, compute_config)
+
+    def get_fingerprint(self) -> str:
+        """
+        Returns a short hash of the program's identity (name and session ids), e.g., for
+        namespacing persisted state. Editing or recomputing the sets keeps the fingerprint.
+        """
+        identity = json.dumps([self.name, list(self.workout_session_dict)])
+        return hashlib.sha256(identity.encode()).hexdigest()[:16]
+
+    def _get_sets_cache(self, name: str, build: Callable[[], Any]) -> Any:
+        """
+        Returns a cached value derived from the sets, which is rebuilt when sessions, phases,
+        components or sets changed.
+        """
+        components = [
+            c for session in self.workout_session_dict.values() for c in session.workout_components
+        ]
+        cache_key = (
+            tuple(self.workout_session_dict),
+            self._get_phases_key(),
+            # Sets added or removed in place (e.g., `component.sets.pop()`) keep the revisions
+            sum(session.get_number_of_sets() for session in self.workout_session_dict.values()),
+        )
+        if self._cache.get(f'{name}_key') != cache_key or not is_revisions_key_valid(
+            self._cache.get(f'{name}_components'), components
+        ):
+            self._cache[name] = build()
+            self._cache[f'{name}_key'] = cache_key
+            self._cache[f'{name}_components'] = get_revisions_key(components)
+        return self._cache[name]
+
+    def get_analytics(self, categories: dict[str, str] | None = None) -> ProgramAnalytics:
+        """
+        Volume, tonnage and intensity statistics of the (computed) program, see `analytics`.
+        Cached per categories until the sets change.
+        """
+        from pr_pro.analytics import ProgramAnalytics
+
+        analytics = self._get_sets_cache('analytics', dict)
+        key = tuple(sorted((categories or {}).items()))
+        if key not in analytics:
+            if len(analytics) >= ANALYTICS_CACHE_SIZE:
+                analytics.clear()
+            analytics[key] = ProgramAnalytics.from_program(self, categories)
+        return analytics[key]
+
+    def get_set_index(self) -> SetIndex:
+        """
+        Returns the cached index over all sets for queries. It is rebuilt when sessions, phases,
+        components or sets changed.
+        """
+        from pr_pro.query import SetIndex
+
+        return self._get_sets_cache('set_index', lambda: SetIndex(self))
+
+    def query_sets(self, **filters: Any) -> list[SetRef]:
+        """
+        Returns references to the sets matching all filters, e.g.,
+        `program.query_sets(exercise=deadlift, phase='Peak', percentage=(0.85, None))`.
+        See `SetIndex.query` for the filters.
+        """
+        with span('program.query_sets'):
+            return self.get_set_index().query(**filters)
+
+    def query_sessions(self, **filters: Any) -> list[str]:
+        """Ids of the sessions with at least one set matching all filters (see `query_sets`)."""
+        with span('program.query_sessions'):
+            return self.get_set_index().query_sessions(**filters)
+
+    def _iter_sets(self) -> Iterator[WorkingSet_t]:
         for session in self.workout_session_dict.values():
-            session.compute_values(self.best_exercise_values, compute_config)
+            for component in session.workout_components:
+                yield from component._iter_sets()
+
+    @model_serializer(mode='wrap')
+    def serialize_computed_fields(
+        self, handler: SerializerFunctionWrapHandler, info: SerializationInfo
+    ) -> dict[str, Any]:
+        data = handler(self)
+        if info.mode_is_json():
+            computed_fields: dict[str, list[int]] = {}
+            for i, working_set in enumerate(self._iter_sets()):
+                fields = working_set.get_computed_fields()
+                if fields:
+                    computed_fields.setdefault(','.join(fields), []).append(i)
+            if computed_fields:
+                data[COMPUTED_FIELDS_KEY] = computed_fields
+        return data
+
+    @model_validator(mode='wrap')
+    @classmethod
+    def validate_computed_fields(cls, data: Any, handler: ModelWrapValidatorHandler[Self]) -> Self:
+        computed_fields = None
+        if isinstance(data, dict) and COMPUTED_FIELDS_KEY in data:
+            data = dict(data)
+            computed_fields = data.pop(COMPUTED_FIELDS_KEY)
+        program = handler(data)
+        if computed_fields:
+            working_sets = list(program._iter_sets())
+            for fields, positions in computed_fields.items():
+                field_list = fields.split(',')
+                for i in positions:
+                    working_sets[i]._mark_computed(field_list)
+        return program
 
     @field_serializer('best_exercise_values')
     def serialize_best_exercise_values(self, v: dict[Exercise, float], _info) -> dict[str, float]:
         return {key.__str__(): value for key, value in v.items()}
 
+    @field_serializer('best_exercise_value_history')
+    def serialize_best_exercise_value_history(
+        self, v: dict[Exercise, dict[str, float]], _info
+    ) -> dict[str, dict[str, float]]:
+        return {key.__str__(): changes for key, changes in v.items()}
+
     def write_json_file(self, file_path: Path) -> None:
-        with open(file_path, 'w') as f:
-            f.write(self.model_dump_json(indent=2))
+        with span('program.write_json_file'):
+            with open(file_path, 'w') as f:
+                f.write(self.model_dump_json(indent=2))
 
-    def export_to_pdf(self, file_path: Path) -> None:
+    def export_to_pdf(self, file_path: Path, include_summary: bool = False) -> None:
         try:
             from pr_pro.pdf_export import export_program_to_pdf
         except ImportError as e:
             raise ImportError(
                 "PDF export requires additional dependencies. Please install with 'pip install pr_pro[vis]'"
             ) from e
-        export_program_to_pdf(self, file_path)
+        export_program_to_pdf(self, file_path, include_summary=include_summary)
 
     @staticmethod
     def from_json_file(file_path: Path) -> Program:
-        with open(file_path, 'r') as f:
-            return Program.model_validate_json(f.read())
+        with span('program.from_json_file'):
+            with span('read'):
+                with open(file_path, 'r') as f:
+                    data = f.read()
+            with span('validate'):
+                program = Program.model_validate_json(data)
+
+        if is_enabled():
+            count(
+                'sets.validated',
+                sum(s.get_number_of_sets() for s in program.workout_session_dict.values()),
+            )
+        return program
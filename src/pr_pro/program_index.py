@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ProgramIndexEntry:
+    """Lightweight summary of a program file, read without validating the full program."""
+
+    path: Path
+    mtime: float
+    name: str
+    program_phases: dict[str, list[str]] = field(default_factory=dict)
+    session_ids: list[str] = field(default_factory=list)
+    best_exercise_values: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return self.path.stem
+
+    def __str__(self) -> str:
+        return f'{self.name} ({self.path.name}, {len(self.session_ids)} sessions)'
+
+
+def read_program_index_entry(file_path: Path) -> ProgramIndexEntry:
+    """Reads the summary of a program json file, as written by `Program.write_json_file`."""
+    file_path = Path(file_path)
+    mtime = os.path.getmtime(file_path)
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+
+    if not isinstance(data, dict) or 'name' not in data:
+        raise ValueError(f'{file_path} is not a program file.')
+
+    # Exercise keys are serialized as 'Name (ExerciseType)'
+    best_exercise_values = {
+        key.split('(')[0].strip(): value
+        for key, value in data.get('best_exercise_values', {}).items()
+    }
+    return ProgramIndexEntry(
+        path=file_path,
+        mtime=mtime,
+        name=data['name'],
+        program_phases=data.get('program_phases', {}),
+        session_ids=list(data.get('workout_session_dict', {}).keys()),
+        best_exercise_values=best_exercise_values,
+    )
+
+
+def build_program_index(
+    directory: Path,
+    pattern: str = '*.json',
+    previous_index: dict[Path, ProgramIndexEntry] | None = None,
+) -> dict[Path, ProgramIndexEntry]:
+    """
+    Scans a directory for program files and builds an index of them.
+
+    Entries of `previous_index` whose files did not change (same modification time) are reused,
+    so rescanning only parses new or modified files. Files that are not valid programs are
+    skipped with a warning.
+    """
+    previous_index = previous_index or {}
+    index = {}
+    for file_path in sorted(Path(directory).glob(pattern)):
+        previous_entry = previous_index.get(file_path)
+        try:
+            if previous_entry is not None and previous_entry.mtime == os.path.getmtime(file_path):
+                index[file_path] = previous_entry
+            else:
+                index[file_path] = read_program_index_entry(file_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f'Skipping {file_path}: {e}')
+    return index
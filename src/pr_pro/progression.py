@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence, TextIO
+
+from pr_pro.exercise import Exercise_t
+from pr_pro.sets import WorkingSet_t
+from pr_pro.workout_component import ExerciseGroup, SingleExercise, WorkoutComponent_t
+from pr_pro.workout_session import WorkoutSession
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pr_pro.program import Program
+
+# Field values of the sets of one exercise in one week, as dumped from the template sets
+SetValues = list[dict[str, Any]]
+
+WEIGHT_FIELDS = ('weight', 'percentage', 'relative_percentage')
+
+
+class ProgressionRule(ABC):
+    """
+    Rule that derives the sets of a (one-based) week from the template sets of a component.
+    Rules are applied in order, each one to the output of the previous rule.
+    """
+
+    @abstractmethod
+    def apply(self, sets: SetValues, week: int) -> SetValues: ...
+
+
+def _has_value(set_values: dict[str, Any], field_name: str) -> bool:
+    return set_values.get(field_name) is not None
+
+
+@dataclass(frozen=True)
+class Linear(ProgressionRule):
+    """Adds `increment` to `field` every `every` weeks, e.g., `Linear('weight', 2.5)`."""
+
+    field: str
+    increment: float
+    every: int = 1
+    start_week: int = 1
+
+    def apply(self, sets: SetValues, week: int) -> SetValues:
+        n_steps = max(0, week - self.start_week) // self.every
+        return [
+            {**s, self.field: s[self.field] + n_steps * self.increment}
+            if _has_value(s, self.field)
+            else s
+            for s in sets
+        ]
+
+
+@dataclass(frozen=True)
+class Step(ProgressionRule):
+    """Sets `field` to an explicit value per week, the last value is kept after the last week."""
+
+    field: str
+    values: Sequence[Any]
+
+    def apply(self, sets: SetValues, week: int) -> SetValues:
+        value = self.values[min(week, len(self.values)) - 1]
+        return [{**s, self.field: value} if _has_value(s, self.field) else s for s in sets]
+
+
+@dataclass(frozen=True)
+class Wave(ProgressionRule):
+    """Undulating progression, adds the offsets to `field` in a repeating cycle."""
+
+    field: str
+    offsets: Sequence[float]
+
+    def apply(self, sets: SetValues, week: int) -> SetValues:
+        offset = self.offsets[(week - 1) % len(self.offsets)]
+        return [
+            {**s, self.field: s[self.field] + offset} if _has_value(s, self.field) else s
+            for s in sets
+        ]
+
+
+@dataclass(frozen=True)
+class PercentageRamp(ProgressionRule):
+    """Ramps `field` linearly from `start` in the first week to `end` in week `n_weeks`."""
+
+    start: float
+    end: float
+    n_weeks: int
+    field: str = 'percentage'
+
+    def apply(self, sets: SetValues, week: int) -> SetValues:
+        if self.n_weeks <= 1:
+            value = self.end
+        else:
+            fraction = (min(max(week, 1), self.n_weeks) - 1) / (self.n_weeks - 1)
+            value = self.start + fraction * (self.end - self.start)
+        return [{**s, self.field: value} if _has_value(s, self.field) else s for s in sets]
+
+
+@dataclass(frozen=True)
+class SetRepScheme(ProgressionRule):
+    """Cycles through (number of sets, reps) schemes, e.g., `[(5, 5), (4, 6), (3, 8)]`."""
+
+    schemes: Sequence[tuple[int, int]]
+
+    def apply(self, sets: SetValues, week: int) -> SetValues:
+        if not sets:
+            raise ValueError('A set/rep scheme requires at least one template set.')
+        n_sets, reps = self.schemes[(week - 1) % len(self.schemes)]
+        return [{**sets[0], 'reps': reps} for _ in range(n_sets)]
+
+
+@dataclass(frozen=True)
+class Deload(ProgressionRule):
+    """
+    Every `every`-th week, scales the weights (and optionally the number of sets) by the given
+    factors, e.g., `Deload(every=4, factor=0.6)` for three loading weeks and one deload week.
+    """
+
+    every: int
+    factor: float = 0.6
+    sets_factor: float = 1.0
+    fields: tuple[str, ...] = WEIGHT_FIELDS
+
+    def is_deload_week(self, week: int) -> bool:
+        return week % self.every == 0
+
+    def apply(self, sets: SetValues, week: int) -> SetValues:
+        if not self.is_deload_week(week):
+            return sets
+
+        n_sets = max(1, round(len(sets) * self.sets_factor)) if sets else 0
+        return [
+            {
+                **s,
+                **{f: s[f] * self.factor for f in self.fields if _has_value(s, f)},
+            }
+            for s in sets[:n_sets]
+        ]
+
+
+def _apply_rules(
+    template_sets: list[WorkingSet_t], rules: Sequence[ProgressionRule], week: int
+) -> list[WorkingSet_t]:
+    if not rules:
+        return [s.model_copy(deep=True) for s in template_sets]
+
+    set_values: SetValues = [s.model_dump() for s in template_sets]
+    for rule in rules:
+        set_values = rule.apply(set_values, week)
+    if not set_values:
+        return []
+
+    set_class = type(template_sets[0])
+    return [set_class(**values) for values in set_values]
+
+
+@dataclass(frozen=True)
+class ComponentProgression:
+    """
+    Component of week 1 together with the rules that derive it for later weeks. `rules` apply to
+    all exercises of the component, `exercise_rules` only to the given exercise (after `rules`).
+
+    The template should not be computed yet (i.e., only prescribe either weight or percentage),
+    the generated program is computed as a whole.
+    """
+
+    component: WorkoutComponent_t
+    rules: Sequence[ProgressionRule] = ()
+    exercise_rules: dict[Exercise_t, Sequence[ProgressionRule]] = field(default_factory=dict)
+
+    def for_week(
+        self, week: int, extra_rules: Sequence[ProgressionRule] = ()
+    ) -> WorkoutComponent_t:
+        component = self.component
+        if isinstance(component, SingleExercise):
+            rules = [*self.rules, *self.exercise_rules.get(component.exercise, ()), *extra_rules]
+            return SingleExercise(
+                exercise=component.exercise,
+                notes=component.notes,
+                sets=_apply_rules(component.sets, rules, week),
+            )
+
+        exercise_sets_dict = {
+            e: _apply_rules(
+                component.exercise_sets_dict[e],
+                [*self.rules, *self.exercise_rules.get(e, ()), *extra_rules],
+                week,
+            )
+            for e in component.exercises
+        }
+        if len({len(sets) for sets in exercise_sets_dict.values()}) > 1:
+            raise ValueError(
+                f'Progression of {component.get_summary().title} results in a different number '
+                f'of sets per exercise in week {week}.'
+            )
+        return ExerciseGroup(
+            exercises=list(component.exercises),
+            notes=component.notes,
+            exercise_sets_dict=exercise_sets_dict,
+        )
+
+
+@dataclass(frozen=True)
+class SessionTemplate:
+    """Session that repeats every week, `id` is formatted with the week, e.g., 'W{week}D1'."""
+
+    id: str
+    components: Sequence[ComponentProgression]
+    notes: str | None = None
+
+    def __post_init__(self):
+        if '{week}' not in self.id:
+            raise ValueError(f"Session id '{self.id}' must contain '{{week}}'.")
+
+    def for_week(self, week: int, extra_rules: Sequence[ProgressionRule] = ()) -> WorkoutSession:
+        return WorkoutSession(
+            id=self.id.format(week=week),
+            notes=self.notes,
+            workout_components=[c.for_week(week, extra_rules) for c in self.components],
+        )
+
+
+@dataclass
+class ProgressionBlock:
+    """
+    Declarative training block of `n_weeks` weeks. Sessions of a week are generated from the
+    session templates and rules only when the week is accessed, so long blocks do not build every
+    session upfront and week `n` does not depend on copying the weeks before it.
+
+    `rules` apply to every component, e.g., a `Deload` for the whole block.
+    """
+
+    n_weeks: int
+    sessions: Sequence[SessionTemplate]
+    rules: Sequence[ProgressionRule] = ()
+    _weeks: dict[int, list[WorkoutSession]] = field(default_factory=dict, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return self.n_weeks
+
+    def _check_week(self, week: int) -> None:
+        if not 1 <= week <= self.n_weeks:
+            raise IndexError(f'Week {week} is not part of the block (1 to {self.n_weeks}).')
+
+    def generate_week(self, week: int) -> list[WorkoutSession]:
+        """Generates the sessions of a week without caching them."""
+        self._check_week(week)
+        return [template.for_week(week, self.rules) for template in self.sessions]
+
+    def get_week(self, week: int) -> list[WorkoutSession]:
+        """Returns the (cached) sessions of a week."""
+        if week not in self._weeks:
+            self._weeks[week] = self.generate_week(week)
+        return self._weeks[week]
+
+    def _get_weeks(self, weeks: Iterable[int] | None) -> Iterable[int]:
+        return range(1, self.n_weeks + 1) if weeks is None else weeks
+
+    def iter_weeks(self, weeks: Iterable[int] | None = None) -> Iterator[list[WorkoutSession]]:
+        """Lazily generates the sessions week by week. Generated weeks are not cached."""
+        for week in self._get_weeks(weeks):
+            sessions = self._weeks.get(week)
+            yield sessions if sessions is not None else self.generate_week(week)
+
+    def iter_sessions(self, weeks: Iterable[int] | None = None) -> Iterator[WorkoutSession]:
+        for sessions in self.iter_weeks(weeks):
+            yield from sessions
+
+    def write_text(self, stream: TextIO) -> None:
+        """Streams the text representation of all sessions, one week in memory at a time."""
+        for session in self.iter_sessions():
+            session.write_text(stream)
+            stream.write('\n')
+
+    def add_to_program(
+        self,
+        program: Program,
+        weeks: Iterable[int] | None = None,
+        phase_id: str | None = 'Week {week}',
+    ) -> Program:
+        """
+        Materializes the (given) weeks into `program`. With `phase_id`, every week is added as a
+        program phase.
+        """
+        for week in self._get_weeks(weeks):
+            sessions = self.get_week(week)
+            for session in sessions:
+                program.add_workout_session(session)
+            if phase_id is not None:
+                program.add_program_phase(phase_id.format(week=week), [s.id for s in sessions])
+        return program
@@ -0,0 +1,297 @@
+"""
+Queries over the sets of a program, e.g., all deadlift sets at or above 85% in a phase:
+
+    program.query_sets(exercise=deadlift, phase='Peak', percentage=(0.85, None))
+    program.query_sessions(relative_percentage=(0.9, None))
+
+The sets are collected into columns (one row per set, in program order) once. Indexes are only
+built when a query needs them: rows per exercise and a sorted array per numeric field, which
+answers range filters by binary search. A query materializes the rows of its most selective
+indexed filter and checks the remaining filters on these rows only.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable
+
+import numpy as np
+
+from pr_pro.exercise import Exercise
+from pr_pro.workout_component import SingleExercise
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pr_pro.exercise import Exercise_t
+    from pr_pro.program import Program
+    from pr_pro.sets import WorkingSet_t
+
+NUMERIC_FIELDS = ('reps', 'weight', 'percentage', 'relative_percentage', 'rpe')
+# Tolerance of the (inclusive) range bounds, e.g., for computed percentages
+RANGE_TOLERANCE = 1e-9
+
+Range = tuple[float | None, float | None]
+
+
+@dataclass(frozen=True)
+class SetRef:
+    """Reference to a set of a program (the set itself is not copied)."""
+
+    session_id: str
+    component_index: int
+    exercise: Exercise_t
+    set_index: int  # index within the sets of the exercise in the component
+    working_set: WorkingSet_t
+
+
+@dataclass(frozen=True)
+class _Filter:
+    size: int  # number of matching rows
+    get_rows: Callable[[], np.ndarray]  # sorted matching rows
+    mask: Callable[[np.ndarray], np.ndarray]  # which of the given rows match
+
+
+class SetIndex:
+    """
+    Columnar index over all sets of a program. Use `Program.get_set_index` to get the cached
+    index, which is rebuilt when the program changed.
+    """
+
+    def __init__(self, program: Program):
+        session_index = program.get_session_index()
+        self.session_ids = tuple(program.workout_session_dict)
+        session_positions = {s: i for i, s in enumerate(self.session_ids)}
+        self.phases = {
+            phase: np.array(sorted({session_positions[s] for s in ids}), dtype=np.intp)
+            for phase, ids in program.program_phases.items()
+        }
+        self.weeks = {
+            week: np.array(sorted(session_positions[s] for s in ids), dtype=np.intp)
+            for week, ids in session_index.weeks.items()
+        }
+
+        exercise_codes_by_exercise: dict[Exercise_t, int] = {}
+        self.sets: list[WorkingSet_t] = []
+        session_starts = [0]
+        exercise_codes, component_indices, set_indices, rows = [], [], [], []
+        for session in program.workout_session_dict.values():
+            for component_index, component in enumerate(session.workout_components):
+                if isinstance(component, SingleExercise):
+                    exercise_sets = {component.exercise: component.sets}
+                else:
+                    exercise_sets = component.exercise_sets_dict
+
+                for exercise, sets in exercise_sets.items():
+                    exercise_code = exercise_codes_by_exercise.setdefault(
+                        exercise, len(exercise_codes_by_exercise)
+                    )
+                    for working_set in sets:
+                        # From __dict__, as missing attributes are slow on pydantic models
+                        values = working_set.__dict__
+                        rows.append(
+                            [
+                                math.nan if (v := values.get(f)) is None else v
+                                for f in NUMERIC_FIELDS
+                            ]
+                        )
+                    self.sets.extend(sets)
+                    exercise_codes.extend([exercise_code] * len(sets))
+                    component_indices.extend([component_index] * len(sets))
+                    set_indices.extend(range(len(sets)))
+            session_starts.append(len(self.sets))
+
+        self.exercises: tuple[Exercise_t, ...] = tuple(exercise_codes_by_exercise)
+        self.session_starts = np.array(session_starts, dtype=np.intp)
+        self.exercise_codes = np.array(exercise_codes, dtype=np.intp)
+        self.component_indices = np.array(component_indices, dtype=np.intp)
+        self.set_indices = np.array(set_indices, dtype=np.intp)
+        values = np.array(rows, dtype=float).reshape(len(rows), len(NUMERIC_FIELDS))
+        self.values = {f: values[:, i] for i, f in enumerate(NUMERIC_FIELDS)}
+
+        # Lazily built indexes
+        self._exercise_rows: dict[int, np.ndarray] | None = None
+        self._sorted: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.sets)
+
+    def _get_exercise_rows(self, exercise_code: int) -> np.ndarray:
+        if self._exercise_rows is None:
+            order = np.argsort(self.exercise_codes, kind='stable')
+            starts = np.searchsorted(
+                self.exercise_codes[order], np.arange(len(self.exercises) + 1), 'left'
+            )
+            self._exercise_rows = {
+                code: order[starts[code] : starts[code + 1]] for code in range(len(self.exercises))
+            }
+        return self._exercise_rows[exercise_code]
+
+    def _get_sorted(self, field: str) -> tuple[np.ndarray, np.ndarray]:
+        """Rows with a value of the field, sorted by value, and the sorted values."""
+        if field not in self._sorted:
+            values = self.values[field]
+            order = np.argsort(values, kind='stable')
+            n_valid = int(np.count_nonzero(~np.isnan(values)))
+            self._sorted[field] = (order[:n_valid], values[order[:n_valid]])
+        return self._sorted[field]
+
+    def _exercise_filter(self, codes: list[int]) -> _Filter:
+        code_array = np.array(codes, dtype=np.intp)
+        return _Filter(
+            size=sum(len(self._get_exercise_rows(c)) for c in codes),
+            get_rows=lambda: np.sort(
+                np.concatenate([np.empty(0, np.intp)] + [self._get_exercise_rows(c) for c in codes])
+            ),
+            mask=lambda rows: np.isin(self.exercise_codes[rows], code_array),
+        )
+
+    def _session_filter(self, session_codes: np.ndarray) -> _Filter:
+        starts, ends = self.session_starts[session_codes], self.session_starts[session_codes + 1]
+
+        def mask(rows: np.ndarray) -> np.ndarray:
+            codes = np.searchsorted(self.session_starts, rows, 'right') - 1
+            return np.isin(codes, session_codes)
+
+        return _Filter(
+            size=int((ends - starts).sum()),
+            get_rows=lambda: np.concatenate(
+                [np.empty(0, np.intp)] + [np.arange(s, e) for s, e in zip(starts, ends)]
+            ),
+            mask=mask,
+        )
+
+    def _range_filter(self, field: str, value_range: Range) -> _Filter:
+        low, high = value_range
+        low = -math.inf if low is None else low - RANGE_TOLERANCE
+        high = math.inf if high is None else high + RANGE_TOLERANCE
+        sorted_rows, sorted_values = self._get_sorted(field)
+        start = int(np.searchsorted(sorted_values, low, 'left'))
+        end = int(np.searchsorted(sorted_values, high, 'right'))
+
+        def mask(rows: np.ndarray) -> np.ndarray:
+            values = self.values[field][rows]
+            return (values >= low) & (values <= high)
+
+        return _Filter(
+            size=max(end - start, 0),
+            get_rows=lambda: np.sort(sorted_rows[start:end]),
+            mask=mask,
+        )
+
+    def _get_filters(
+        self,
+        exercise: Exercise_t | str | Iterable[Exercise_t | str] | None,
+        exercise_type: type[Exercise] | tuple[type[Exercise], ...] | None,
+        session: str | Iterable[str] | None,
+        phase: str | None,
+        week: str | None,
+        ranges: dict[str, Range],
+    ) -> list[_Filter]:
+        filters = []
+        if exercise is not None:
+            if isinstance(exercise, (str, Exercise)):
+                exercise = [exercise]
+            names = {e if isinstance(e, str) else e.name for e in exercise}
+            filters.append(
+                self._exercise_filter([i for i, e in enumerate(self.exercises) if e.name in names])
+            )
+        if exercise_type is not None:
+            filters.append(
+                self._exercise_filter(
+                    [i for i, e in enumerate(self.exercises) if isinstance(e, exercise_type)]
+                )
+            )
+
+        if session is not None:
+            session_ids = {session} if isinstance(session, str) else set(session)
+            codes = [i for i, s in enumerate(self.session_ids) if s in session_ids]
+            filters.append(self._session_filter(np.array(codes, dtype=np.intp)))
+        if phase is not None:
+            if phase not in self.phases:
+                raise ValueError(f'Program phase with id {phase} does not exist.')
+            filters.append(self._session_filter(self.phases[phase]))
+        if week is not None:
+            filters.append(self._session_filter(self.weeks.get(week, np.empty(0, np.intp))))
+
+        for field, value_range in ranges.items():
+            if field not in NUMERIC_FIELDS:
+                raise ValueError(f'Unknown field {field}, expected one of {NUMERIC_FIELDS}.')
+            if value_range is not None:
+                filters.append(self._range_filter(field, value_range))
+        return filters
+
+    def get_rows(
+        self,
+        exercise: Exercise_t | str | Iterable[Exercise_t | str] | None = None,
+        exercise_type: type[Exercise] | tuple[type[Exercise], ...] | None = None,
+        session: str | Iterable[str] | None = None,
+        phase: str | None = None,
+        week: str | None = None,
+        **ranges: Range,
+    ) -> np.ndarray:
+        """Rows (in program order) of the sets matching all filters, see `query`."""
+        filters = self._get_filters(exercise, exercise_type, session, phase, week, ranges)
+        if not filters:
+            return np.arange(len(self))
+
+        filters.sort(key=lambda f: f.size)
+        rows = filters[0].get_rows()
+        for f in filters[1:]:
+            if not len(rows):
+                break
+            rows = rows[f.mask(rows)]
+        return rows
+
+    def query(
+        self,
+        exercise: Exercise_t | str | Iterable[Exercise_t | str] | None = None,
+        exercise_type: type[Exercise] | tuple[type[Exercise], ...] | None = None,
+        session: str | Iterable[str] | None = None,
+        phase: str | None = None,
+        week: str | None = None,
+        **ranges: Range,
+    ) -> list[SetRef]:
+        """
+        Returns references to the sets matching all filters, in program order.
+
+        Args:
+            exercise: Exercise(s) or exercise name(s).
+            exercise_type: Exercise class(es), e.g., `RepsAndWeightsExercise` (with subclasses).
+            session: Session id(s).
+            phase: Program phase id.
+            week: Week as in the session index, e.g., 'Week 3'.
+            ranges: Inclusive (min, max) ranges of numeric fields (see `NUMERIC_FIELDS`), None for
+                an open bound, e.g., `percentage=(0.85, None)`. Sets without the field never match.
+        """
+        rows = self.get_rows(exercise, exercise_type, session, phase, week, **ranges)
+        session_codes = (np.searchsorted(self.session_starts, rows, 'right') - 1).tolist()
+        return [
+            SetRef(
+                session_id=self.session_ids[session_code],
+                component_index=component_index,
+                exercise=self.exercises[exercise_code],
+                set_index=set_index,
+                working_set=self.sets[row],
+            )
+            for row, session_code, component_index, exercise_code, set_index in zip(
+                rows.tolist(),
+                session_codes,
+                self.component_indices[rows].tolist(),
+                self.exercise_codes[rows].tolist(),
+                self.set_indices[rows].tolist(),
+            )
+        ]
+
+    def query_sessions(
+        self,
+        exercise: Exercise_t | str | Iterable[Exercise_t | str] | None = None,
+        exercise_type: type[Exercise] | tuple[type[Exercise], ...] | None = None,
+        session: str | Iterable[str] | None = None,
+        phase: str | None = None,
+        week: str | None = None,
+        **ranges: Range,
+    ) -> list[str]:
+        """Ids of the sessions with at least one set matching all filters (see `query`)."""
+        rows = self.get_rows(exercise, exercise_type, session, phase, week, **ranges)
+        session_codes = np.unique(np.searchsorted(self.session_starts, rows, 'right') - 1)
+        return [self.session_ids[code] for code in session_codes.tolist()]
@@ -0,0 +1,108 @@
+"""
+RPE charts, mapping reps x RPE to a percentage of the best exercise value (1RM), used to compute
+the weights of `RepsRPESet`s. Without a chart in the `ComputeConfig`, the chart is derived from
+its one rep max calculator (reps in reserve count as reps, e.g., 5 reps at RPE 8 ~ 7RM).
+
+The chart is precomputed on a grid of reps and RPE values. Values on the grid are looked up
+directly, others are interpolated bilinearly (and clipped to the grid).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Mapping, Sequence
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pr_pro.configs import ComputeConfig
+    from pr_pro.functions import OneRMCalculator
+
+DEFAULT_REPS = tuple(range(1, 13))
+DEFAULT_RPES = tuple(5 + 0.5 * i for i in range(11))  # 5, 5.5, ..., 10
+
+
+def _locate(axis: Sequence[float], x: float) -> tuple[int, float]:
+    """Index of the grid cell containing x and the position within the cell (clipped)."""
+    if len(axis) == 1 or x <= axis[0]:
+        return 0, 0.0
+    if x >= axis[-1]:
+        return len(axis) - 2, 1.0
+    i = bisect_right(axis, x) - 1
+    return i, (x - axis[i]) / (axis[i + 1] - axis[i])
+
+
+@dataclass(frozen=True)
+class RPEChart:
+    """Percentages of the 1RM on a grid, rows are reps and columns RPE values (both ascending)."""
+
+    reps: tuple[float, ...]
+    rpes: tuple[float, ...]
+    percentages: tuple[tuple[float, ...], ...]
+    _lookup: dict[tuple[float, float], float] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        for name, axis in (('reps', self.reps), ('rpes', self.rpes)):
+            if not axis or any(a >= b for a, b in zip(axis, axis[1:])):
+                raise ValueError(f'The {name} of the chart must be non-empty and ascending.')
+        if len(self.percentages) != len(self.reps) or any(
+            len(row) != len(self.rpes) for row in self.percentages
+        ):
+            raise ValueError('The percentages must have one row per reps and one value per RPE.')
+        self._lookup.update(
+            ((reps, rpe), percentage)
+            for reps, row in zip(self.reps, self.percentages)
+            for rpe, percentage in zip(self.rpes, row)
+        )
+
+    @staticmethod
+    def from_table(table: Mapping[float, Mapping[float, float]]) -> RPEChart:
+        """Chart from a table `{reps: {rpe: percentage}}`, all rows need the same RPE values."""
+        reps = tuple(sorted(table))
+        rpes = tuple(sorted(table[reps[0]])) if reps else ()
+        if any(set(row) != set(rpes) for row in table.values()):
+            raise ValueError('All rows of the table must have the same RPE values.')
+        return RPEChart(reps, rpes, tuple(tuple(table[r][rpe] for rpe in rpes) for r in reps))
+
+    @staticmethod
+    def from_calculator(
+        calculator: OneRMCalculator,
+        reps: Sequence[float] = DEFAULT_REPS,
+        rpes: Sequence[float] = DEFAULT_RPES,
+    ) -> RPEChart:
+        """Chart derived from a one rep max calculator, reps in reserve (10 - RPE) count as reps."""
+        return RPEChart(
+            tuple(reps),
+            tuple(rpes),
+            tuple(
+                tuple(calculator.max_weight_from_reps(1.0, r + 10 - rpe) for rpe in rpes)
+                for r in reps
+            ),
+        )
+
+    def get_percentage(self, reps: float, rpe: float) -> float:
+        percentage = self._lookup.get((reps, rpe))
+        if percentage is not None:
+            return percentage
+
+        i, s = _locate(self.reps, reps)
+        j, t = _locate(self.rpes, rpe)
+        rows = self.percentages
+        i1, j1 = min(i + 1, len(self.reps) - 1), min(j + 1, len(self.rpes) - 1)
+        return (1 - s) * ((1 - t) * rows[i][j] + t * rows[i][j1]) + s * (
+            (1 - t) * rows[i1][j] + t * rows[i1][j1]
+        )
+
+
+@lru_cache(maxsize=16)
+def _get_calculator_chart(calculator: OneRMCalculator) -> RPEChart:
+    return RPEChart.from_calculator(calculator)
+
+
+def get_rpe_chart(compute_config: ComputeConfig) -> RPEChart:
+    """The chart of the config, or the (cached) chart derived from its one rep max calculator."""
+    if compute_config.rpe_chart is not None:
+        return compute_config.rpe_chart
+    return _get_calculator_chart(compute_config.one_rm_calculator)
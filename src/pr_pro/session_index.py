@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import math
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+# Matches the week of session ids like 'W1D1', 'w12_d3' or 'Week 3 Day 1'
+DEFAULT_WEEK_PATTERN = r'^[Ww](?:eek)?[ _-]?(\d+)'
+
+
+@dataclass(frozen=True)
+class SessionIndex:
+    """
+    Ordered index over the sessions of a program, used for navigating programs with many sessions.
+
+    Sessions are ordered by program phase (in phase order) followed by sessions that are not part
+    of any phase, in insertion order.
+    """
+
+    session_ids: tuple[str, ...]
+    phases: dict[str, tuple[str, ...]]
+    weeks: dict[str, tuple[str, ...]]
+    positions: dict[str, int]
+    phase_of_session: dict[str, str]
+    week_of_session: dict[str, str]
+    sorted_ids: list[tuple[str, str]] = field(repr=False)
+
+    @staticmethod
+    def build(
+        session_ids: list[str],
+        program_phases: dict[str, list[str]],
+        week_pattern: str = DEFAULT_WEEK_PATTERN,
+    ) -> SessionIndex:
+        ordered_ids: list[str] = []
+        seen: set[str] = set()
+        phase_of_session: dict[str, str] = {}
+        for phase_id, phase_session_ids in program_phases.items():
+            for session_id in phase_session_ids:
+                phase_of_session.setdefault(session_id, phase_id)
+                if session_id not in seen:
+                    seen.add(session_id)
+                    ordered_ids.append(session_id)
+        ordered_ids.extend(s for s in session_ids if s not in seen)
+
+        week_regex = re.compile(week_pattern)
+        weeks: dict[str, list[str]] = {}
+        week_of_session: dict[str, str] = {}
+        for session_id in ordered_ids:
+            match = week_regex.match(session_id)
+            if match:
+                week = f'Week {int(match.group(1))}'
+                week_of_session[session_id] = week
+                weeks.setdefault(week, []).append(session_id)
+
+        return SessionIndex(
+            session_ids=tuple(ordered_ids),
+            phases={p: tuple(ids) for p, ids in program_phases.items()},
+            weeks={w: tuple(ids) for w, ids in weeks.items()},
+            positions={s: i for i, s in enumerate(ordered_ids)},
+            phase_of_session=phase_of_session,
+            week_of_session=week_of_session,
+            sorted_ids=sorted((s.lower(), s) for s in ordered_ids),
+        )
+
+    def __len__(self) -> int:
+        return len(self.session_ids)
+
+    def filter(self, phase: str | None = None, week: str | None = None) -> tuple[str, ...]:
+        """Returns the ordered session ids of a phase and/or week."""
+        if phase is None and week is None:
+            return self.session_ids
+        if week is None:
+            return self.phases[phase]  # type: ignore
+        week_ids = self.weeks.get(week, ())
+        if phase is None:
+            return week_ids
+        return tuple(s for s in week_ids if self.phase_of_session.get(s) == phase)
+
+    def search(self, query: str, limit: int = 20) -> list[str]:
+        """
+        Case insensitive search by session id, returning at most `limit` ids.
+        Prefix matches are found by binary search and come first (in program order), followed by
+        ids that only contain the query.
+        """
+        query = query.strip().lower()
+        if not query:
+            return list(self.session_ids[:limit])
+
+        results = []
+        i = bisect_left(self.sorted_ids, (query, ''))
+        while i < len(self.sorted_ids) and self.sorted_ids[i][0].startswith(query):
+            results.append(self.sorted_ids[i][1])
+            i += 1
+        results.sort(key=self.positions.__getitem__)
+
+        if len(results) < limit:
+            results.extend(
+                session_id
+                for lower_id, session_id in zip(
+                    (s.lower() for s in self.session_ids), self.session_ids
+                )
+                if query in lower_id and not lower_id.startswith(query)
+            )
+        return results[:limit]
+
+    @staticmethod
+    def get_page(
+        session_ids: tuple[str, ...] | list[str], page: int, page_size: int
+    ) -> tuple[str, ...]:
+        """Returns the session ids of a (zero-based) page."""
+        return tuple(session_ids[page * page_size : (page + 1) * page_size])
+
+    @staticmethod
+    def get_number_of_pages(session_ids: tuple[str, ...] | list[str], page_size: int) -> int:
+        return max(1, math.ceil(len(session_ids) / page_size))
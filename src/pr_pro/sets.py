@@ -1,46 +1,143 @@
 from __future__ import annotations
 
+import copy
 import datetime
+import enum
 import logging
-from typing import Any, Callable
+import types
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Self, Union, get_args, get_origin
 
-import pandas as pd
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+from pr_pro.caching import ModelCache
 from pr_pro.configs import ComputeConfig
+from pr_pro.instrumentation import span
+from pr_pro.rpe import get_rpe_chart
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+    from pr_pro.loading import Loading
 
 logger = logging.getLogger(__name__)
 
+# Interned tuples of computed fields (see `WorkingSet._mark_computed`)
+_computed_fields: dict[tuple[str, ...], tuple[str, ...]] = {}
+
 
 class WorkingSet(BaseModel):
+    # Fields that are computed from the best exercise value, unless they are prescribed
+    derived_fields: ClassVar[tuple[str, ...]] = ()
+
     rest_between: datetime.timedelta | None = None
 
+    _cache: ModelCache = PrivateAttr(default_factory=ModelCache)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # An assigned value is prescribed, even if it was computed before
+        cache = self.__pydantic_private__['_cache']  # type: ignore
+        computed_fields = cache.get('computed_fields')
+        if computed_fields and name in computed_fields:
+            cache['computed_fields'] = tuple(f for f in computed_fields if f != name)
+        # In-place edits invalidate the component the set belongs to
+        component_ref = cache.get('component')
+        if component_ref is not None:
+            component = component_ref()
+            if component is not None:
+                component.invalidate_summary()
+
+    def __copy__(self) -> Self:
+        copied = super().__copy__()
+        # The copy gets its own private cache and doesn't belong to the set's component
+        cache = self.__pydantic_private__['_cache']  # type: ignore
+        copied.__pydantic_private__['_cache'] = copy.copy(cache)  # type: ignore
+        return copied
+
     def __str__(self) -> str:
-        formatted_items = []
-        for a, value in self.model_dump().items():
-            if value is not None:
-                if isinstance(value, float):
-                    formatted_items.append(f'{a} {round(value, 3)}')
-                else:
-                    formatted_items.append(f'{a} {value}')
-        return ', '.join(formatted_items)
+        # Formats all fields that are not None as 'name value', floats rounded to 3 digits
+        return get_set_formatter(type(self))(self)
 
     def compute_values(self, best_exercise_value: float, compute_config: ComputeConfig) -> None:
         # A lot of set types cannot compute values, hence they don't have to redefine the method
         pass
 
+    def apply_loading(self, loading: Loading) -> None:
+        """Rounds the weight to a loadable weight (`loaded_weight`), for sets with weights."""
+        if 'loaded_weight' not in type(self).model_fields:
+            return
+        if 'loaded_weight' in self._get_fields_to_compute():
+            weight = self.__dict__['weight']
+            self.__dict__['loaded_weight'] = None if weight is None else loading.round(weight)
+
+    def _get_fields_to_compute(self) -> list[str]:
+        """Derived fields that are not prescribed (computed before, not set or None)."""
+        fields_set = self.__pydantic_fields_set__
+        cache = self.__pydantic_private__['_cache']  # type: ignore
+        computed_fields = cache.get('computed_fields', ())
+        return [
+            f
+            for f in self.derived_fields
+            if f in computed_fields or f not in fields_set or self.__dict__[f] is None
+        ]
+
+    def get_computed_fields(self) -> tuple[str, ...]:
+        """Derived fields whose values were computed, i.e., are not prescribed."""
+        return self.__pydantic_private__['_cache'].get('computed_fields', ())  # type: ignore
+
+    def _mark_computed(self, fields: list[str]) -> None:
+        # Assigning the computed values marks them as set, the cache tells them from prescribed ones
+        # (interned, sets share a few combinations of computed fields)
+        computed_fields = tuple(fields)
+        computed_fields = _computed_fields.setdefault(computed_fields, computed_fields)
+        self.__pydantic_private__['_cache']['computed_fields'] = computed_fields  # type: ignore
+
+    def reset_computed_values(self) -> None:
+        """
+        Resets the computed values to None, so the set can be computed with another best exercise
+        value. Sets loaded from json with computed values cannot tell computed from prescribed
+        values and keep all values.
+        """
+        for f in self._get_fields_to_compute():
+            self.__dict__[f] = None
+
 
 class RepsSet(WorkingSet):
     reps: int
 
 
 class RepsRPESet(RepsSet):
+    derived_fields: ClassVar[tuple[str, ...]] = ('weight', 'percentage', 'loaded_weight')
+
     rpe: int
+    weight: float | None = Field(default=None, ge=0)
+    percentage: float | None = Field(default=None, ge=0)
+    loaded_weight: float | None = Field(default=None, ge=0)
+
+    def compute_values(self, best_exercise_value: float, compute_config: ComputeConfig) -> None:
+        # Without prescribed weight or percentage, the percentage is looked up in the RPE chart
+        fields_to_compute = self._get_fields_to_compute()
+        if self.percentage is None:
+            if self.weight is not None:
+                self.percentage = self.weight / best_exercise_value
+            else:
+                self.percentage = get_rpe_chart(compute_config).get_percentage(self.reps, self.rpe)
+        if self.weight is None:
+            self.weight = best_exercise_value * self.percentage
+        self._mark_computed(fields_to_compute)
 
 
 class RepsAndWeightsSet(RepsSet):
+    derived_fields: ClassVar[tuple[str, ...]] = (
+        'weight',
+        'percentage',
+        'relative_percentage',
+        'loaded_weight',
+    )
+
     weight: float | None = Field(default=None, ge=0)
     percentage: float | None = Field(default=None, ge=0)
     relative_percentage: float | None = Field(default=None, ge=0)
+    # Weight rounded to a loadable weight (see `ComputeConfig.loading_config`)
+    loaded_weight: float | None = Field(default=None, ge=0)
 
     @model_validator(mode='before')
     @classmethod
@@ -54,6 +151,7 @@ class RepsAndWeightsSet(RepsSet):
         return data
 
     def compute_values(self, best_exercise_value: float, compute_config: ComputeConfig) -> None:
+        fields_to_compute = self._get_fields_to_compute()
         tol = 1e-6
 
         if self.weight is not None:
@@ -101,11 +199,15 @@ class RepsAndWeightsSet(RepsSet):
         assert self.weight is not None
         assert self.percentage is not None
         assert self.relative_percentage is not None
+        self._mark_computed(fields_to_compute)
 
 
 class PowerExerciseSet(RepsSet):
+    derived_fields: ClassVar[tuple[str, ...]] = ('weight', 'percentage', 'loaded_weight')
+
     weight: float | None = Field(default=None, ge=0)
     percentage: float | None = Field(default=None, ge=0)
+    loaded_weight: float | None = Field(default=None, ge=0)
 
     @model_validator(mode='before')
     @classmethod
@@ -115,6 +217,7 @@ class PowerExerciseSet(RepsSet):
         return data
 
     def compute_values(self, best_exercise_value: float, compute_config: ComputeConfig) -> None:
+        fields_to_compute = self._get_fields_to_compute()
         tol = 1e-6
 
         if self.weight is not None:
@@ -137,6 +240,7 @@ class PowerExerciseSet(RepsSet):
 
         assert self.weight is not None
         assert self.percentage is not None
+        self._mark_computed(fields_to_compute)
 
 
 class RepsDistanceSet(RepsSet):
@@ -150,6 +254,92 @@ class DurationSet(WorkingSet):
 WorkingSet_t = RepsSet | RepsRPESet | RepsAndWeightsSet | PowerExerciseSet | DurationSet
 
 
+SetFormatter = Callable[[WorkingSet], str]
+
+_SET_FORMATTERS: dict[type[WorkingSet], SetFormatter] = {}
+
+
+def _get_value_kind(annotation: Any) -> str:
+    """Returns 'float' for float fields, 'plain' for fields that cannot hold floats, else 'any'."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        kinds = {_get_value_kind(arg) for arg in get_args(annotation) if arg is not type(None)}
+        return kinds.pop() if len(kinds) == 1 else 'any'
+    if annotation is float:
+        return 'float'
+    if annotation in _PLAIN_TYPES:
+        return 'plain'
+    return 'any'
+
+
+# Types that model_dump() returns unchanged (and that are not floats)
+_PLAIN_TYPES = (int, bool, str, datetime.timedelta, datetime.date, datetime.datetime)
+
+
+def _format_any(ws: WorkingSet, name: str, v: Any) -> Any:
+    """Value of a field of any type, as `model_dump()` would serialize it (floats rounded)."""
+    if isinstance(v, float):
+        return round(v, 3)
+    if type(v) in _PLAIN_TYPES or isinstance(v, enum.Enum):
+        return v
+    # Nested models, containers, ...
+    return ws.model_dump(include={name})[name]
+
+
+def _format_model_dump(ws: WorkingSet) -> str:
+    return ', '.join(
+        f'{a} {round(v, 3) if isinstance(v, float) else v}'
+        for a, v in ws.model_dump().items()
+        if v is not None
+    )
+
+
+def _build_set_formatter(set_type: type[WorkingSet]) -> SetFormatter:
+    """
+    Builds a formatting function specialized to the fields of `set_type`, so formatting a set
+    neither dumps the model nor dispatches on the field types at runtime. The output is the same
+    as formatting `model_dump()`, to which classes with custom serializers fall back.
+    """
+    decorators = set_type.__pydantic_decorators__
+    if decorators.field_serializers or decorators.model_serializers:
+        return _format_model_dump
+
+    fields = [
+        (name, _get_value_kind(field_info.annotation))
+        for name, field_info in set_type.model_fields.items()
+        if not field_info.exclude
+    ]
+    computed_fields = tuple(set_type.model_computed_fields)
+
+    def format_set(ws: WorkingSet) -> str:
+        d = ws.__dict__
+        items = []
+        for name, kind in fields:
+            v = d.get(name)
+            if v is None:
+                continue
+            if kind == 'float':
+                items.append(f'{name} {round(v, 3)}')
+            elif kind == 'plain':
+                items.append(f'{name} {v}')
+            else:
+                items.append(f'{name} {_format_any(ws, name, v)}')
+        for name in computed_fields:
+            v = getattr(ws, name)
+            if v is not None:
+                items.append(f'{name} {_format_any(ws, name, v)}')
+        return ', '.join(items)
+
+    return format_set
+
+
+def get_set_formatter(set_type: type[WorkingSet]) -> SetFormatter:
+    """Returns the formatter of a set class (including user subclasses), built on first use."""
+    formatter = _SET_FORMATTERS.get(set_type)
+    if formatter is None:
+        formatter = _SET_FORMATTERS[set_type] = _build_set_formatter(set_type)
+    return formatter
+
+
 MetricConfig = tuple[str, str, Callable[[Any], Any] | None]
 
 METRIC_CONFIGS: dict[type[WorkingSet_t], list[MetricConfig]] = {
@@ -158,15 +348,20 @@ METRIC_CONFIGS: dict[type[WorkingSet_t], list[MetricConfig]] = {
         ('weight', 'Weight (kg)', lambda w: f'{round(w, 1)}'),
         ('percentage', 'Abs %', lambda p: f'{p * 100:.0f}%'),
         ('relative_percentage', 'Rel %', lambda rp: f'{rp * 100:.0f}%'),
+        ('loaded_weight', 'Loaded (kg)', lambda w: f'{round(w, 2)}'),
     ],
     RepsRPESet: [
         ('reps', 'Reps', None),
         ('rpe', 'RPE', None),
+        ('weight', 'Weight (kg)', lambda w: f'{round(w, 1)}'),
+        ('percentage', 'Abs %', lambda p: f'{p * 100:.0f}%'),
+        ('loaded_weight', 'Loaded (kg)', lambda w: f'{round(w, 2)}'),
     ],
     PowerExerciseSet: [
         ('reps', 'Reps', None),
         ('weight', 'Weight (kg)', lambda w: f'{round(w, 1)}'),
         ('percentage', 'Abs %', lambda p: f'{p * 100:.0f}%'),
+        ('loaded_weight', 'Loaded (kg)', lambda w: f'{round(w, 2)}'),
     ],
     RepsSet: [
         ('reps', 'Reps', None),
@@ -221,31 +416,34 @@ def create_sets_dataframe(_sets: list[WorkingSet_t]) -> pd.DataFrame:
     Returns:
         A pandas DataFrame where each row represents a set and each column a metric.
     """
-    if not _sets:
-        return pd.DataFrame()
+    import pandas as pd
+
+    with span('sets.create_dataframe', n_sets=len(_sets)):
+        if not _sets:
+            return pd.DataFrame()
 
-    first_set = _sets[0]
-    configs = _get_metric_config(first_set)
+        first_set = _sets[0]
+        configs = _get_metric_config(first_set)
 
-    if not configs:
-        return pd.DataFrame([str(s) for s in _sets], columns=['Set Details'])
+        if not configs:
+            return pd.DataFrame([str(s) for s in _sets], columns=['Set Details'])
 
-    all_set_metrics = []
-    for i, ws in enumerate(_sets):
-        metrics_list = _build_metrics_list(ws, configs)
-        metrics_dict = {'Set': i + 1}
-        # metrics_dict = {label: value for label, value in metrics_list}
-        for label, value in metrics_list:
-            metrics_dict[label] = value
+        all_set_metrics = []
+        for i, ws in enumerate(_sets):
+            metrics_list = _build_metrics_list(ws, configs)
+            metrics_dict = {'Set': i + 1}
+            # metrics_dict = {label: value for label, value in metrics_list}
+            for label, value in metrics_list:
+                metrics_dict[label] = value
 
-        all_set_metrics.append(metrics_dict)
+            all_set_metrics.append(metrics_dict)
 
-    df = pd.DataFrame(all_set_metrics)
-    cols = ['Set'] + [col for col in df.columns if col != 'Set']
-    df = df[cols]
+        df = pd.DataFrame(all_set_metrics)
+        cols = ['Set'] + [col for col in df.columns if col != 'Set']
+        df = df[cols]
 
-    if first_set.rest_between is not None:
-        rest_times = [getattr(s, 'rest_between', None) for s in _sets]
-        df['Rest'] = rest_times
+        if first_set.rest_between is not None:
+            rest_times = [getattr(s, 'rest_between', None) for s in _sets]
+            df['Rest'] = rest_times
 
-    return df
+        return df
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any
+
+# Key under which the JSON file backend records which keys are persisted (legacy file layout)
+PERSISTED_KEYS_KEY = '_persisted_checkbox_keys_'
+DEFAULT_NAMESPACE = 'default'
+
+
+class StateStore(ABC):
+    """
+    Key-value store for persisted app state (checkboxes, comments, ...).
+
+    Writes are buffered and flushed in batches: a flush happens when `max_pending` keys are
+    pending or `flush_interval` seconds after the first pending write. With `flush_interval=0`
+    every write goes through immediately.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.0,
+        max_pending: int = 100,
+        *,
+        parent: StateStore | None = None,
+    ):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._timer: threading.Timer | None = None
+        self._parent = parent
+        # Only the store of a backend registers at exit, it flushes its namespaced stores
+        self._namespaced_stores: dict[tuple[str, str], Any] = {}
+        if parent is None:
+            atexit.register(self._flush_all)
+
+    @abstractmethod
+    def _load(self, prefix: str | None) -> dict[str, Any]: ...
+
+    @abstractmethod
+    def _write(self, items: dict[str, Any]) -> None: ...
+
+    @abstractmethod
+    def with_namespace(self, athlete: str, program: str) -> StateStore:
+        """Returns a store for the same backend, whose keys are isolated per athlete and program."""
+        ...
+
+    def load(self, prefix: str | None = None) -> dict[str, Any]:
+        """Returns all stored key-value pairs, or only the keys starting with `prefix`."""
+        with self._lock:
+            data = self._load(prefix)
+            data.update(
+                {k: v for k, v in self._pending.items() if prefix is None or k.startswith(prefix)}
+            )
+        return data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.load(key).get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, items: dict[str, Any]) -> None:
+        with self._lock:
+            self._pending.update(items)
+            if self.flush_interval <= 0 or len(self._pending) >= self.max_pending:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            self._write(pending)
+
+    def _flush_all(self) -> None:
+        self.flush()
+        if self._parent is None:
+            for store in list(self._namespaced_stores.values()):
+                store.flush()
+
+    def close(self) -> None:
+        self._flush_all()
+        if self._parent is None:
+            atexit.unregister(self._flush_all)
+
+
+class JSONFileStateStore(StateStore):
+    """
+    Stores the complete state in a single JSON file, which is rewritten on every flush.
+    The parsed file is cached and only re-read when its modification time changes.
+    Namespaces are stored in separate files next to the original one.
+    """
+
+    def __init__(
+        self,
+        file_path: Path | str = 'app_state.json',
+        *,
+        parent: JSONFileStateStore | None = None,
+        **kwargs,
+    ):
+        super().__init__(parent=parent, **kwargs)
+        self.file_path = Path(file_path)
+        self._data: dict[str, Any] = {}
+        self._mtime: float | None = None
+        self._kwargs = kwargs
+
+    def with_namespace(self, athlete: str, program: str) -> JSONFileStateStore:
+        if self._parent is not None:
+            return self._parent.with_namespace(athlete, program)
+        if (athlete, program) not in self._namespaced_stores:
+            file_path = self.file_path.with_name(
+                f'{self.file_path.stem}.{_to_file_name(athlete)}.{_to_file_name(program)}'
+                f'{self.file_path.suffix}'
+            )
+            self._namespaced_stores[(athlete, program)] = JSONFileStateStore(
+                file_path, parent=self, **self._kwargs
+            )
+        return self._namespaced_stores[(athlete, program)]
+
+    def _read_file(self) -> dict[str, Any]:
+        try:
+            mtime = os.path.getmtime(self.file_path)
+        except FileNotFoundError:
+            return self._data
+
+        if mtime != self._mtime:
+            with open(self.file_path, 'r') as f:
+                persisted_data = json.load(f)
+            persisted_keys = persisted_data.pop(PERSISTED_KEYS_KEY, None)
+            if persisted_keys is not None:
+                persisted_data = {k: v for k, v in persisted_data.items() if k in persisted_keys}
+            self._data = persisted_data
+            self._mtime = mtime
+        return self._data
+
+    def _load(self, prefix: str | None) -> dict[str, Any]:
+        data = self._read_file()
+        return {k: v for k, v in data.items() if prefix is None or k.startswith(prefix)}
+
+    def _write(self, items: dict[str, Any]) -> None:
+        data = self._read_file()
+        data.update(items)
+
+        data_to_save = {PERSISTED_KEYS_KEY: list(data.keys()), **data}
+        tmp_path = self.file_path.with_name(self.file_path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(data_to_save, f, indent=4)
+        os.replace(tmp_path, self.file_path)
+        self._mtime = os.path.getmtime(self.file_path)
+
+
+class SQLiteStateStore(StateStore):
+    """
+    Stores every key as its own row in a SQLite database in WAL mode.
+    Rows are namespaced by athlete and program, so many athletes and programs can share one
+    database. Flushes only write the changed keys and loads by prefix (e.g., a session id) are
+    range scans over the primary key index (athlete, program, key).
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str = 'app_state.db',
+        namespace: tuple[str, str] = (DEFAULT_NAMESPACE, DEFAULT_NAMESPACE),
+        *,
+        parent: SQLiteStateStore | None = None,
+        **kwargs,
+    ):
+        """
+        Args:
+            db_path: Path of the database file.
+            namespace: (athlete, program) the keys of this store belong to.
+            parent: Store whose connection (and lock) is shared, see `with_namespace`.
+        """
+        super().__init__(parent=parent, **kwargs)
+        self.db_path = Path(db_path)
+        self.athlete, self.program = namespace
+        self._kwargs = kwargs
+
+        if parent is None:
+            self._connection = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            _create_schema(self._connection)
+        else:
+            self._connection = parent._connection
+            self._lock = parent._lock
+            self._namespaced_stores = parent._namespaced_stores
+        self._owns_connection = parent is None
+
+    def with_namespace(self, athlete: str, program: str) -> SQLiteStateStore:
+        """
+        Namespaced stores share the connection (and its lock) of the store they come from.
+        They are cached, so repeated calls for the same namespace return the same store.
+        """
+        store = self._namespaced_stores.get((athlete, program))
+        if store is None:
+            store = SQLiteStateStore(self.db_path, (athlete, program), parent=self, **self._kwargs)
+            self._namespaced_stores[(athlete, program)] = store
+        return store
+
+    def _load(self, prefix: str | None) -> dict[str, Any]:
+        if prefix is None:
+            rows = self._connection.execute(
+                'SELECT key, value FROM app_state WHERE athlete = ? AND program = ?',
+                (self.athlete, self.program),
+            )
+        else:
+            # Range query instead of LIKE, so the primary key index is used
+            rows = self._connection.execute(
+                'SELECT key, value FROM app_state '
+                'WHERE athlete = ? AND program = ? AND key >= ? AND key < ?',
+                (self.athlete, self.program, prefix, prefix + '\uffff'),
+            )
+        return {key: json.loads(value) for key, value in rows}
+
+    def _write(self, items: dict[str, Any]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO app_state (athlete, program, key, value) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(athlete, program, key) DO UPDATE SET value = excluded.value',
+                [
+                    (self.athlete, self.program, key, json.dumps(value))
+                    for key, value in items.items()
+                ],
+            )
+
+    def get_namespaces(self) -> list[tuple[str, str]]:
+        """Returns all (athlete, program) pairs with stored state."""
+        rows = self._connection.execute('SELECT DISTINCT athlete, program FROM app_state')
+        return sorted(rows)
+
+    def close(self) -> None:
+        super().close()
+        if self._owns_connection:
+            self._connection.close()
+
+
+def _to_file_name(value: str) -> str:
+    """
+    File name safe version of a namespace value, e.g., an athlete from a query parameter. Values
+    with other characters are replaced and suffixed with a hash of the value to stay unique.
+    """
+    if re.fullmatch(r'[\w-]+', value, flags=re.ASCII):
+        return value
+    safe = re.sub(r'[^\w-]+', '_', value, flags=re.ASCII)[:64]
+    return f'{safe}-{hashlib.sha256(value.encode()).hexdigest()[:12]}'
+
+
+def _create_schema(connection: sqlite3.Connection) -> None:
+    with connection:
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS app_state ('
+            'athlete TEXT NOT NULL, program TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, '
+            'PRIMARY KEY (athlete, program, key)) WITHOUT ROWID'
+        )
+
+
+def migrate_json_state(json_path: Path | str, store: StateStore) -> int:
+    """
+    Copies all keys of a JSON state file (e.g., the legacy `app_state.json`) into `store`.
+    Use `store.with_namespace(athlete, program)` to migrate into a specific namespace.
+
+    Returns:
+        The number of migrated keys.
+    """
+    json_store = JSONFileStateStore(json_path)
+    data = json_store.load()
+    json_store.close()
+    store.set_many(data)
+    store.flush()
+    return len(data)
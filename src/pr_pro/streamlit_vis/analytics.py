@@ -0,0 +1,29 @@
+import pandas as pd
+import streamlit as st
+
+from pr_pro.analytics import ProgramAnalytics
+
+_GROUPINGS = {
+    'Exercise': 'exercise',
+    'Week': 'week',
+    'Phase': 'phase',
+    'Category': 'category',
+    'Session': 'session',
+}
+
+
+def render_training_volume(analytics: ProgramAnalytics, key: str = 'volume') -> None:
+    """Renders the program's volume, tonnage and intensity statistics (meant for the sidebar)."""
+    total = analytics.get_total()
+    st.markdown(
+        f'**Sets**: {total.n_sets}  \n**Reps**: {total.volume}  \n'
+        f'**Tonnage**: {round(total.tonnage)} kg'
+    )
+
+    grouping = st.selectbox('Group by', list(_GROUPINGS), index=0, key=f'{key}_grouping')
+    by = _GROUPINGS[grouping]  # type: ignore
+    st.dataframe(analytics.to_dataframe(by), use_container_width=True)
+
+    if st.checkbox('Show intensity distribution', value=False, key=f'{key}_intensity'):
+        distribution = analytics.get_intensity_distribution(by)
+        st.dataframe(pd.DataFrame.from_dict(distribution, orient='index'), use_container_width=True)
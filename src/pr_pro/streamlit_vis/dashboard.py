@@ -0,0 +1,92 @@
+import sys
+from pathlib import Path
+
+import streamlit as st
+
+from pr_pro.configs import ComputeConfig
+from pr_pro.program import Program
+from pr_pro.program_index import ProgramIndexEntry, build_program_index
+from pr_pro.streamlit_vis.streamlit_app import run_streamlit_app
+
+
+@st.cache_resource
+def _get_index_cache(directory: str) -> dict[Path, ProgramIndexEntry]:
+    # The returned dict is shared across reruns and sessions and updated in place
+    return {}
+
+
+def get_program_index(directory: Path) -> dict[Path, ProgramIndexEntry]:
+    """Rescans the directory, only parsing files that are new or changed since the last run."""
+    index_cache = _get_index_cache(str(directory))
+    index = build_program_index(directory, previous_index=index_cache)
+    index_cache.clear()
+    index_cache.update(index)
+    return index
+
+
+@st.cache_resource(max_entries=32)
+def load_program(
+    file_path: str, mtime: float, config_key: str, _compute_config: ComputeConfig
+) -> Program:
+    """
+    Loads and computes a program. The modification time and the compute config are part of the
+    cache key, so changed files are reloaded.
+    """
+    program = Program.from_json_file(Path(file_path))
+    program.compute_values(_compute_config)
+    return program
+
+
+def render_index_entry(entry: ProgramIndexEntry):
+    st.markdown(f'**{entry.name}**')
+    st.caption(f'{entry.path.name}, {len(entry.session_ids)} sessions')
+    if entry.program_phases:
+        st.markdown(
+            'Phases: ' + ', '.join(f'{p} ({len(s)})' for p, s in entry.program_phases.items())
+        )
+    if entry.best_exercise_values:
+        st.markdown(
+            'Max values: '
+            + ', '.join(f'{e} {round(v, 1)} kg' for e, v in entry.best_exercise_values.items())
+        )
+
+
+def run_dashboard(
+    program_dir: Path,
+    compute_config: ComputeConfig | None = None,
+    use_persistent_state: bool = False,
+    lazy_rendering: bool = True,
+):
+    """
+    Multi-program app for coaches. Indexes all program json files in `program_dir` and only
+    loads and computes the program that is selected. The file name is used as athlete name.
+    """
+    compute_config = compute_config or ComputeConfig()
+    index = get_program_index(Path(program_dir))
+    if not index:
+        st.error(f'No program files found in {program_dir}.')
+        st.stop()
+
+    entries = list(index.values())
+    with st.sidebar:
+        entry = st.selectbox('Program', entries, format_func=lambda e: f'{e.key}: {e.name}')
+        render_index_entry(entry)  # type: ignore
+        st.divider()
+
+    program = load_program(
+        str(entry.path),
+        entry.mtime,  # type: ignore
+        repr(compute_config),
+        compute_config,
+    )
+    run_streamlit_app(
+        program,
+        use_persistent_state=use_persistent_state,
+        lazy_rendering=lazy_rendering,
+        athlete=entry.key,  # type: ignore
+    )
+
+
+if __name__ == '__main__':
+    # streamlit run dashboard.py -- <program_dir>
+    run_dashboard(Path(sys.argv[1] if len(sys.argv) > 1 else '.'))
@@ -0,0 +1,59 @@
+import streamlit as st
+
+from pr_pro.session_index import SessionIndex
+
+# Above this number of options, selectboxes are used instead of pills
+_MAX_PILLS = 12
+
+
+def _select(label: str, options: list[str], key: str) -> str | None:
+    if not options:
+        return None
+    if len(options) <= _MAX_PILLS:
+        return st.pills(label, options, default=options[0], key=key)
+    return st.selectbox(label, options, index=0, key=key)
+
+
+def render_session_navigation(
+    index: SessionIndex,
+    key: str,
+    page_size: int = 14,
+    exclude: str | None = None,
+) -> str | None:
+    """
+    Renders a paginated session selector (phase, week, search by id) and returns the selected
+    session id. Only one page of sessions is rendered, so the cost is independent of the
+    program length.
+    """
+    phase = _select('Phases', list(index.phases.keys()), key=f'{key}_phase')
+    session_ids = index.filter(phase=phase)
+
+    weeks = list(
+        dict.fromkeys(index.week_of_session[s] for s in session_ids if s in index.week_of_session)
+    )
+    if len(session_ids) > page_size and len(weeks) > 1:
+        week = _select('Weeks', weeks, key=f'{key}_week')
+        session_ids = index.filter(phase=phase, week=week)
+
+    query = st.text_input('Search session', key=f'{key}_search', placeholder='e.g. W3D2')
+    if query:
+        # The search covers all sessions, independent of the selected phase and week
+        session_ids = tuple(index.search(query, limit=page_size))
+
+    if exclude is not None:
+        session_ids = tuple(s for s in session_ids if s != exclude)
+    if not session_ids:
+        return None
+
+    n_pages = SessionIndex.get_number_of_pages(session_ids, page_size)
+    page = 0
+    if n_pages > 1:
+        page = (
+            st.number_input(
+                f'Page (of {n_pages})', min_value=1, max_value=n_pages, value=1, key=f'{key}_page'
+            )
+            - 1
+        )
+    page_ids = list(SessionIndex.get_page(session_ids, page, page_size))  # type: ignore
+
+    return st.pills('Select Workout Session', page_ids, default=page_ids[0], key=f'{key}_session')
@@ -2,43 +2,88 @@ from pr_pro.streamlit_vis.workout_component import (
     render_exercise_group_component_ui,
     render_single_exercise_component_ui,
 )
-from pr_pro.workout_component import ExerciseGroup, SingleExercise
+from pr_pro.comparison import SessionComparison
+from pr_pro.workout_component import ExerciseGroup, SingleExercise, WorkoutComponent_t
 from pr_pro.workout_session import WorkoutSession
 import streamlit as st
 
 
-def render_session(session: WorkoutSession, use_persistent_state: bool):
+def render_component(
+    component: WorkoutComponent_t, session: WorkoutSession, use_persistent_state: bool
+):
+    if isinstance(component, SingleExercise):
+        render_single_exercise_component_ui(
+            component, session=session, use_persistent_state=use_persistent_state
+        )
+    elif isinstance(component, ExerciseGroup):
+        render_exercise_group_component_ui(
+            component, session=session, use_persistent_state=use_persistent_state
+        )
+    else:
+        st.warning(f'Unknown component type: {type(component)}')
+
+
+def render_session(
+    session: WorkoutSession,
+    use_persistent_state: bool,
+    lazy: bool = False,
+    key_prefix: str = 'session',
+):
+    """
+    Renders a workout session with one tab per component.
+
+    With `lazy=True`, a segmented selector replaces the tabs and only the selected component is
+    built on each rerun, so the rerun cost no longer grows with the number of components.
+    """
     st.subheader(f'Session: {session.id}')
     if session.notes:
         st.markdown(f'> _{session.notes}_')
 
+    summary = session.get_summary()
     with st.expander('Session stats'):
-        st.markdown(f'Exercises: {session.get_number_of_exercises()}')
-        st.markdown(f'Sets: {session.get_number_of_sets()}')
-
-    component_tab_titles = []
-    for comp in session.workout_components:
-        if isinstance(comp, SingleExercise):  #
-            component_tab_titles.append(f'{comp.exercise.name}')
-        elif isinstance(comp, ExerciseGroup):  #
-            group_name = ' + '.join([ex.name for ex in comp.exercises])
-            component_tab_titles.append(f'{group_name}')
-        else:
-            component_tab_titles.append('Unknown Component')
-
-    if component_tab_titles:
+        st.markdown(f'Exercises: {summary.n_exercises}')
+        st.markdown(f'Sets: {summary.n_sets}')
+        st.markdown(f'Volume: {summary.volume} reps')
+        if summary.tonnage:
+            st.markdown(f'Tonnage: {round(summary.tonnage, 1)} kg')
+
+    component_tab_titles = summary.tab_titles
+
+    if not component_tab_titles:
+        st.info('This session has no workout components.')
+        return
+
+    if lazy:
+        selected_idx = st.segmented_control(
+            'Component',
+            options=range(len(component_tab_titles)),
+            format_func=lambda i: component_tab_titles[i],
+            default=0,
+            key=f'{key_prefix}_{session.id}_selected_component',
+            label_visibility='collapsed',
+        )
+        # Deselecting the active segment returns None, fall back to the first component
+        component = session.workout_components[selected_idx or 0]
+        render_component(component, session=session, use_persistent_state=use_persistent_state)
+    else:
         tabs = st.tabs(component_tab_titles)
         for i, component in enumerate(session.workout_components):
             with tabs[i]:
-                if isinstance(component, SingleExercise):  #
-                    render_single_exercise_component_ui(
-                        component, session=session, use_persistent_state=use_persistent_state
-                    )
-                elif isinstance(component, ExerciseGroup):  #
-                    render_exercise_group_component_ui(
-                        component, session=session, use_persistent_state=use_persistent_state
-                    )
-                else:
-                    st.warning(f'Unknown component type: {type(component)}')
-    else:
-        st.info('This session has no workout components.')
+                render_component(
+                    component, session=session, use_persistent_state=use_persistent_state
+                )
+
+
+def render_session_comparison(comparison: SessionComparison):
+    df = comparison.to_dataframe(changed_only=True)
+    if df.empty and not comparison.only_in_a and not comparison.only_in_b:
+        st.info('No differences between the sessions.')
+        return
+
+    if not df.empty:
+        # Only show the deltas, with flat column names
+        deltas = df.xs('delta', axis=1, level=1)
+        st.dataframe(deltas.reset_index(), hide_index=True, use_container_width=True)
+
+    for session_id, exercise, n_sets in comparison.get_unmatched_sets():
+        st.caption(f'Only in {session_id}: {exercise} ({n_sets} sets)')
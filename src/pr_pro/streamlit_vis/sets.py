@@ -10,18 +10,50 @@ from pr_pro.sets import (
 import streamlit as st
 
 
-@st.cache_data
-def st_create_sets_dataframe(_sets: List[WorkingSet_t]) -> pd.DataFrame:
+def _set_key(working_set: WorkingSet_t) -> tuple[str, str]:
+    """Content of a set (type and values), hashed by Streamlit as cache key of its view-models."""
+    return type(working_set).__name__, working_set.model_dump_json()
+
+
+@st.cache_data(max_entries=1024)
+def _cached_sets_dataframe(
+    set_keys: tuple[tuple[str, str], ...], _sets: List[WorkingSet_t]
+) -> pd.DataFrame:
     return create_sets_dataframe(_sets)
 
 
+def st_create_sets_dataframe(sets: List[WorkingSet_t]) -> pd.DataFrame:
+    """
+    Cached variant of `create_sets_dataframe`.
+    The cache is keyed by the content of the sets, so recomputed values are picked up.
+    """
+    return _cached_sets_dataframe(tuple(_set_key(s) for s in sets), sets)
+
+
+def _metrics_dataframe(metrics: list[tuple[str, Any]]) -> pd.DataFrame:
+    valid_metrics = [m for m in metrics if m[1] is not None]
+    df = pd.DataFrame.from_records(valid_metrics, columns=['Metric', 'Value']).set_index('Metric')
+    return df.transpose()
+
+
+@st.cache_data(max_entries=4096)
+def _cached_set_metrics(
+    set_key: tuple[str, str], _working_set: WorkingSet_t
+) -> pd.DataFrame | None:
+    """Metrics table of a set's details, None for set types without metric configuration."""
+    configs = _get_metric_config(_working_set)
+    if not configs:
+        return None
+    return _metrics_dataframe(_build_metrics_list(_working_set, configs))
+
+
 def _render_rest_caption(ws: WorkingSet_t) -> None:
     """Renders the rest duration caption if available."""
     if hasattr(ws, 'rest_between') and ws.rest_between:
         st.caption(f'Rest: {ws.rest_between}')
 
 
-def render_set_metrics(metrics: list[tuple[str, Any]]) -> None:
+def _render_metrics_dataframe(df: pd.DataFrame) -> None:
     # Note: The dataframe display would probably look nice, when all sets are displayed in one
     st.markdown(
         """
@@ -33,15 +65,16 @@ def render_set_metrics(metrics: list[tuple[str, Any]]) -> None:
                 """,
         unsafe_allow_html=True,
     )
-    """Helper to render a list of metrics in dynamically sized columns."""
-    valid_metrics = [m for m in metrics if m[1] is not None]
-    if not valid_metrics:
+    if df.empty:
         st.caption('No specific details available.')
         return
 
-    df = pd.DataFrame.from_records(valid_metrics, columns=['Metric', 'Value']).set_index('Metric')
-    df_transposed = df.transpose()
-    st.dataframe(df_transposed, hide_index=True, use_container_width=True)
+    st.dataframe(df, hide_index=True, use_container_width=True)
+
+
+def render_set_metrics(metrics: list[tuple[str, Any]]) -> None:
+    """Helper to render a list of metrics in dynamically sized columns."""
+    _render_metrics_dataframe(_metrics_dataframe(metrics))
 
 
 def render_set_metrics_old(metrics: list[tuple[str, Any]]) -> None:
@@ -74,15 +107,15 @@ def display_set_details_ui(working_set: WorkingSet_t):
     Renders the details for any given working set by looking up its configuration.
     This function replaces all the previous, separate render_* functions.
     """
-    configs = _get_metric_config(working_set)
+    # The metrics table is cached by the content of the set, so only changed sets are rebuilt
+    df = _cached_set_metrics(_set_key(working_set), working_set)
 
     # If no configuration is found for the set type, render it as 'unknown'.
-    if not configs:
+    if df is None:
         render_unknown_set_details(working_set)
         return
 
-    metrics = _build_metrics_list(working_set, configs)
-    render_set_metrics(metrics)
+    _render_metrics_dataframe(df)
     _render_rest_caption(working_set)
 
 
@@ -93,7 +126,7 @@ def display_sets_table_ui(sets: List[WorkingSet_t]):
     Args:
         sets: A list of working sets, expected to be of the same type.
     """
-    df = create_sets_dataframe(sets)
+    df = st_create_sets_dataframe(sets)
 
     st.dataframe(
         df,
@@ -1,39 +1,80 @@
 import streamlit as st
 import json
-import os
+
+from pr_pro.program import Program
+from pr_pro.storage import JSONFileStateStore, StateStore
 
 DATA_FILE = 'app_state.json'
 _PERSISTED_SESSION_STATE_KEYS = '_persisted_checkbox_keys_'
+_SESSION_STATE_STORE_KEY = '_state_store_'
+
+_state_store: StateStore | None = None
+
+
+def set_state_store(store: StateStore) -> None:
+    """
+    Sets the backend used for persisting the app state, e.g. a `SQLiteStateStore`.
+    Has to be called before `run_streamlit_app`. Defaults to a `JSONFileStateStore` on `DATA_FILE`.
+    """
+    global _state_store
+    _state_store = store
+
+
+def _get_global_state_store() -> StateStore:
+    global _state_store
+    if _state_store is None:
+        _state_store = JSONFileStateStore(DATA_FILE)
+    return _state_store
+
+
+def get_state_store() -> StateStore:
+    """Returns the store bound to the current browser session, or the global one."""
+    if _SESSION_STATE_STORE_KEY in st.session_state:
+        return st.session_state[_SESSION_STATE_STORE_KEY][1]
+    return _get_global_state_store()
+
+
+def bind_state_namespace(athlete: str, program: Program) -> None:
+    """
+    Binds the current browser session to the state of one athlete and program, so multiple
+    athletes and programs can share one state store without key collisions.
+    """
+    namespace = (athlete, program.get_fingerprint())
+    bound = st.session_state.get(_SESSION_STATE_STORE_KEY)
+    if bound is not None and bound[0] == namespace:
+        return
+
+    # Forget the keys of a previously bound namespace
+    for key in st.session_state.get(_PERSISTED_SESSION_STATE_KEYS, set()):
+        st.session_state.pop(key, None)
+    st.session_state[_PERSISTED_SESSION_STATE_KEYS] = set()
+
+    st.session_state[_SESSION_STATE_STORE_KEY] = (
+        namespace,
+        _get_global_state_store().with_namespace(*namespace),
+    )
 
 
-def load_persisted_state_from_file():
+def load_persisted_state_from_file(prefix: str | None = None):
     """
     Loads checkbox states (and other registered persistent states)
-    from the JSON file into st.session_state.
+    from the state store into st.session_state.
+    If a prefix (e.g., the id of the displayed session) is given, only the matching keys are loaded.
     This should be called once when the app/page loads.
     """
     if _PERSISTED_SESSION_STATE_KEYS not in st.session_state:
         st.session_state[_PERSISTED_SESSION_STATE_KEYS] = set()
 
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, 'r') as f:
-                persisted_data = json.load(f)
-
-            # Load the set of keys that were persisted
-            persisted_keys_list = persisted_data.get(_PERSISTED_SESSION_STATE_KEYS, [])
-            st.session_state[_PERSISTED_SESSION_STATE_KEYS].update(persisted_keys_list)
-
-            for key in st.session_state[_PERSISTED_SESSION_STATE_KEYS]:
-                if key in persisted_data:
-                    st.session_state[key] = persisted_data[key]
+    try:
+        persisted_data = get_state_store().load(prefix)
+        st.session_state[_PERSISTED_SESSION_STATE_KEYS].update(persisted_data.keys())
+        for key, value in persisted_data.items():
+            st.session_state[key] = value
 
-        except json.JSONDecodeError:
-            st.warning(
-                f'Could not decode state file {DATA_FILE}. Starting with/using default states.'
-            )
-        except Exception as e:
-            st.error(f'Error loading state from {DATA_FILE}: {e}')
+    except json.JSONDecodeError:
+        st.warning(f'Could not decode state file {DATA_FILE}. Starting with/using default states.')
+    except Exception as e:
+        st.error(f'Error loading persisted state: {e}')
 
     for key in list(st.session_state[_PERSISTED_SESSION_STATE_KEYS]):
         if key not in st.session_state:
@@ -41,29 +82,35 @@ def load_persisted_state_from_file():
             st.session_state[key] = value
 
 
+def save_persisted_key(key: str):
+    """
+    Saves a single persisted key from st.session_state to the state store.
+    This is typically called via on_change callbacks of the widget owning the key.
+    """
+    try:
+        get_state_store().set(key, st.session_state[key])
+    except Exception as e:
+        st.error(f'Error saving state for {key}: {e}')
+
+
 def save_persisted_state_to_file():
     """
-    Saves the current state of registered checkboxes (and other persistent states)
-    from st.session_state to the JSON file.
-    This is typically called via on_change callbacks.
+    Saves the current state of all registered checkboxes (and other persistent states)
+    from st.session_state to the state store.
     """
-    data_to_save = {}
     if _PERSISTED_SESSION_STATE_KEYS not in st.session_state:
         st.session_state[_PERSISTED_SESSION_STATE_KEYS] = set()
 
-    data_to_save[_PERSISTED_SESSION_STATE_KEYS] = list(
-        st.session_state[_PERSISTED_SESSION_STATE_KEYS]
-    )
-
-    for key in st.session_state[_PERSISTED_SESSION_STATE_KEYS]:
-        if key in st.session_state:
-            data_to_save[key] = st.session_state[key]
+    data_to_save = {
+        key: st.session_state[key]
+        for key in st.session_state[_PERSISTED_SESSION_STATE_KEYS]
+        if key in st.session_state
+    }
 
     try:
-        with open(DATA_FILE, 'w') as f:
-            json.dump(data_to_save, f, indent=4)
+        get_state_store().set_many(data_to_save)
     except Exception as e:
-        st.error(f'Error saving state to {DATA_FILE}: {e}')
+        st.error(f'Error saving persisted state: {e}')
 
 
 def register_key_for_persistence(key: str, default_value: bool | str = False):
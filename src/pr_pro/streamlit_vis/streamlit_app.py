@@ -1,17 +1,32 @@
 import streamlit as st
 
+from pr_pro.comparison import compare_sessions
 from pr_pro.configs import ComputeConfig
 from pr_pro.example import get_example_program
 from pr_pro.program import Program
-from pr_pro.streamlit_vis.session import render_session
-from pr_pro.streamlit_vis.state import load_persisted_state_from_file
+from pr_pro.streamlit_vis.analytics import render_training_volume
+from pr_pro.streamlit_vis.navigation import render_session_navigation
+from pr_pro.streamlit_vis.session import render_session, render_session_comparison
+from pr_pro.streamlit_vis.state import bind_state_namespace, load_persisted_state_from_file
 
 st.set_page_config(layout='wide', page_title='PR-Pro Visualizer')
 
 
-def run_streamlit_app(program: Program, use_persistent_state: bool = False):
+def run_streamlit_app(
+    program: Program,
+    use_persistent_state: bool = False,
+    lazy_rendering: bool = False,
+    athlete: str | None = None,
+):
+    """
+    Renders the program. With `use_persistent_state`, checkboxes and comments are persisted.
+    If an athlete is given (or passed as `?athlete=` query parameter), the state is namespaced
+    per athlete and program.
+    """
     if use_persistent_state:
-        load_persisted_state_from_file()
+        athlete = athlete or st.query_params.get('athlete')
+        if athlete:
+            bind_state_namespace(athlete, program)
 
     st.title(program.name)
 
@@ -24,23 +39,25 @@ def run_streamlit_app(program: Program, use_persistent_state: bool = False):
             for exercise, value in program.best_exercise_values.items():
                 st.markdown(f'**{exercise.name}**: {round(value, 1)} kg')
 
+        if st.checkbox('Show training volume', value=False, key='show_volume'):
+            render_training_volume(program.get_analytics())
+
     # Sessions
-    if not program.program_phases:
-        session_ids = list(program.workout_session_dict.keys())
-    else:
-        phase = st.pills(
-            'Phases', program.program_phases.keys(), default=list(program.program_phases.keys())[0]
-        )
-        session_ids = program.program_phases[phase]  # type: ignore
-    if not session_ids:
+    session_index = program.get_session_index()
+    if not len(session_index):
         st.error('No workout sesssions.')
         st.stop()
 
-    selected_session_id = st.pills('Select Workout Session', session_ids, default=session_ids[0])
+    selected_session_id = render_session_navigation(session_index, key='navigation')
     selected_session = program.get_workout_session_by_id(selected_session_id)  # type: ignore
 
     if selected_session:
-        render_session(selected_session, use_persistent_state=use_persistent_state)
+        if use_persistent_state:
+            # Only the keys of the displayed session are loaded from the state store
+            load_persisted_state_from_file(prefix=f'{selected_session.id}_')
+        render_session(
+            selected_session, use_persistent_state=use_persistent_state, lazy=lazy_rendering
+        )
     else:
         st.error('Selected session not found.')
 
@@ -48,25 +65,27 @@ def run_streamlit_app(program: Program, use_persistent_state: bool = False):
 
     st.checkbox('Show session comparison', value=False, key='show_comparison')
     if st.session_state.get('show_comparison', False):
-        phase = st.pills(
-            'Phases',
-            program.program_phases.keys(),
-            default=list(program.program_phases.keys())[0],
-            key='comparison_phase',
-        )
-        session_ids_remaining = [
-            sid
-            for sid in program.program_phases[phase]  # type: ignore
-            if sid != selected_session_id
-        ]
-        selected_session_comparison_id = st.selectbox(
-            'Select Workout Session', options=session_ids_remaining, index=0
+        selected_session_comparison_id = render_session_navigation(
+            session_index, key='comparison', exclude=selected_session_id
         )
         selected_session_comparison = program.get_workout_session_by_id(
-            selected_session_comparison_id
+            selected_session_comparison_id  # type: ignore
         )
+        if selected_session and selected_session_comparison:
+            with st.expander('Differences'):
+                render_session_comparison(
+                    compare_sessions(selected_session, selected_session_comparison)
+                )
+
         if selected_session_comparison:
-            render_session(selected_session_comparison, use_persistent_state)
+            if use_persistent_state:
+                load_persisted_state_from_file(prefix=f'{selected_session_comparison.id}_')
+            render_session(
+                selected_session_comparison,
+                use_persistent_state,
+                lazy=lazy_rendering,
+                key_prefix='comparison',
+            )
 
 
 @st.cache_data
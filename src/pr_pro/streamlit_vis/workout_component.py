@@ -1,7 +1,7 @@
 import streamlit as st
 
 from pr_pro.streamlit_vis.sets import display_sets_table_ui
-from pr_pro.streamlit_vis.state import register_key_for_persistence, save_persisted_state_to_file
+from pr_pro.streamlit_vis.state import register_key_for_persistence, save_persisted_key
 from pr_pro.workout_component import ExerciseGroup, SingleExercise
 from pr_pro.workout_session import WorkoutSession
 
@@ -13,7 +13,8 @@ def _add_comment(component_key: str, use_persistent_state: bool):
     st.text_input(
         'Comment',
         key=component_key,
-        on_change=save_persisted_state_to_file if use_persistent_state else None,
+        on_change=save_persisted_key if use_persistent_state else None,
+        args=(component_key,),
     )
 
 
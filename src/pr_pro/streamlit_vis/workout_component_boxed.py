@@ -1,7 +1,7 @@
 import streamlit as st
 
 from pr_pro.streamlit_vis.sets import display_set_details_ui
-from pr_pro.streamlit_vis.state import register_key_for_persistence, save_persisted_state_to_file
+from pr_pro.streamlit_vis.state import register_key_for_persistence, save_persisted_key
 from pr_pro.workout_component import ExerciseGroup, SingleExercise
 from pr_pro.workout_session import WorkoutSession
 
@@ -13,7 +13,8 @@ def _add_comment(component_key: str, use_persistent_state: bool):
     st.text_input(
         'Comment',
         key=component_key,
-        on_change=save_persisted_state_to_file if use_persistent_state else None,
+        on_change=save_persisted_key if use_persistent_state else None,
+        args=(component_key,),
     )
 
 
@@ -45,8 +46,9 @@ def render_single_exercise_component_ui(
                     # st.markdown(f'**Set {set_idx + 1}**')
                     st.checkbox(
                         'done',
-                        key=f'{session.id}_{component.exercise.name}_{set_idx}',
-                        on_change=save_persisted_state_to_file if use_persistent_state else None,
+                        key=checkbox_key,
+                        on_change=save_persisted_key if use_persistent_state else None,
+                        args=(checkbox_key,),
                     )
                 with cols[1]:
                     display_set_details_ui(working_set)
@@ -96,8 +98,9 @@ def render_exercise_group_component_ui(
                 with cols[0]:
                     st.checkbox(
                         'done',
-                        key=f'{session.id}_{"_".join(e.name for e in component.exercises)}_{set_idx}',
-                        on_change=save_persisted_state_to_file if use_persistent_state else None,
+                        key=checkbox_key,
+                        on_change=save_persisted_key if use_persistent_state else None,
+                        args=(checkbox_key,),
                     )
                 for i, exercise_in_group in enumerate(component.exercises):
                     cols[i + 1].markdown(f'**{exercise_in_group.name}**')
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Iterable
+
+from pr_pro.sets import WorkingSet
+
+
+def get_set_volume_and_tonnage(working_set: WorkingSet) -> tuple[int, float]:
+    """Returns the reps of a set and reps x weight (0 if the set has no (computed) weight)."""
+    reps = getattr(working_set, 'reps', None)
+    if reps is None:
+        return 0, 0.0
+    weight = getattr(working_set, 'weight', None)
+    return reps, reps * weight if weight is not None else 0.0
+
+
+@dataclass(frozen=True)
+class ComponentSummary:
+    title: str
+    exercise_names: tuple[str, ...]
+    n_sets: int = 0
+    volume: int = 0
+    tonnage: float = 0.0
+
+    @property
+    def n_exercises(self) -> int:
+        return len(self.exercise_names)
+
+    def add_sets(self, working_sets: Iterable[WorkingSet]) -> ComponentSummary:
+        """Returns the summary updated with additional sets."""
+        n_sets, volume, tonnage = self.n_sets, self.volume, self.tonnage
+        for working_set in working_sets:
+            set_volume, set_tonnage = get_set_volume_and_tonnage(working_set)
+            n_sets += 1
+            volume += set_volume
+            tonnage += set_tonnage
+        return replace(self, n_sets=n_sets, volume=volume, tonnage=tonnage)
+
+
+@dataclass(frozen=True)
+class SessionSummary:
+    n_exercises: int
+    n_sets: int
+    volume: int
+    tonnage: float
+    exercise_names: tuple[str, ...]
+    tab_titles: tuple[str, ...]
+
+    @staticmethod
+    def from_component_summaries(summaries: Iterable[ComponentSummary]) -> SessionSummary:
+        summaries = list(summaries)
+        return SessionSummary(
+            n_exercises=sum(s.n_exercises for s in summaries),
+            n_sets=sum(s.n_sets for s in summaries),
+            volume=sum(s.volume for s in summaries),
+            tonnage=sum(s.tonnage for s in summaries),
+            exercise_names=tuple(name for s in summaries for name in s.exercise_names),
+            tab_titles=tuple(s.title for s in summaries),
+        )
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import datetime
+import random
+from dataclasses import dataclass, field
+
+from pr_pro.exercise import (
+    DurationExercise,
+    Exercise_t,
+    PowerExercise,
+    RepsAndWeightsExercise,
+    RepsExercise,
+    RepsRPEExercise,
+)
+from pr_pro.program import Program
+from pr_pro.sets import WorkingSet_t
+from pr_pro.workout_component import ExerciseGroup, SingleExercise, WorkoutComponent_t
+from pr_pro.workout_session import WorkoutSession
+
+# Relative frequency of the exercise types in the generated exercise pool.
+# PowerExercise is not included by default, since its sets are read back as RepsAndWeightsSet
+# from json and such programs cannot be used for serialization round trips.
+DEFAULT_EXERCISE_TYPE_WEIGHTS: dict[type[Exercise_t], float] = {
+    RepsAndWeightsExercise: 0.55,
+    RepsExercise: 0.15,
+    RepsRPEExercise: 0.15,
+    DurationExercise: 0.15,
+}
+
+
+@dataclass(frozen=True)
+class SyntheticProgramConfig:
+    """
+    Parameters of a synthetic program. Ranges are inclusive (min, max) tuples that are sampled
+    uniformly. With `n_sets`, sessions are added until the program has at least that many sets
+    and `n_sessions` is ignored.
+    """
+
+    n_sessions: int = 12
+    n_sets: int | None = None
+    sessions_per_week: int = 3
+    weeks_per_phase: int = 4
+    n_exercises: int = 40
+    exercise_type_weights: dict[type[Exercise_t], float] = field(
+        default_factory=lambda: dict(DEFAULT_EXERCISE_TYPE_WEIGHTS)
+    )
+    components_per_session: tuple[int, int] = (3, 6)
+    group_probability: float = 0.3
+    group_size: tuple[int, int] = (2, 3)
+    sets_per_component: tuple[int, int] = (2, 5)
+    reps: tuple[int, int] = (1, 12)
+    best_value_fraction: float = 0.8
+    best_value: tuple[float, float] = (40, 250)
+    rest_probability: float = 0.2
+    notes_probability: float = 0.1
+
+    def __post_init__(self):
+        if self.n_exercises < self.components_per_session[1] * self.group_size[1]:
+            raise ValueError(
+                'n_exercises must allow for the maximum number of components and group size.'
+            )
+
+
+class _ProgramGenerator:
+    def __init__(self, config: SyntheticProgramConfig, seed: int):
+        self.config = config
+        self.rng = random.Random(seed)
+        self.exercises = self._create_exercises()
+
+    def _randint(self, value_range: tuple[int, int]) -> int:
+        return self.rng.randint(*value_range)
+
+    def _create_exercises(self) -> list[Exercise_t]:
+        exercise_types = list(self.config.exercise_type_weights)
+        types = self.rng.choices(
+            exercise_types,
+            weights=list(self.config.exercise_type_weights.values()),
+            k=self.config.n_exercises,
+        )
+        return [
+            exercise_type(name=f'{exercise_type.__name__.removesuffix("Exercise")} {i + 1}')
+            for i, exercise_type in enumerate(types)
+        ]
+
+    def create_best_exercise_values(self) -> dict[Exercise_t, float]:
+        best_values = {}
+        for exercise in self.exercises:
+            if isinstance(exercise, (RepsAndWeightsExercise, PowerExercise)):
+                if self.rng.random() < self.config.best_value_fraction:
+                    # Rounded to 2.5 kg
+                    best_values[exercise] = (
+                        round(self.rng.uniform(*self.config.best_value) / 2.5) * 2.5
+                    )
+        return best_values
+
+    def create_set(self, exercise: Exercise_t) -> WorkingSet_t:
+        rng = self.rng
+        reps = self._randint(self.config.reps)
+        if isinstance(exercise, RepsAndWeightsExercise):
+            prescription = rng.choice(('weight', 'percentage', 'relative_percentage'))
+            if prescription == 'weight':
+                working_set = exercise.create_set(reps, weight=round(rng.uniform(20, 150), 1))
+            elif prescription == 'percentage':
+                working_set = exercise.create_set(reps, percentage=round(rng.uniform(0.5, 0.9), 3))
+            else:
+                working_set = exercise.create_set(
+                    reps, relative_percentage=round(rng.uniform(0.6, 0.95), 3)
+                )
+        elif isinstance(exercise, PowerExercise):
+            working_set = exercise.create_set(
+                min(reps, 5), percentage=round(rng.uniform(0.5, 0.85), 3)
+            )
+        elif isinstance(exercise, RepsRPEExercise):
+            working_set = exercise.create_set(reps, rpe=rng.randint(5, 10))
+        elif isinstance(exercise, RepsExercise):
+            working_set = exercise.create_set(reps)
+        else:
+            working_set = exercise.create_set(
+                datetime.timedelta(seconds=rng.randrange(15, 181, 15))
+            )
+
+        if rng.random() < self.config.rest_probability:
+            working_set.rest_between = datetime.timedelta(seconds=rng.randrange(30, 301, 30))
+        return working_set
+
+    def _create_notes(self, text: str) -> str | None:
+        return text if self.rng.random() < self.config.notes_probability else None
+
+    def create_component(self, exercises: list[Exercise_t]) -> WorkoutComponent_t:
+        n_sets = self._randint(self.config.sets_per_component)
+        notes = self._create_notes('Focus on technique.')
+        if len(exercises) == 1:
+            component = SingleExercise(exercise=exercises[0], notes=notes)
+            for _ in range(n_sets):
+                component.add_set(self.create_set(exercises[0]))
+            return component
+
+        group = ExerciseGroup(exercises=exercises, notes=notes)
+        for _ in range(n_sets):
+            group.add_group_sets({e: self.create_set(e) for e in exercises})
+        return group
+
+    def create_session(self, session_id: str) -> WorkoutSession:
+        config = self.config
+        n_components = self._randint(config.components_per_session)
+        group_sizes = [
+            self._randint(config.group_size) if self.rng.random() < config.group_probability else 1
+            for _ in range(n_components)
+        ]
+        # Exercises are unique within a session
+        exercises = self.rng.sample(self.exercises, sum(group_sizes))
+
+        session = WorkoutSession(id=session_id, notes=self._create_notes('Keep rest short.'))
+        start = 0
+        for size in group_sizes:
+            session.add_component(self.create_component(exercises[start : start + size]))
+            start += size
+        return session
+
+    def create_program(self, name: str) -> Program:
+        config = self.config
+        program = Program(name=name, best_exercise_values=self.create_best_exercise_values())
+
+        n_sets = 0
+        phase_session_ids: dict[str, list[str]] = {}
+        i = 0
+        while (n_sets < config.n_sets) if config.n_sets is not None else (i < config.n_sessions):
+            week, day = divmod(i, config.sessions_per_week)
+            session = self.create_session(f'W{week + 1}D{day + 1}')
+            program.add_workout_session(session)
+            n_sets += session.get_number_of_sets()
+
+            phase = f'Phase {week // config.weeks_per_phase + 1}'
+            phase_session_ids.setdefault(phase, []).append(session.id)
+            i += 1
+
+        for phase, session_ids in phase_session_ids.items():
+            program.add_program_phase(phase, session_ids)
+        return program
+
+
+def generate_program(
+    config: SyntheticProgramConfig | None = None, seed: int = 0, name: str = 'Synthetic program'
+) -> Program:
+    """
+    Generates a random but reproducible program (the same config and seed always result in the
+    same program), e.g., for scale, performance and memory tests.
+    The program is not computed yet.
+    """
+    return _ProgramGenerator(config or SyntheticProgramConfig(), seed).create_program(name)
@@ -2,20 +2,99 @@ from __future__ import annotations
 from abc import abstractmethod
 from copy import deepcopy
 import logging
-from typing import Any, Self, Sequence
+import weakref
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Self, Sequence
 
-from pydantic import BaseModel, ConfigDict, ValidationInfo, model_validator
+from pydantic import BaseModel, ConfigDict, PrivateAttr, ValidationInfo, model_validator
 
+from pr_pro.caching import ModelCache
 from pr_pro.configs import ComputeConfig
 from pr_pro.exercise import Exercise_t, RepsAndWeightsExercise
+from pr_pro.instrumentation import count
 from pr_pro.sets import WorkingSet_t
+from pr_pro.summary import ComponentSummary
+
+if TYPE_CHECKING:  # pragma: no cover
+    from pr_pro.progression import ComponentProgression, ProgressionRule
 
 logger = logging.getLogger(__name__)
 
+# Fields that hold the sets of a component
+_SET_FIELDS = ('sets', 'exercise_sets_dict')
+
 
 class WorkoutComponent(BaseModel):
     notes: str | None = None
     model_config = ConfigDict(validate_assignment=True)
+    _cache: ModelCache = PrivateAttr(default_factory=ModelCache)
+
+    def model_post_init(self, context: Any) -> None:
+        self._adopt_sets()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            if name in _SET_FIELDS:
+                self._adopt_sets()
+            self.invalidate_summary()
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:
+        copied = super().__deepcopy__(memo)
+        copied._adopt_sets()
+        return copied
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        super().__setstate__(state)
+        self._adopt_sets()
+
+    def _adopt_sets(self, working_sets: Iterable[WorkingSet_t] | None = None) -> None:
+        """Lets in-place edits of the sets (or the given new sets) invalidate this component."""
+        component_ref = weakref.ref(self)
+        for working_set in self._iter_sets() if working_sets is None else working_sets:
+            working_set.__pydantic_private__['_cache']['component'] = component_ref  # type: ignore
+
+    @abstractmethod
+    def _iter_sets(self) -> Iterator[WorkingSet_t]: ...
+
+    @property
+    def revision(self) -> int:
+        """Incremented on every change of the component, used to validate derived caches."""
+        # Private attributes are slow to access by name (pydantic's __getattr__)
+        return self.__pydantic_private__['_cache'].get('revision', 0)  # type: ignore
+
+    def invalidate_summary(self) -> None:
+        """
+        Drops the cached summary and increments the revision. Changes through the component's
+        methods, field assignments and in-place edits of its sets (e.g.,
+        `component.sets[0].reps = 3`) invalidate the summary automatically.
+        """
+        cache = self.__pydantic_private__['_cache']  # type: ignore
+        cache.pop('summary', None)
+        cache['revision'] = cache.get('revision', 0) + 1
+
+    def _update_summary(self, working_sets: list[WorkingSet_t]) -> None:
+        self._adopt_sets(working_sets)
+        summary = self._cache.get('summary')
+        self.invalidate_summary()
+        if summary is not None:
+            self._cache['summary'] = summary.add_sets(working_sets)
+
+    def get_summary(self) -> ComponentSummary:
+        """Returns the cached summary (title, number of sets, volume, tonnage, ...)."""
+        if 'summary' not in self._cache:
+            self._cache['summary'] = self._create_summary()
+        return self._cache['summary']
+
+    @abstractmethod
+    def _create_summary(self) -> ComponentSummary: ...
+
+    @abstractmethod
+    def iter_lines(self) -> Iterator[str]:
+        """Yields the lines (without line breaks) of the text representation."""
+        ...
+
+    def __str__(self) -> str:
+        return '\n'.join(self.iter_lines())
 
     @staticmethod
     @abstractmethod
@@ -31,11 +110,22 @@ class WorkoutComponent(BaseModel):
     def add_repeating_set(self, n_repeats: int, working_set: WorkingSet_t) -> Self:
         for _ in range(n_repeats):
             self.add_set(working_set.model_copy())
+        count('sets.copied', n_repeats)
         return self
 
     def add_rs(self, n_repeats: int, working_set: WorkingSet_t) -> Self:
         return self.add_repeating_set(n_repeats, working_set)
 
+    def with_progression(
+        self,
+        *rules: ProgressionRule,
+        exercise_rules: dict[Exercise_t, Sequence[ProgressionRule]] | None = None,
+    ) -> ComponentProgression:
+        """Uses this component as week 1 of a progression, see `pr_pro.progression`."""
+        from pr_pro.progression import ComponentProgression
+
+        return ComponentProgression(self, rules, exercise_rules or {})  # type: ignore
+
     @abstractmethod
     def compute_values(
         self, best_exercise_values: dict[Exercise_t, float], compute_config: ComputeConfig
@@ -55,6 +145,7 @@ class SingleExercise(WorkoutComponent):
     @staticmethod
     def from_prev_component(component: SingleExercise, **kwargs) -> SingleExercise:
         new_component = component.model_copy(deep=True)
+        count('components.copied')
         if 'sets' in kwargs:
             n_sets = len(component.sets)
             assert n_sets > 0
@@ -66,26 +157,35 @@ class SingleExercise(WorkoutComponent):
             for w_set in new_component.sets:
                 w_set.__setattr__(key, w_set.__getattribute__(key) + value)
 
+        new_component.invalidate_summary()
         return new_component
 
-    def __str__(self) -> str:
-        line_start = '\n  '
-        notes_str = f'{line_start}notes: {self.notes}' if self.notes else ''
-        return (
-            str(self.exercise.name)
-            + f' with {len(self.sets)} sets:'
-            + notes_str
-            + line_start
-            + line_start.join(s.__str__() for s in self.sets)
-        )
+    def iter_lines(self) -> Iterator[str]:
+        yield f'{self.exercise.name} with {len(self.sets)} sets:'
+        if self.notes:
+            yield f'  notes: {self.notes}'
+        if not self.sets:
+            yield '  '
+        for working_set in self.sets:
+            yield f'  {working_set}'
 
     def add_set(self, working_set: WorkingSet_t) -> Self:
         self.sets.append(working_set)
+        self._update_summary([working_set])
         return self
 
+    def _iter_sets(self) -> Iterator[WorkingSet_t]:
+        return iter(self.sets)
+
+    def _create_summary(self) -> ComponentSummary:
+        return ComponentSummary(
+            title=self.exercise.name, exercise_names=(self.exercise.name,)
+        ).add_sets(self.sets)
+
     def compute_values(
         self, best_exercise_values: dict[Exercise_t, float], compute_config: ComputeConfig
     ) -> None:
+        self.invalidate_summary()
         best_value = best_exercise_values.get(self.exercise)
 
         # If not found, try to find an associated exercise and get its value.
@@ -100,6 +200,8 @@ class SingleExercise(WorkoutComponent):
 
         for working_set in self.sets:
             working_set.compute_values(best_value, compute_config)
+        count('sets.computed', len(self.sets))
+        _apply_loading(self.exercise, self.sets, compute_config)
 
 
 class ExerciseGroup(WorkoutComponent):
@@ -114,10 +216,12 @@ class ExerciseGroup(WorkoutComponent):
             # Only create the empty lists, if the exercise key's don't exist yet (e.g., after model validation)
             if self.exercises[0] not in self.exercise_sets_dict:
                 self.exercise_sets_dict = {e: [] for e in self.exercises}
+        super().model_post_init(context)
 
     @staticmethod
     def from_prev_component(component: ExerciseGroup, **kwargs) -> ExerciseGroup:
         new_component = component.model_copy(deep=True)
+        count('components.copied')
 
         if 'sets' in kwargs:
             n_sets = len(component.exercise_sets_dict[component.exercises[0]])
@@ -138,6 +242,8 @@ class ExerciseGroup(WorkoutComponent):
                     for w_set in new_component.exercise_sets_dict[e]:
                         w_set.__setattr__(key, w_set.__getattribute__(key) + value[i])
 
+        new_component._adopt_sets()
+        new_component.invalidate_summary()
         return new_component
 
     @model_validator(mode='after')
@@ -154,6 +260,7 @@ class ExerciseGroup(WorkoutComponent):
             raise ValueError(f'Exercise {exercise.name} is already part of this group.')
         self.exercises.append(exercise)
         self.exercise_sets_dict[exercise] = []
+        self.invalidate_summary()
         return self
 
     def remove_exercise(self, exercise: Exercise_t) -> Self:
@@ -162,6 +269,7 @@ class ExerciseGroup(WorkoutComponent):
 
         self.exercises.remove(exercise)
         del self.exercise_sets_dict[exercise]
+        self.invalidate_summary()
         return self
 
     def add_set(self, working_set: WorkingSet_t, *, exercise: Exercise_t) -> Self:
@@ -169,6 +277,7 @@ class ExerciseGroup(WorkoutComponent):
             raise ValueError(f'Exercise {exercise.name} is not part of this group.')
 
         self.exercise_sets_dict[exercise].append(working_set)
+        self._update_summary([working_set])
         return self
 
     def add_repeating_set(
@@ -176,22 +285,29 @@ class ExerciseGroup(WorkoutComponent):
     ) -> Self:
         for _ in range(n_repeats):
             self.add_set(working_set.model_copy(), exercise=exercise)
+        count('sets.copied', n_repeats)
         return self
 
-    def __str__(self) -> str:
-        line_start = '\n  '
-        notes_str = f'{line_start}notes: {self.notes}' if self.notes else ''
+    def _iter_sets(self) -> Iterator[WorkingSet_t]:
+        return (s for sets in self.exercise_sets_dict.values() for s in sets)
+
+    def _create_summary(self) -> ComponentSummary:
+        return ComponentSummary(
+            title=' + '.join(e.name for e in self.exercises),
+            exercise_names=tuple(e.name for e in self.exercises),
+        ).add_sets(self._iter_sets())
+
+    def iter_lines(self) -> Iterator[str]:
         n_sets = len(self.exercise_sets_dict[self.exercises[0]])
-        return (
-            ' + '.join(e.name for e in self.exercises)
-            + f' with {n_sets} sets:'
-            + notes_str
-            + line_start
-            + line_start.join(
-                ' | '.join(self.exercise_sets_dict[e][i].__str__() for e in self.exercises)
-                for i in range(n_sets)
-            )
-        )
+        yield f'{self.get_summary().title} with {n_sets} sets:'
+        if self.notes:
+            yield f'  notes: {self.notes}'
+        if n_sets == 0:
+            yield '  '
+
+        exercise_sets = [self.exercise_sets_dict[e] for e in self.exercises]
+        for i in range(n_sets):
+            yield '  ' + ' | '.join(str(sets[i]) for sets in exercise_sets)
 
     def add_group_sets(self, exercise_sets: dict[Exercise_t, WorkingSet_t]) -> Self:
         if len(exercise_sets) != len(self.exercises):
@@ -204,6 +320,7 @@ class ExerciseGroup(WorkoutComponent):
                 raise ValueError(f'Exercise {exercise.name} is not part of this group.')
 
             self.exercise_sets_dict[exercise].append(working_set)
+        self._update_summary(list(exercise_sets.values()))
         return self
 
     def add_gs(self, exercise_sets: dict[Exercise_t, WorkingSet_t]) -> Self:
@@ -214,6 +331,7 @@ class ExerciseGroup(WorkoutComponent):
     ) -> Self:
         for _ in range(n_repeats):
             self.add_group_sets(deepcopy(exercise_sets))
+        count('sets.copied', n_repeats * len(exercise_sets))
         return self
 
     def add_rgs(self, n_repeats: int, exercise_sets: dict[Exercise_t, WorkingSet_t]) -> Self:
@@ -222,6 +340,7 @@ class ExerciseGroup(WorkoutComponent):
     def compute_values(
         self, best_exercise_values: dict[Exercise_t, float], compute_config: ComputeConfig
     ) -> None:
+        self.invalidate_summary()
         for exercise, sets in self.exercise_sets_dict.items():
             best_value = best_exercise_values.get(exercise)
 
@@ -237,11 +356,25 @@ class ExerciseGroup(WorkoutComponent):
 
             for working_set in sets:
                 working_set.compute_values(best_value, compute_config)
+            count('sets.computed', len(sets))
+            _apply_loading(exercise, sets, compute_config)
 
 
 WorkoutComponent_t = SingleExercise | ExerciseGroup
 
 
+def _apply_loading(
+    exercise: Exercise_t, sets: list[WorkingSet_t], compute_config: ComputeConfig
+) -> None:
+    """Rounds the computed weights to loadable weights, if a loading config is given."""
+    if compute_config.loading_config is None:
+        return
+    loading = compute_config.loading_config.get_loading(exercise)
+    if loading is not None:
+        for working_set in sets:
+            working_set.apply_loading(loading)
+
+
 if __name__ == '__main__':  # pragma: no cover
     bench_press = RepsAndWeightsExercise(name='Benchpress')
     row = RepsAndWeightsExercise(name='Row')
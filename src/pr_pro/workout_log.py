@@ -0,0 +1,443 @@
+"""
+Log of performed sets (actual reps, weight, RPE and time), linked to the planned sets of a program.
+
+Entries are stored column-wise in an append-only directory, with one binary file per column and
+one file for the strings (session ids and exercise names) the string columns refer to:
+
+    log = WorkoutLog('logs/athlete')
+    log.import_csv('performed.csv', program=program)  # e.g., an edited `pr-pro export -f table`
+    log.get_adherence(program, by='phase')
+
+A planned set is identified by session id, component index, exercise name and set index (all
+indices zero-based). Logging a planned set again supersedes the previous entry.
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+import math
+import os
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Literal
+
+import numpy as np
+
+from pr_pro.workout_component import SingleExercise
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+    from pr_pro.program import Program
+    from pr_pro.workout_session import WorkoutSession
+
+STRINGS_FILE = 'strings.jsonl'
+# Column name to array type code, string columns store codes into the strings file
+COLUMNS = {
+    'session': 'i',
+    'component': 'i',
+    'exercise': 'i',
+    'set_index': 'i',
+    'reps': 'd',
+    'weight': 'd',
+    'rpe': 'd',
+    'timestamp': 'd',  # posix time
+}
+UNKNOWN_COMPONENT = -1
+
+
+@dataclass(frozen=True)
+class PerformedSet:
+    session_id: str
+    component_index: int
+    exercise: str
+    set_index: int
+    reps: int | None = None
+    weight: float | None = None
+    rpe: float | None = None
+    timestamp: datetime.datetime | None = None
+
+
+@dataclass(frozen=True)
+class Adherence:
+    planned_sets: int
+    performed_sets: int  # planned sets with a log entry
+    planned_volume: int
+    performed_volume: int
+    planned_tonnage: float
+    performed_tonnage: float
+
+    @property
+    def set_ratio(self) -> float | None:
+        return self.performed_sets / self.planned_sets if self.planned_sets else None
+
+    @property
+    def volume_ratio(self) -> float | None:
+        return self.performed_volume / self.planned_volume if self.planned_volume else None
+
+    @property
+    def tonnage_ratio(self) -> float | None:
+        return self.performed_tonnage / self.planned_tonnage if self.planned_tonnage else None
+
+
+def _to_float(value: float | None) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _from_float(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+def _parse_reps(value: str) -> int:
+    """Parses whole reps, also written as float (e.g., '5.0' from spreadsheets)."""
+    reps = float(value)
+    if not reps.is_integer():
+        raise ValueError(f'Reps must be a whole number, got {value!r}.')
+    return int(reps)
+
+
+def iter_planned_sets(session: WorkoutSession) -> Iterator[tuple[int, str, int, Any]]:
+    """Yields (component index, exercise name, set index, working set) of a session."""
+    for component_index, component in enumerate(session.workout_components):
+        if isinstance(component, SingleExercise):
+            exercise_sets = {component.exercise: component.sets}
+        else:
+            exercise_sets = component.exercise_sets_dict
+        for exercise, sets in exercise_sets.items():
+            for set_index, working_set in enumerate(sets):
+                yield component_index, exercise.name, set_index, working_set
+
+
+class WorkoutLog:
+    """
+    Append-only, columnar log of performed sets. Without a directory, the log only lives in
+    memory. Appended entries are buffered and written with `flush` (or when `max_pending` entries
+    are pending). On load, a partially written last entry (e.g., after a crash) is discarded.
+    """
+
+    def __init__(self, directory: Path | str | None = None, max_pending: int = 10_000):
+        self.directory = Path(directory) if directory is not None else None
+        self.max_pending = max_pending
+        self._columns = {name: array(code) for name, code in COLUMNS.items()}
+        self._strings: list[str] = []
+        self._string_codes: dict[str, int] = {}
+        self._n_flushed = 0
+        self._n_flushed_strings = 0
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._read()
+
+    def _read(self) -> None:
+        assert self.directory is not None
+        strings_path = self.directory / STRINGS_FILE
+        if strings_path.exists():
+            with open(strings_path, 'rb') as f:
+                data = f.read()
+            # Drop a partially written last line
+            complete = data[: data.rfind(b'\n') + 1]
+            if len(complete) != len(data):
+                os.truncate(strings_path, len(complete))
+            self._strings = [json.loads(line) for line in complete.decode().splitlines()]
+        self._string_codes = {s: i for i, s in enumerate(self._strings)}
+        self._n_flushed_strings = len(self._strings)
+
+        for name, column in self._columns.items():
+            path = self.directory / f'{name}.bin'
+            if path.exists():
+                with open(path, 'rb') as f:
+                    data = f.read()
+                column.frombytes(data[: len(data) - len(data) % column.itemsize])
+
+        # Entries are complete if written to all columns, the rest is truncated before appending
+        n_entries = min(len(column) for column in self._columns.values())
+        for name, column in self._columns.items():
+            if len(column) != n_entries:
+                del column[n_entries:]
+            path = self.directory / f'{name}.bin'
+            if path.exists() and path.stat().st_size != n_entries * column.itemsize:
+                os.truncate(path, n_entries * column.itemsize)
+        self._n_flushed = n_entries
+
+    def __len__(self) -> int:
+        return len(self._columns['session'])
+
+    def _get_string_code(self, value: str) -> int:
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+
+    def append(self, performed_set: PerformedSet) -> None:
+        columns = self._columns
+        columns['session'].append(self._get_string_code(performed_set.session_id))
+        columns['component'].append(performed_set.component_index)
+        columns['exercise'].append(self._get_string_code(performed_set.exercise))
+        columns['set_index'].append(performed_set.set_index)
+        columns['reps'].append(_to_float(performed_set.reps))
+        columns['weight'].append(_to_float(performed_set.weight))
+        columns['rpe'].append(_to_float(performed_set.rpe))
+        columns['timestamp'].append(
+            _to_float(
+                performed_set.timestamp.timestamp() if performed_set.timestamp is not None else None
+            )
+        )
+        if len(self) - self._n_flushed >= self.max_pending:
+            self.flush()
+
+    def extend(self, performed_sets: Iterable[PerformedSet]) -> None:
+        for performed_set in performed_sets:
+            self.append(performed_set)
+
+    def flush(self) -> None:
+        """Appends the pending entries to the column files."""
+        if self.directory is None or len(self) == self._n_flushed:
+            return
+
+        # Strings first, so the written entries never refer to missing strings
+        with open(self.directory / STRINGS_FILE, 'a') as f:
+            f.writelines(json.dumps(s) + '\n' for s in self._strings[self._n_flushed_strings :])
+            f.flush()
+            os.fsync(f.fileno())
+        self._n_flushed_strings = len(self._strings)
+
+        for name, column in self._columns.items():
+            with open(self.directory / f'{name}.bin', 'ab') as f:
+                column[self._n_flushed :].tofile(f)
+        self._n_flushed = len(self)
+
+    def __getitem__(self, i: int) -> PerformedSet:
+        columns = self._columns
+        timestamp = _from_float(columns['timestamp'][i])
+        reps = _from_float(columns['reps'][i])
+        return PerformedSet(
+            session_id=self._strings[columns['session'][i]],
+            component_index=columns['component'][i],
+            exercise=self._strings[columns['exercise'][i]],
+            set_index=columns['set_index'][i],
+            reps=int(reps) if reps is not None else None,
+            weight=_from_float(columns['weight'][i]),
+            rpe=_from_float(columns['rpe'][i]),
+            timestamp=(
+                datetime.datetime.fromtimestamp(timestamp) if timestamp is not None else None
+            ),
+        )
+
+    def get_entries(self, session_id: str | None = None) -> list[PerformedSet]:
+        """All entries (in logging order), or the entries of a session."""
+        if session_id is None:
+            return [self[i] for i in range(len(self))]
+        code = self._string_codes.get(session_id)
+        if code is None:
+            return []
+        rows = np.flatnonzero(self._get_column('session') == code)
+        return [self[int(i)] for i in rows]
+
+    @property
+    def strings(self) -> tuple[str, ...]:
+        """Session ids and exercise names, indexed by the codes of the string columns."""
+        return tuple(self._strings)
+
+    def get_column(self, name: str) -> np.ndarray:
+        """Copy of a column (see `COLUMNS`), string columns hold codes into `strings`."""
+        return self._get_column(name).copy()
+
+    def _get_column(self, name: str) -> np.ndarray:
+        """Zero-copy view of a column, which must not be kept (the column cannot grow meanwhile)."""
+        column = self._columns[name]
+        return np.frombuffer(column, dtype=np.int32 if column.typecode == 'i' else np.float64)
+
+    def import_csv(
+        self, source: Path | str | IO[str], program: Program | None = None, chunk_size: int = 10_000
+    ) -> int:
+        """
+        Streams performed sets from csv, with the columns `session`, `exercise` and `set`
+        (one-based, as in the `pr-pro export -f table` output) and optionally `component`,
+        `reps`, `weight`, `rpe` and `timestamp` (ISO format). If `component` is not a one-based
+        index, it is resolved by the exercise's component in the program's session.
+
+        Returns:
+            The number of imported sets.
+        """
+        if isinstance(source, (str, Path)):
+            with open(source, 'r', newline='') as f:
+                return self.import_csv(f, program, chunk_size)
+
+        component_indices: dict[tuple[str, str], int] = {}
+        n_imported = 0
+        chunk: list[PerformedSet] = []
+        for row in csv.DictReader(source):
+            session_id, exercise = row['session'], row['exercise']
+            component = row.get('component') or ''
+            if component.isdigit():
+                component_index = int(component) - 1
+            else:
+                key = (session_id, exercise)
+                if key not in component_indices:
+                    component_indices[key] = self._find_component(program, session_id, exercise)
+                component_index = component_indices[key]
+
+            chunk.append(
+                PerformedSet(
+                    session_id=session_id,
+                    component_index=component_index,
+                    exercise=exercise,
+                    set_index=int(row['set']) - 1,
+                    reps=_parse_reps(row['reps']) if row.get('reps') else None,
+                    weight=float(row['weight']) if row.get('weight') else None,
+                    rpe=float(row['rpe']) if row.get('rpe') else None,
+                    timestamp=(
+                        datetime.datetime.fromisoformat(row['timestamp'])
+                        if row.get('timestamp')
+                        else None
+                    ),
+                )
+            )
+            if len(chunk) >= chunk_size:
+                self.extend(chunk)
+                n_imported += len(chunk)
+                chunk.clear()
+
+        self.extend(chunk)
+        self.flush()
+        return n_imported + len(chunk)
+
+    @staticmethod
+    def _find_component(program: Program | None, session_id: str, exercise: str) -> int:
+        session = program.get_workout_session_by_id(session_id) if program is not None else None
+        if session is not None:
+            for component_index, exercise_name, _, _ in iter_planned_sets(session):
+                if exercise_name == exercise:
+                    return component_index
+        return UNKNOWN_COMPONENT
+
+    def _get_latest_entries(self) -> np.ndarray:
+        """Row of the latest entry per planned set (in logging order)."""
+        keys = np.stack(
+            [self._get_column(name) for name in ('session', 'component', 'exercise', 'set_index')],
+            axis=1,
+        )
+        # The first occurrence in the reversed order is the latest entry
+        _, reversed_rows = np.unique(keys[::-1], axis=0, return_index=True)
+        return np.sort(len(self) - 1 - reversed_rows)
+
+    def get_adherence(
+        self, program: Program, by: Literal['session', 'phase'] = 'session'
+    ) -> dict[str, Adherence]:
+        """Planned vs performed sets, volume and tonnage per session or program phase."""
+        session_ids = list(program.workout_session_dict)
+        rows = self._get_latest_entries() if len(self) else np.empty(0, dtype=np.intp)
+
+        # Session codes of the log mapped to the program's session positions (-1 if not in it)
+        position_by_id = {s: i for i, s in enumerate(session_ids)}
+        position_of_code = np.array(
+            [position_by_id.get(s, -1) for s in self._strings], dtype=np.intp
+        )
+        sessions = position_of_code[self._get_column('session')[rows]]
+        exercises = self._get_column('exercise')[rows]
+        components = self._get_column('component')[rows]
+        set_indices = self._get_column('set_index')[rows]
+
+        # Only entries of planned sets count as performed sets
+        planned_keys = {
+            (position_by_id[s.id], component_index, self._string_codes.get(exercise), set_index)
+            for s in program.workout_session_dict.values()
+            for component_index, exercise, set_index, _ in iter_planned_sets(s)
+        }
+        is_planned = np.fromiter(
+            (
+                key in planned_keys
+                for key in zip(
+                    sessions.tolist(), components.tolist(), exercises.tolist(), set_indices.tolist()
+                )
+            ),
+            dtype=bool,
+            count=len(rows),
+        )
+
+        n_sessions = len(session_ids)
+        in_program = sessions >= 0
+        reps = np.nan_to_num(self._get_column('reps')[rows])
+        weight = np.nan_to_num(self._get_column('weight')[rows])
+        performed_sets = np.bincount(sessions[is_planned], minlength=n_sessions)
+        performed_volume = np.bincount(
+            sessions[in_program], weights=reps[in_program], minlength=n_sessions
+        )
+        performed_tonnage = np.bincount(
+            sessions[in_program], weights=(reps * weight)[in_program], minlength=n_sessions
+        )
+
+        summaries = [s.get_summary() for s in program.workout_session_dict.values()]
+        groups = (
+            {s: [i] for i, s in enumerate(session_ids)}
+            if by == 'session'
+            else {
+                phase: [position_by_id[s] for s in phase_session_ids]
+                for phase, phase_session_ids in program.program_phases.items()
+            }
+        )
+        return {
+            name: Adherence(
+                planned_sets=sum(summaries[i].n_sets for i in positions),
+                performed_sets=int(performed_sets[positions].sum()),
+                planned_volume=sum(summaries[i].volume for i in positions),
+                performed_volume=int(performed_volume[positions].sum()),
+                planned_tonnage=sum(summaries[i].tonnage for i in positions),
+                performed_tonnage=float(performed_tonnage[positions].sum()),
+            )
+            for name, positions in groups.items()
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        import pandas as pd
+
+        data: dict[str, Any] = {name: self._get_column(name).copy() for name in COLUMNS}
+        strings = np.array(self._strings, dtype=object)
+        data['session'] = strings[data['session']] if len(self) else []
+        data['exercise'] = strings[data['exercise']] if len(self) else []
+        data['timestamp'] = pd.to_datetime(data['timestamp'], unit='s')
+        return pd.DataFrame(data)
+
+    def log_checked_sets(
+        self,
+        program: Program,
+        state: dict[str, Any],
+        timestamp: datetime.datetime | None = None,
+    ) -> int:
+        """
+        Logs the planned sets whose checkboxes in the streamlit app state are checked as
+        performed as planned, e.g., to migrate `app_state.json`. Checkboxes of exercise groups
+        mark the sets of all exercises of the group.
+
+        Returns:
+            The number of logged sets.
+        """
+        n_logged = 0
+        for session in program.workout_session_dict.values():
+            checkbox_prefixes = [
+                f'{session.id}_{component.exercise.name}'
+                if isinstance(component, SingleExercise)
+                else f'{session.id}_{"_".join(e.name for e in component.exercises)}'
+                for component in session.workout_components
+            ]
+            for component_index, exercise, set_index, working_set in iter_planned_sets(session):
+                if state.get(f'{checkbox_prefixes[component_index]}_{set_index}') is True:
+                    self.append(
+                        PerformedSet(
+                            session_id=session.id,
+                            component_index=component_index,
+                            exercise=exercise,
+                            set_index=set_index,
+                            reps=getattr(working_set, 'reps', None),
+                            weight=getattr(working_set, 'weight', None),
+                            rpe=getattr(working_set, 'rpe', None),
+                            timestamp=timestamp,
+                        )
+                    )
+                    n_logged += 1
+        self.flush()
+        return n_logged
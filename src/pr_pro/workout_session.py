@@ -1,27 +1,38 @@
+from pr_pro.caching import ModelCache, get_revisions_key, is_revisions_key_valid
 from pr_pro.configs import ComputeConfig
 from pr_pro.exercise import Exercise_t
+from pr_pro.summary import SessionSummary
 from pr_pro.workout_component import ExerciseGroup, SingleExercise, WorkoutComponent_t
 
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
-from typing import Self
+from typing import Iterator, Self, TextIO
 
 
 class WorkoutSession(BaseModel):
     id: str
     notes: str | None = None
     workout_components: list[WorkoutComponent_t] = []
+    _cache: ModelCache = PrivateAttr(default_factory=ModelCache)
 
     def __str__(self):
-        notes_str = f'notes: {self.notes}\n' if self.notes else ''
-        return (
-            f'--- {self.id} ---\n'
-            + notes_str
-            + '\n'.join([wc.__str__() for wc in self.workout_components])
-            + '\n'
-        )
+        return ''.join(f'{line}\n' for line in self.iter_lines())
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yields the lines (without line breaks) of the text representation."""
+        yield f'--- {self.id} ---'
+        if self.notes:
+            yield f'notes: {self.notes}'
+        if not self.workout_components:
+            yield ''
+        for component in self.workout_components:
+            yield from component.iter_lines()
+
+    def write_text(self, stream: TextIO) -> None:
+        """Writes the text representation to a stream without building the full string."""
+        stream.writelines(f'{line}\n' for line in self.iter_lines())
 
     def add_component(self, workout_component: WorkoutComponent_t) -> Self:
         self.workout_components.append(workout_component)
@@ -50,6 +61,20 @@ class WorkoutSession(BaseModel):
     def add_se(self, exercise: Exercise_t) -> Self:
         return self.add_single_exercise(exercise)
 
+    def get_summary(self) -> SessionSummary:
+        """
+        Returns the summary (number of exercises and sets, volume, tonnage, tab titles, ...).
+        It is aggregated from the cached component summaries and only rebuilt when a component
+        was added, removed or changed.
+        """
+        components = self.workout_components
+        if not is_revisions_key_valid(self._cache.get('summary_key'), components):
+            self._cache['summary'] = SessionSummary.from_component_summaries(
+                c.get_summary() for c in components
+            )
+            self._cache['summary_key'] = get_revisions_key(components)
+        return self._cache['summary']
+
     def get_number_of_exercises(self) -> int:
         n_exercises = 0
         for component in self.workout_components:
@@ -2,6 +2,7 @@ import pytest
 
 from pr_pro.example import get_example_program, get_simple_example_program
 from pr_pro.program import Program
+from pr_pro.synthetic import SyntheticProgramConfig, generate_program
 from pr_pro.workout_component import ExerciseGroup, SingleExercise
 from pr_pro.workout_session import WorkoutSession
 from pr_pro.exercises.common import deadlift, pullup, backsquat
@@ -17,6 +18,11 @@ def example_program():
     return get_example_program()
 
 
+@pytest.fixture
+def synthetic_program():
+    return generate_program(SyntheticProgramConfig(n_sessions=24), seed=42)
+
+
 @pytest.fixture
 def session_a():
     """Fixture for a real WorkoutSession 'A'."""
@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+# Modules of the core modeling api, e.g., used by command line jobs
+CORE_MODULES = (
+    'pr_pro.program',
+    'pr_pro.example',
+    'pr_pro.progression',
+    'pr_pro.storage',
+    'pr_pro.synthetic',
+)
+HEAVY_MODULES = ('pandas', 'matplotlib', 'fpdf', 'streamlit')
+
+# Loose budget of the cumulative import time of the core modules in seconds (including pydantic),
+# the benchmarks track the actual import time
+IMPORT_TIME_BUDGET = 1.0
+
+
+def _run_python(code: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args, '-c', code], capture_output=True, text=True, check=True
+    )
+
+
+def test_core_import_does_not_load_heavy_modules():
+    code = (
+        f'import sys, {", ".join(CORE_MODULES)}; '
+        f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    )
+    assert _run_python(code).stdout.strip() == ''
+
+
+def test_core_import_time_budget():
+    # Each line of -X importtime is 'import time: self [us] | cumulative [us] | module'
+    stderr = _run_python(f'import {", ".join(CORE_MODULES)}', '-X', 'importtime').stderr
+    total = 0
+    for line in stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and not parts[2].startswith('  ') and 'cumulative' not in line:
+            # Only top level imports, nested imports are part of their cumulative time
+            total += int(parts[1])
+    assert 0 < total / 1e6 < IMPORT_TIME_BUDGET
@@ -0,0 +1,122 @@
+import pytest
+
+from pr_pro.analytics import INTENSITY_ZONE_LABELS, ProgramAnalytics, get_program_analytics
+from pr_pro.configs import ComputeConfig
+from pr_pro.exercises.common import backsquat, deadlift, pullup
+from pr_pro.program import Program
+from pr_pro.workout_component import ExerciseGroup, SingleExercise
+from pr_pro.workout_session import WorkoutSession
+
+
+@pytest.fixture
+def computed_program() -> Program:
+    session_1 = WorkoutSession(id='W1D1')
+    session_1.add_component(
+        SingleExercise(exercise=backsquat)
+        .add_set(backsquat.create_set(5, percentage=0.7))
+        .add_set(backsquat.create_set(3, percentage=0.85))
+    )
+    session_1.add_component(
+        ExerciseGroup(exercises=[deadlift, pullup]).add_repeating_group_sets(
+            2, {deadlift: deadlift.create_set(4, weight=120), pullup: pullup.create_set(8)}
+        )
+    )
+    session_2 = WorkoutSession(id='W2D1').add_component(
+        SingleExercise(exercise=backsquat).add_set(backsquat.create_set(2, percentage=0.9))
+    )
+
+    program = (
+        Program(name='Test')
+        .add_best_exercise_value(backsquat, 100)
+        .add_workout_session(session_1)
+        .add_workout_session(session_2)
+        .add_program_phase('Phase 1', ['W1D1', 'W2D1'])
+        .add_program_phase('Phase 2', ['W2D1'])
+    )
+    program.compute_values(ComputeConfig())
+    return program
+
+
+def test_stats_by_exercise(computed_program: Program):
+    stats = ProgramAnalytics.from_program(computed_program).get_stats('exercise')
+
+    squat = stats['Backsquat']
+    assert squat.n_sets == 3
+    assert squat.volume == 10
+    assert squat.tonnage == pytest.approx(5 * 70 + 3 * 85 + 2 * 90)
+    assert squat.mean_intensity == pytest.approx((5 * 0.7 + 3 * 0.85 + 2 * 0.9) / 10)
+    assert squat.lifts_above_80 == 5
+    assert squat.max_weight == pytest.approx(90)
+
+    assert stats['Deadlift'].tonnage == pytest.approx(2 * 4 * 120)
+    assert stats['Deadlift'].mean_intensity is None
+    assert stats['Pullup'].volume == 16
+    assert stats['Pullup'].max_weight is None
+
+
+def test_stats_by_session_phase_and_week(computed_program: Program):
+    analytics = ProgramAnalytics.from_program(computed_program)
+
+    sessions = analytics.get_stats('session')
+    assert [s.n_sets for s in sessions.values()] == [6, 1]
+
+    # Sessions can be part of multiple phases
+    phases = analytics.get_stats('phase')
+    assert phases['Phase 1'].n_sets == 7
+    assert phases['Phase 2'].volume == 2
+
+    weeks = analytics.get_stats('week')
+    assert list(weeks) == ['Week 1', 'Week 2']
+    assert weeks['Week 1'].volume == 8 + 8 + 16
+
+    total = analytics.get_total()
+    assert total.n_sets == 7
+    assert total.tonnage == pytest.approx(sum(s.tonnage for s in sessions.values()))
+
+
+def test_stats_by_category(computed_program: Program):
+    analytics = ProgramAnalytics.from_program(
+        computed_program, categories={'Backsquat': 'Legs', 'Deadlift': 'Legs'}
+    )
+    stats = analytics.get_stats('category')
+    assert stats['Legs'].n_sets == 5
+    assert stats['RepsExercise'].volume == 16
+
+
+def test_intensity_distribution(computed_program: Program):
+    distribution = ProgramAnalytics.from_program(computed_program).get_intensity_distribution()
+    assert list(distribution['Backsquat']) == list(INTENSITY_ZONE_LABELS)
+    assert distribution['Backsquat'] == {
+        '<60%': 0,
+        '60-70%': 0,
+        '70-80%': 5,
+        '80-90%': 3,
+        '>=90%': 2,
+    }
+    assert sum(distribution['Pullup'].values()) == 0
+
+
+def test_stats_match_set_by_set_sums(synthetic_program: Program):
+    synthetic_program.compute_values(ComputeConfig())
+    stats = ProgramAnalytics.from_program(synthetic_program).get_stats('session')
+    for session_id, session in synthetic_program.workout_session_dict.items():
+        summary = session.get_summary()
+        assert stats[session_id].n_sets == summary.n_sets
+        assert stats[session_id].volume == summary.volume
+        assert stats[session_id].tonnage == pytest.approx(summary.tonnage)
+
+
+def test_get_program_analytics_is_cached(computed_program: Program):
+    analytics = get_program_analytics(computed_program)
+    assert computed_program.get_analytics() is analytics
+    assert get_program_analytics(computed_program, {'Backsquat': 'Legs'}) is not analytics
+
+    computed_program.workout_session_dict['W2D1'].workout_components[0].sets.pop()
+    assert get_program_analytics(computed_program).get_total().n_sets == 6
+
+
+def test_to_dataframe(computed_program: Program):
+    pytest.importorskip('pandas')
+    df = computed_program.get_analytics().to_dataframe('session')
+    assert list(df.index) == ['W1D1', 'W2D1']
+    assert df.loc['W2D1', 'volume'] == 2
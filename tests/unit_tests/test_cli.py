@@ -0,0 +1,83 @@
+import csv
+
+import pytest
+
+from pr_pro.cli import collect_program_files, create_compute_config, ComputeOptions, main
+from pr_pro.example import get_example_program
+from pr_pro.exercises.common import backsquat, split_squat
+from pr_pro.functions import Epley1RMCalculator
+from pr_pro.program import Program
+
+
+@pytest.fixture
+def program_dir(tmp_path, simple_example_program):
+    directory = tmp_path / 'programs'
+    directory.mkdir()
+    simple_example_program.write_json_file(directory / 'athlete_a.json')
+    get_example_program().write_json_file(directory / 'athlete_b.json')
+    (directory / 'notes.txt').write_text('not a program')
+    return directory
+
+
+def test_collect_program_files(program_dir):
+    files = collect_program_files([program_dir])
+    assert [f.name for f in files] == ['athlete_a.json', 'athlete_b.json']
+
+
+def test_create_compute_config(example_program):
+    options = ComputeOptions(
+        calculator='epley',
+        associations=(('Split Squat', 'Backsquat'), ('Unknown', 'Backsquat')),
+    )
+    config = create_compute_config(example_program, options)
+    assert isinstance(config.one_rm_calculator, Epley1RMCalculator)
+    assert config.exercise_associations == {split_squat: backsquat}
+
+
+def test_export(program_dir, tmp_path, capsys):
+    output_dir = tmp_path / 'out'
+    args = ['export', str(program_dir), '-o', str(output_dir), '-f', 'text', '-f', 'json']
+    assert main([*args, '-f', 'table', '--workers', '1', '--profile']) == 0
+
+    assert sorted(p.name for p in output_dir.iterdir()) == [
+        'athlete_a.csv',
+        'athlete_a.json',
+        'athlete_a.txt',
+        'athlete_b.csv',
+        'athlete_b.json',
+        'athlete_b.txt',
+    ]
+    computed = Program.from_json_file(output_dir / 'athlete_a.json')
+    assert (output_dir / 'athlete_a.txt').read_text() == str(computed)
+
+    with open(output_dir / 'athlete_a.csv') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 8
+    assert rows[0]['exercise'] == 'Backsquat'
+    assert float(rows[0]['weight']) == pytest.approx(55)
+
+    captured = capsys.readouterr()
+    assert 'program.compute_values' in captured.err
+
+
+def test_export_with_worker_pool(program_dir, tmp_path):
+    output_dir = tmp_path / 'out'
+    assert main(['export', str(program_dir), '-o', str(output_dir), '--workers', '2']) == 0
+    assert sorted(p.name for p in output_dir.iterdir()) == ['athlete_a.txt', 'athlete_b.txt']
+
+
+def test_export_reports_failures(program_dir, capsys):
+    # Exporting json next to the input file would overwrite it
+    assert (
+        main(['export', str(program_dir / 'athlete_a.json'), '-o', str(program_dir), '-f', 'json'])
+        == 1
+    )
+    assert 'would overwrite' in capsys.readouterr().err
+
+
+def test_show(program_dir, capsys):
+    assert main(['show', str(program_dir / 'athlete_a.json'), '--no-compute']) == 0
+    assert capsys.readouterr().out.startswith('--- Workout Test program ---\n')
+
+    with pytest.raises(SystemExit):
+        main(['show', str(program_dir / 'athlete_a.json'), '--calculator', 'unknown'])
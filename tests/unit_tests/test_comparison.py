@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from pr_pro.comparison import compare_phases, compare_session_pairs, compare_sessions
+from pr_pro.configs import ComputeConfig
+from pr_pro.workout_component import ExerciseGroup, SingleExercise
+from pr_pro.workout_session import WorkoutSession
+from pr_pro.exercises.common import backsquat, pullup
+
+
+def test_compare_sessions(session_a, session_b, exercise_component):
+    session_a.add_component(exercise_component)
+    session_b.add_component(
+        SingleExercise.from_prev_component(exercise_component, sets=+1, weight=+10)
+    ).add_component(SingleExercise(exercise=pullup).add_set(pullup.create_set(8)))
+
+    comparison = compare_sessions(session_a, session_b)
+    assert len(comparison.keys) == 4
+    np.testing.assert_allclose(comparison.get_field_deltas('weight'), 10)
+    np.testing.assert_allclose(comparison.get_field_deltas('tonnage'), 50)
+    np.testing.assert_allclose(comparison.get_field_deltas('reps'), 0)
+    assert comparison.get_unmatched_sets() == [
+        ('session_b', 'Backsquat', 1),
+        ('session_b', 'Pullup', 1),
+    ]
+    assert 'Backsquat set 1: weight 100 -> 110, tonnage 500 -> 550' in str(comparison)
+
+
+def test_session_in_several_pairs(session_a, session_b, exercise_component):
+    session_a.add_component(exercise_component)
+    session_b.add_component(SingleExercise.from_prev_component(exercise_component, weight=+10))
+    session_c = WorkoutSession(id='session_c').add_component(
+        SingleExercise.from_prev_component(exercise_component, weight=+20)
+    )
+
+    comparison = compare_session_pairs([(session_a, session_b), (session_a, session_c)])
+    assert comparison.pair_indices == [0] * 4 + [1] * 4
+    np.testing.assert_allclose(comparison.get_field_deltas('weight'), [10] * 4 + [20] * 4)
+    assert not comparison.only_in_b
+    assert '--- session_a vs session_c ---\nBacksquat set 1: weight 100 -> 120' in str(comparison)
+
+
+def test_compare_identical_sessions(session_a, exercise_group_component):
+    session_a.add_component(exercise_group_component)
+    comparison = compare_sessions(session_a, session_a.model_copy(deep=True))
+    assert not comparison.get_changed_mask().any()
+    assert str(comparison) == 'No differences.'
+    assert comparison.to_dataframe(changed_only=True).empty
+
+
+def test_compare_phases(example_program):
+    example_program.compute_values(ComputeConfig())
+    comparison = compare_phases(example_program, 'W1', 'W2')
+
+    assert {a for a, _ in comparison.session_pairs} == {'W1D1', 'W1D2', 'W1D3'}
+    df = comparison.to_dataframe()
+    assert df.loc[('W1D1', 'Backsquat', 1), ('percentage', 'delta')] == pytest.approx(0.1)
+    assert df.loc[('W1D2', 'Deadlift', 1), ('reps', 'delta')] == -2
+    # Durations are not compared, so the squat hold sets are matched but unchanged
+    assert ('W1D3', 'Squat hold', 1) in df.index
+    assert ('W1D3', 'Squat hold', 1) not in comparison.to_dataframe(changed_only=True).index
+
+
+def test_compare_phases_with_different_lengths(example_program):
+    example_program.add_workout_session(WorkoutSession(id='W2D4'))
+    example_program.program_phases['W2'].append('W2D4')
+    with pytest.raises(ValueError, match='different number of sessions'):
+        compare_phases(example_program, 'W1', 'W2')
+
+
+def test_group_alignment_ignores_exercise_order(exercise_group_component):
+    reordered = ExerciseGroup(exercises=list(reversed(exercise_group_component.exercises)))
+    for exercise in reordered.exercises:
+        for working_set in exercise_group_component.exercise_sets_dict[exercise]:
+            reordered.add_set(working_set.model_copy(), exercise=exercise)
+
+    comparison = compare_sessions(
+        WorkoutSession(id='a').add_component(exercise_group_component),
+        WorkoutSession(id='b').add_component(reordered),
+    )
+    assert len(comparison.keys) == 6
+    assert not comparison.only_in_a and not comparison.only_in_b
+    assert backsquat.name not in str(comparison)
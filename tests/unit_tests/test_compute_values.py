@@ -68,6 +68,26 @@ class TestRepsAndWeightsSetComputeValues:
         with pytest.raises(AssertionError):
             work_set.compute_values(100.0, mock_config)
 
+    def test_recompute_with_new_best_value(self, mock_config):
+        """Computed values are reset and recomputed, prescribed values are kept."""
+        work_set = RepsAndWeightsSet(reps=5, percentage=0.75)
+        work_set.compute_values(100.0, mock_config)
+        assert 'weight' in work_set.model_fields_set
+
+        work_set.reset_computed_values()
+        assert work_set.weight is None
+        work_set.compute_values(120.0, mock_config)
+        assert work_set.percentage == 0.75
+        assert work_set.weight == pytest.approx(90.0)
+
+        # An assigned value is prescribed, even if it was computed before
+        work_set.relative_percentage = None
+        work_set.weight = 100.0
+        work_set.percentage = 1.0
+        work_set.reset_computed_values()
+        assert work_set.weight == 100.0
+        assert work_set.relative_percentage is None
+
 
 class TestPowerExerciseSetComputeValues:
     """Unit tests for the PowerExerciseSet.compute_values method."""
@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+from pr_pro.configs import ComputeConfig
+from pr_pro.curves import TABLE_REPS, Curve1RMCalculator, Ensemble1RMCalculator, EnsembleMember
+from pr_pro.exercises.common import backsquat
+from pr_pro.functions import (
+    Brzycki1RMCalculator,
+    Epley1RMCalculator,
+    Mayhew1RMCalculator,
+    OneRMCalculator,
+)
+from pr_pro.rpe import get_rpe_chart
+from pr_pro.sets import RepsAndWeightsSet
+from pr_pro.workout_component import SingleExercise
+
+
+def test_ensemble():
+    brzycki, epley, mayhew = Brzycki1RMCalculator(), Epley1RMCalculator(), Mayhew1RMCalculator()
+    mean = Ensemble1RMCalculator.from_calculators([brzycki, epley])
+    assert isinstance(mean, OneRMCalculator)
+    assert mean.one_rep_max(100, 5) == pytest.approx(
+        (brzycki.one_rep_max(100, 5) + epley.one_rep_max(100, 5)) / 2
+    )
+    assert mean.one_rep_max(100, 5.5) == pytest.approx(
+        (brzycki.one_rep_max(100, 5.5) + epley.one_rep_max(100, 5.5)) / 2
+    )
+
+    blend = Ensemble1RMCalculator(
+        (
+            EnsembleMember(brzycki, weight=3, max_reps=8),
+            EnsembleMember(epley, max_reps=8),
+            EnsembleMember(mayhew, min_reps=8),
+        )
+    )
+    assert blend.one_rep_max(100, 3) == pytest.approx(
+        (3 * brzycki.one_rep_max(100, 3) + epley.one_rep_max(100, 3)) / 4
+    )
+    assert blend.one_rep_max(100, 12) == pytest.approx(mayhew.one_rep_max(100, 12))
+
+    # Hashable and equal by value, e.g., as key of the cached RPE charts
+    same = Ensemble1RMCalculator(blend.members)
+    assert same == blend and hash(same) == hash(blend)
+    assert get_rpe_chart(ComputeConfig(one_rm_calculator=same)) is get_rpe_chart(
+        ComputeConfig(one_rm_calculator=blend)
+    )
+
+    with pytest.raises(ValueError):
+        Ensemble1RMCalculator((EnsembleMember(brzycki, max_reps=5),))
+    with pytest.raises(ValueError, match='above 5'):
+        Ensemble1RMCalculator(
+            (EnsembleMember(brzycki, max_reps=5), EnsembleMember(epley, min_reps=5.5))
+        )
+    with pytest.raises(ValueError):
+        Ensemble1RMCalculator.from_calculators([brzycki, epley], weights=[1.0])
+
+
+def test_fitted_curve():
+    curve = Curve1RMCalculator.fit({1: 140, 3: 130, 5: 122.5, 6: [125, 124], 8: 110})
+    # The rep maxes at 5 and 6 reps violate the order and are pooled
+    assert curve.reps == pytest.approx((1, 3, 17 / 3, 8))
+    assert curve.max_weight_from_reps(140, 1) == pytest.approx(140)
+    assert curve.max_weight_from_reps(140, 2) == pytest.approx(135)
+    assert curve.max_weight_from_reps(140, 8) == pytest.approx(110)
+    # Beyond the knots, the Brzycki formula is scaled to the last knot
+    brzycki = Brzycki1RMCalculator()
+    assert curve.max_weight_from_reps(140, 10) == pytest.approx(
+        110 * brzycki.max_weight_from_reps(1, 10) / brzycki.max_weight_from_reps(1, 8)
+    )
+    assert Curve1RMCalculator.fit({3: 90, 5: 85}, one_rm_weight=100).ratios == (0.9, 0.85)
+
+    with pytest.raises(ValueError):
+        Curve1RMCalculator.fit({3: 90, 5: 85})
+    with pytest.raises(ValueError):
+        Curve1RMCalculator((1, 5), (1.0, 1.1))
+
+
+@pytest.mark.parametrize(
+    'calculator',
+    [
+        Ensemble1RMCalculator.from_calculators([Brzycki1RMCalculator(), Mayhew1RMCalculator()]),
+        Curve1RMCalculator.fit({1: 140, 3: 130, 5: 122.5, 8: 110}),
+    ],
+    ids=['ensemble', 'curve'],
+)
+def test_round_trips(calculator: OneRMCalculator):
+    rng = random.Random(0)
+    for _ in range(200):
+        one_rm, reps = (
+            rng.uniform(20, 400),
+            rng.choice([rng.uniform(1, 20), rng.choice(TABLE_REPS)]),
+        )
+        weight = calculator.max_weight_from_reps(one_rm, reps)
+        assert calculator.one_rep_max(weight, reps) == pytest.approx(one_rm, rel=1e-9)
+        assert calculator.max_reps_from_weight(one_rm, weight) == pytest.approx(reps, rel=1e-9)
+    # Only whole reps are cached, not the reps evaluated by the inversion
+    assert len(calculator._ratios) == len(TABLE_REPS)  # type: ignore
+
+
+def test_compute_with_curve():
+    curve = Curve1RMCalculator.fit({1: 140, 3: 130, 5: 122.5, 8: 110})
+    component = SingleExercise(exercise=backsquat).add_repeating_set(
+        2, RepsAndWeightsSet(reps=3, relative_percentage=1.0)
+    )
+    component.compute_values({backsquat: 140}, ComputeConfig(one_rm_calculator=curve))
+    assert [s.weight for s in component.sets] == pytest.approx([130, 130])
@@ -0,0 +1,130 @@
+import datetime
+
+import pytest
+
+from pr_pro.configs import ComputeConfig
+from pr_pro.estimation import (
+    EstimationConfig,
+    estimate_one_rep_maxes,
+    estimate_roster_one_rep_maxes,
+    update_best_values,
+)
+from pr_pro.example import get_simple_example_program
+from pr_pro.functions import Brzycki1RMCalculator, Epley1RMCalculator
+from pr_pro.program import Program
+from pr_pro.workout_log import PerformedSet, WorkoutLog
+
+NOW = datetime.datetime(2025, 6, 1)
+
+
+def _log_sets(log: WorkoutLog, exercise: str, sets: list[tuple], days_ago: int = 0) -> None:
+    timestamp = NOW - datetime.timedelta(days=days_ago)
+    for i, (reps, weight, *rpe) in enumerate(sets):
+        log.append(
+            PerformedSet(
+                'W1D1',
+                0,
+                exercise,
+                i,
+                reps=reps,
+                weight=weight,
+                rpe=rpe[0] if rpe else None,
+                timestamp=timestamp,
+            )
+        )
+
+
+def test_estimate_one_rep_maxes():
+    log = WorkoutLog()
+    _log_sets(log, 'Backsquat', [(5, 100), (5, 100), (3, 110)])
+    # RPE 8 adds two reps in reserve, i.e., the same e1RM as 5 reps
+    _log_sets(log, 'Pushup', [(3, 100, 8)])
+    # Without weight or above max reps: ignored
+    _log_sets(log, 'Deadlift', [(5, None), (20, 60)])
+
+    config = EstimationConfig(half_life=None, quantile=1.0)
+    estimates = estimate_one_rep_maxes(log, config, now=NOW)
+    assert set(estimates) == {'Backsquat', 'Pushup'}
+    assert estimates['Backsquat'].value == pytest.approx(Brzycki1RMCalculator.one_rep_max(110, 3))
+    assert estimates['Backsquat'].n_sets == 3
+    assert estimates['Pushup'].value == pytest.approx(Brzycki1RMCalculator.one_rep_max(100, 5))
+
+    ensemble = EstimationConfig(
+        calculators=(Brzycki1RMCalculator(), Epley1RMCalculator()), half_life=None, quantile=1.0
+    )
+    expected = (
+        Brzycki1RMCalculator.one_rep_max(100, 5) + Epley1RMCalculator.one_rep_max(100, 5)
+    ) / 2
+    assert estimate_one_rep_maxes(log, ensemble, now=NOW)['Pushup'].value == pytest.approx(expected)
+
+
+def test_outliers_and_time_decay():
+    log = WorkoutLog()
+    _log_sets(log, 'Backsquat', [(5, 100), (5, 101), (5, 99), (5, 100), (5, 180)])
+    estimate = estimate_one_rep_maxes(log, EstimationConfig(quantile=1.0), now=NOW)['Backsquat']
+    assert estimate.n_outliers == 1
+    assert estimate.value == pytest.approx(Brzycki1RMCalculator.one_rep_max(101, 5))
+
+    # Recent sets dominate the weighted quantile
+    log = WorkoutLog()
+    _log_sets(log, 'Backsquat', [(1, 120)] * 3, days_ago=365)
+    _log_sets(log, 'Backsquat', [(1, 110)] * 3)
+    config = EstimationConfig(half_life=30, quantile=0.5)
+    assert estimate_one_rep_maxes(log, config, now=NOW)['Backsquat'].value == pytest.approx(110)
+    without_decay = EstimationConfig(half_life=None, quantile=0.9)
+    assert estimate_one_rep_maxes(log, without_decay, now=NOW)['Backsquat'].value == pytest.approx(
+        120
+    )
+
+    with pytest.raises(ValueError):
+        EstimationConfig(quantile=0)
+
+
+def test_roster_matches_single_estimates():
+    logs = {'a': WorkoutLog(), 'b': WorkoutLog(), 'c': WorkoutLog()}
+    _log_sets(logs['a'], 'Backsquat', [(5, 100), (3, 110)], days_ago=10)
+    _log_sets(logs['b'], 'Pushup', [(10, 20)])
+    _log_sets(logs['b'], 'Backsquat', [(2, 140, 9)])
+
+    roster = estimate_roster_one_rep_maxes(logs, now=NOW)
+    assert roster['c'] == {}
+    for athlete, log in logs.items():
+        assert roster[athlete] == estimate_one_rep_maxes(log, now=NOW)
+
+
+def test_update_best_values():
+    program = get_simple_example_program()
+    config = ComputeConfig()
+    program.compute_values(config)
+
+    log = WorkoutLog()
+    _log_sets(log, 'Backsquat', [(5, 90), (3, 95)])
+    _log_sets(log, 'Unknown', [(5, 90)])
+    estimates = estimate_one_rep_maxes(log, now=NOW)
+    changed = update_best_values(program, estimates, config)
+    assert [e.name for e in changed] == ['Backsquat']
+
+    # Recomputing only the changed exercises equals computing from scratch
+    fresh = get_simple_example_program()
+    fresh.best_exercise_values.update(changed)
+    fresh.compute_values(config)
+    assert program == fresh
+
+    # Unchanged estimates do not change anything
+    assert update_best_values(program, estimates, config) == {}
+
+
+def test_update_best_values_of_loaded_program(tmp_path):
+    program = get_simple_example_program()
+    config = ComputeConfig()
+    program.compute_values(config)
+    program.write_json_file(tmp_path / 'program.json')
+
+    # The computed values of the loaded program are recomputed with the estimates
+    loaded = Program.from_json_file(tmp_path / 'program.json')
+    log = WorkoutLog()
+    _log_sets(log, 'Backsquat', [(5, 90), (3, 95)])
+    changed = update_best_values(loaded, estimate_one_rep_maxes(log, now=NOW), config)
+    program.best_exercise_values.update(changed)
+    program.recompute_values(config)
+    assert loaded == program
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+from pr_pro.functions import (
+    INVERSE_MAX_REPS,
+    Brzycki1RMCalculator,
+    Epley1RMCalculator,
+    Landers1RMCalculator,
+    Lombardi1RMCalculator,
+    Mayhew1RMCalculator,
+    OConner1RMCalculator,
+    OneRMCalculator,
+    Wathan1RMCalculator,
+    invert_one_rep_max,
+)
+
+CALCULATORS = [
+    Epley1RMCalculator(),
+    Brzycki1RMCalculator(),
+    Landers1RMCalculator(),
+    Lombardi1RMCalculator(),
+    OConner1RMCalculator(),
+    Wathan1RMCalculator(),
+    Mayhew1RMCalculator(),
+]
+
+
+def _samples(seed: int, n: int = 200) -> list[tuple[float, float]]:
+    """Random (1RM, reps) pairs in the range the formulas are used in."""
+    rng = random.Random(seed)
+    return [(rng.uniform(20, 400), rng.uniform(1, 20)) for _ in range(n)]
+
+
+@pytest.mark.parametrize('calculator', CALCULATORS, ids=lambda c: type(c).__name__)
+def test_round_trips(calculator: OneRMCalculator):
+    for one_rm, reps in _samples(0):
+        weight = calculator.max_weight_from_reps(one_rm, reps)
+        assert calculator.one_rep_max(weight, reps) == pytest.approx(one_rm, rel=1e-9)
+        assert calculator.max_reps_from_weight(one_rm, weight) == pytest.approx(reps, rel=1e-9)
+        assert calculator.max_reps_from_weight(
+            calculator.one_rep_max(weight, reps), weight
+        ) == pytest.approx(reps, rel=1e-9)
+
+
+@pytest.mark.parametrize('calculator', CALCULATORS, ids=lambda c: type(c).__name__)
+def test_generic_inverse_matches(calculator: OneRMCalculator):
+    for one_rm, reps in _samples(1):
+        weight = calculator.max_weight_from_reps(one_rm, reps)
+        assert invert_one_rep_max(calculator.one_rep_max, one_rm, weight) == pytest.approx(
+            calculator.max_reps_from_weight(one_rm, weight), rel=1e-9
+        )
+
+
+def test_inverse_monotone_and_clipped():
+    calculator = Mayhew1RMCalculator()
+    reps = [calculator.max_reps_from_weight(100, w) for w in range(95, 55, -5)]
+    assert reps == sorted(reps)
+    # Below the asymptote of the formula (52.2% of the 1RM), no finite reps exist
+    assert calculator.max_reps_from_weight(100, 40) == INVERSE_MAX_REPS
+
+    with pytest.raises(ValueError):
+        invert_one_rep_max(lambda weight, reps: weight / reps, 100, 80)
@@ -0,0 +1,69 @@
+import logging
+
+from pr_pro import instrumentation
+from pr_pro.configs import ComputeConfig
+from pr_pro.instrumentation import (
+    CallbackSink,
+    CollectorSink,
+    LoggingSink,
+    count,
+    instrument,
+    span,
+)
+from pr_pro.program import Program
+from pr_pro.workout_component import SingleExercise
+
+
+def test_disabled_by_default():
+    assert not instrumentation.is_enabled()
+    assert span('a') is span('b')
+    count('a')
+
+
+def test_collector_records_nested_spans_and_counters():
+    collector = CollectorSink()
+    with instrument(collector):
+        assert instrumentation.is_enabled()
+        with span('outer', size=3):
+            with span('inner'):
+                count('things', 2)
+            count('things')
+    assert not instrumentation.is_enabled()
+
+    assert [r.path for r in collector.spans] == [('outer', 'inner'), ('outer',)]
+    assert collector.spans[1].attributes == {'size': 3}
+    assert collector.counters == {'things': 3}
+    assert collector.get_span_totals()['inner'][0] == 1
+    assert 'outer: 1 calls' in collector.get_summary()
+
+
+def test_program_pipeline_is_instrumented(simple_example_program, tmp_path):
+    collector = CollectorSink()
+    with instrument(collector):
+        simple_example_program.compute_values(ComputeConfig())
+        str(simple_example_program)
+        file_path = tmp_path / 'program.json'
+        simple_example_program.write_json_file(file_path)
+        Program.from_json_file(file_path)
+
+    totals = collector.get_span_totals()
+    assert totals['session.compute_values'][0] == 1
+    for name in ['program.compute_values', 'program.render_text', 'validate', 'read']:
+        assert name in totals
+    assert collector.counters['sets.computed'] == 4
+    assert collector.counters['sets.validated'] == 8
+
+
+def test_copy_counter_and_callback_sink(exercise_component):
+    counts = []
+    with instrument(CallbackSink(on_count=lambda name, value: counts.append((name, value)))):
+        SingleExercise.from_prev_component(exercise_component, reps=+1)
+    assert counts == [('components.copied', 1)]
+
+
+def test_logging_sink(caplog):
+    with caplog.at_level(logging.DEBUG, logger='pr_pro.instrumentation'):
+        with instrument(LoggingSink()):
+            with span('export', pages=2):
+                pass
+    assert 'export pages=2: ' in caplog.text
@@ -0,0 +1,138 @@
+import datetime
+import random
+from dataclasses import astuple
+
+import numpy as np
+import pytest
+
+from pr_pro.configs import ComputeConfig
+from pr_pro.exercises.common import backsquat
+from pr_pro.load import LoadSeries, ProgramLoadTracker
+from pr_pro.program import Program
+from pr_pro.workout_component import SingleExercise
+from pr_pro.workout_session import WorkoutSession
+
+
+def _brute_force_metrics(loads: list[float], day: int, acute_window=7, chronic_window=28):
+    acute_loads = loads[max(0, day - acute_window + 1) : day + 1]
+    chronic_loads = loads[max(0, day - chronic_window + 1) : day + 1]
+    acute = sum(acute_loads)
+    chronic = sum(chronic_loads) * len(acute_loads) / len(chronic_loads)
+    std = float(np.std(acute_loads))
+    monotony = np.mean(acute_loads) / std if std > 0 else None
+    return acute, chronic, acute / chronic if chronic else None, monotony
+
+
+def _create_session(session_id: str, weight: float, n_sets: int = 3) -> WorkoutSession:
+    return WorkoutSession(id=session_id).add_component(
+        SingleExercise(exercise=backsquat).add_repeating_set(
+            n_sets, backsquat.create_set(5, weight=weight)
+        )
+    )
+
+
+def test_incremental_updates_match_brute_force():
+    rng = random.Random(0)
+    loads = [rng.choice([0.0, rng.uniform(500, 5000)]) for _ in range(120)]
+
+    series = LoadSeries()
+    for load in loads:
+        series.append(load)
+    # Edits of past days only update the windows containing them
+    for _ in range(30):
+        day = rng.randrange(len(loads))
+        loads[day] = rng.uniform(0, 5000)
+        series.set_load(day, loads[day])
+
+    batch = LoadSeries.from_daily_loads(loads)
+    for day in range(len(loads)):
+        acute, chronic, acwr, monotony = _brute_force_metrics(loads, day)
+        for s in (series, batch):
+            metrics = s.get_metrics(day)
+            assert metrics.acute == pytest.approx(acute)
+            assert metrics.chronic == pytest.approx(chronic)
+            assert metrics.acwr == pytest.approx(acwr)
+            assert metrics.monotony == pytest.approx(monotony)
+
+
+def test_get_series():
+    series = LoadSeries.from_daily_loads([100.0, 0.0, 200.0, 0.0, 100.0, 0.0, 0.0, 300.0])
+    data = series.get_series()
+    assert len(data['day']) == 8
+    metrics = series.get_metrics(7)
+    assert data['acwr'][7] == pytest.approx(metrics.acwr)
+    assert data['strain'][7] == pytest.approx(metrics.strain)
+
+    # Constant loads have no variation, hence monotony is undefined
+    constant = LoadSeries.from_daily_loads([100.0] * 10)
+    assert constant.get_metrics(9).monotony is None
+    assert np.isnan(constant.get_series()['monotony'][9])
+
+
+def test_program_load_tracker():
+    program = Program(name='Test')
+    for session_id in ['W1D1', 'W1D2', 'W2D1']:
+        program.add_workout_session(_create_session(session_id, weight=100))
+    program.compute_values(ComputeConfig())
+
+    tracker = ProgramLoadTracker(program)
+    assert tracker.session_days == {'W1D1': 0, 'W1D2': 1, 'W2D1': 7}
+    assert tracker.series.get_load(0) == pytest.approx(1500)
+    assert len(tracker.series) == 8
+
+    # Appended session
+    program.add_workout_session(_create_session('W2D2', weight=120))
+    tracker.update_session('W2D2')
+    assert tracker.session_days['W2D2'] == 8
+    assert tracker.series.get_load(8) == pytest.approx(1800)
+
+    # Edited session
+    program.workout_session_dict['W1D1'].workout_components[0].add_set(
+        backsquat.create_set(5, weight=100)
+    )
+    tracker.update_session('W1D1')
+    rebuilt = ProgramLoadTracker(program)
+    for day in range(len(rebuilt.series)):
+        assert astuple(tracker.series.get_metrics(day)) == pytest.approx(
+            astuple(rebuilt.series.get_metrics(day))
+        )
+
+
+def test_update_session_after_in_place_edit():
+    program = Program(name='Test').add_workout_session(_create_session('W1D1', weight=100))
+    program.compute_values(ComputeConfig())
+    tracker = ProgramLoadTracker(program, load='volume')
+    assert tracker.series.get_load(0) == 15
+
+    program.workout_session_dict['W1D1'].workout_components[0].sets[0].reps = 3
+    tracker.update_session('W1D1')
+    assert tracker.series.get_load(0) == 13
+
+
+def test_program_load_tracker_with_dates():
+    program = Program(name='Test')
+    start = datetime.date(2025, 1, 1)
+    dates = {}
+    for i, session_id in enumerate(['a', 'b', 'c']):
+        program.add_workout_session(_create_session(session_id, weight=100))
+        dates[session_id] = start + datetime.timedelta(days=3 * i)
+
+    tracker = ProgramLoadTracker(program, dates=dates, load='volume')
+    assert tracker.session_days == {'a': 0, 'b': 3, 'c': 6}
+    assert tracker.get_session_metrics('c').acute == pytest.approx(45)
+
+    # Moving a session to another day
+    tracker.update_session('c', date=start + datetime.timedelta(days=10))
+    assert tracker.series.get_load(6) == 0
+    assert tracker.series.get_load(10) == pytest.approx(15)
+
+    with pytest.raises(ValueError):
+        tracker.update_session('a', date=start - datetime.timedelta(days=1))
+
+
+def test_to_dataframe():
+    pytest.importorskip('pandas')
+    series = LoadSeries.from_daily_loads([100.0, 200.0, 0.0])
+    df = series.to_dataframe(start_date=datetime.date(2025, 1, 1))
+    assert list(df.columns) == ['load', 'acute', 'chronic', 'acwr', 'monotony', 'strain']
+    assert df.index[0] == datetime.datetime(2025, 1, 1)
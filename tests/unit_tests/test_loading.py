@@ -0,0 +1,99 @@
+import pytest
+
+from pr_pro.configs import ComputeConfig, LoadingConfig
+from pr_pro.exercises.common import backsquat, power_clean, split_squat
+from pr_pro.loading import (
+    MAX_CACHED_SOLUTIONS,
+    BarbellLoading,
+    IncrementLoading,
+    _get_plate_loadings,
+)
+from pr_pro.program import Program
+from pr_pro.workout_component import SingleExercise
+from pr_pro.workout_session import WorkoutSession
+
+
+def test_barbell_loading():
+    loading = BarbellLoading()
+    assert loading.round(57.3) == 57.5
+    assert loading.round(58.7) == 57.5
+    assert loading.round(58.75) == 57.5  # Ties round down
+    assert loading.round(10) == 20
+    assert BarbellLoading(rounding='up').round(57.6) == 60
+    assert BarbellLoading(rounding='down').round(59.9) == 57.5
+
+    solution = loading.solve(142.5)
+    assert solution.weight == 142.5
+    assert solution.plates == (25.0, 25.0, 10.0, 1.25)
+
+    # Limited inventory: a single pair of 20 kg and 2.5 kg plates
+    limited = BarbellLoading(bar_weight=15, plates=(2.5, 20), plate_pairs=(1, 1))
+    assert limited.round(100) == 60
+    assert limited.round(40) == 55
+    assert limited.round(35) == 20
+    assert limited.round(25) == 20
+
+    with pytest.raises(ValueError):
+        BarbellLoading(plates=(20, 10), plate_pairs=(1,))
+
+    # Configs don't share the default loading (and its cached solutions)
+    assert LoadingConfig().default_loading is not LoadingConfig().default_loading
+
+
+def test_increment_loading():
+    dumbbells = IncrementLoading(increment=2.5, minimum=5, maximum=50)
+    assert dumbbells.round(13.1) == 12.5
+    assert dumbbells.round(1) == 5
+    assert dumbbells.round(70) == 50
+    assert IncrementLoading(increment=2, rounding='up').round(21.2) == 22
+
+
+def test_solver_is_memoized():
+    _get_plate_loadings.cache_clear()
+    loading = BarbellLoading(bar_weight=15)
+    solution = loading.solve(83.3)
+    assert loading.solve(83.3) is solution
+    assert loading.solve(83.3000001) is solution  # Solved per gram
+    for i in range(10_000):
+        loading.round(i / 100)
+    assert len(loading._solutions) <= MAX_CACHED_SOLUTIONS
+    # Solved once per plate inventory
+    BarbellLoading(bar_weight=15).round(42)
+    assert _get_plate_loadings.cache_info().misses == 1
+
+
+def test_loading_in_compute_values():
+    program = (
+        Program(name='Loading')
+        .add_best_exercise_value(backsquat, 143)
+        .add_best_exercise_value(split_squat, 61)
+        .add_best_exercise_value(power_clean, 87)
+    )
+    session = WorkoutSession(id='W1D1')
+    session.add_component(
+        SingleExercise(exercise=backsquat)
+        .add_set(backsquat.create_set(5, percentage=0.77))
+        .add_set(backsquat.create_set(1, weight=101.3))
+    )
+    session.add_component(
+        SingleExercise(exercise=split_squat).add_set(split_squat.create_set(8, percentage=0.5))
+    )
+    session.add_component(
+        SingleExercise(exercise=power_clean).add_set(power_clean.create_set(2, percentage=0.7))
+    )
+    program.add_workout_session(session)
+
+    loading_config = LoadingConfig(exercise_loadings={split_squat: IncrementLoading(increment=2)})
+    program.compute_values(ComputeConfig(loading_config=loading_config))
+    squat, split, clean = (c.sets for c in session.workout_components)
+    assert squat[0].weight == pytest.approx(110.11)
+    assert squat[0].loaded_weight == 110
+    assert squat[1].loaded_weight == 102.5
+    assert split[0].loaded_weight == 30
+    assert clean[0].loaded_weight == 60
+    assert 'loaded_weight 110' in str(program)
+
+    # Recomputing without loading removes the loaded weights
+    program.recompute_values(ComputeConfig())
+    assert squat[0].loaded_weight is None
+    assert squat[1].weight == 101.3
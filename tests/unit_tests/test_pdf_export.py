@@ -20,3 +20,13 @@ def test_pdf_export():
         # Check that file was created and has content
         assert output_path.exists()
         assert output_path.stat().st_size > 0
+
+
+def test_pdf_export_with_summary():
+    program = get_simple_example_program()
+    program.compute_values(ComputeConfig())
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = Path(temp_dir) / 'test_program.pdf'
+        program.export_to_pdf(output_path, include_summary=True)
+        assert output_path.stat().st_size > 0
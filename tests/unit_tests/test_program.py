@@ -1,5 +1,10 @@
+import io
 import pytest
+from pr_pro.configs import ComputeConfig
 from pr_pro.exercises.common import bench_press
+from pr_pro.program import Program
+from pr_pro.workout_component import SingleExercise
+from pr_pro.workout_session import WorkoutSession
 
 
 def test_add_workout_session_success(basic_program, session_a):
@@ -42,3 +47,78 @@ def test_add_and_update_best_exercise_value(basic_program):
     assert basic_program.best_exercise_values[bench_press] == 100.0
     basic_program.add_best_exercise_value(bench_press, 105.5)
     assert basic_program.best_exercise_values[bench_press] == 105.5
+
+
+def test_fingerprint(simple_example_program):
+    """Tests that the fingerprint only changes with the program's identity."""
+    fingerprint = simple_example_program.get_fingerprint()
+    assert fingerprint == simple_example_program.model_copy(deep=True).get_fingerprint()
+
+    # Edits and recomputes keep the persisted state of the program
+    simple_example_program.add_best_exercise_value(bench_press, 85.0)
+    simple_example_program.compute_values(ComputeConfig())
+    assert simple_example_program.get_fingerprint() == fingerprint
+
+    simple_example_program.name = 'Other program'
+    assert simple_example_program.get_fingerprint() != fingerprint
+
+
+def test_write_text(example_program):
+    """Tests that streaming the text representation matches str()."""
+    stream = io.StringIO()
+    example_program.write_text(stream)
+    assert stream.getvalue() == str(example_program)
+    assert ''.join(f'{line}\n' for line in example_program.iter_lines()) == str(example_program)
+
+
+def test_versioned_best_exercise_values(tmp_path):
+    """Tests that each session is computed with the best value valid at that session."""
+    program = Program(name='Versioned').add_best_exercise_value(bench_press, 100.0)
+    for session_id in ['W1D1', 'W2D1', 'W3D1', 'W4D1']:
+        program.add_workout_session(
+            WorkoutSession(id=session_id).add_component(
+                SingleExercise(exercise=bench_press).add_set(
+                    bench_press.create_set(5, percentage=0.5)
+                )
+            )
+        )
+    program.add_program_phase('Base', ['W1D1', 'W2D1', 'W3D1'])
+    program.add_program_phase('Peak', ['W4D1'])
+    program.add_best_exercise_value(bench_press, 110.0, from_session='W2D1')
+    program.add_phase_best_exercise_value('Peak', bench_press, 120.0)
+    with pytest.raises(ValueError, match='does not exist'):
+        program.add_best_exercise_value(bench_press, 110.0, from_session='W9D1')
+
+    assert program.get_best_exercise_values('W1D1')[bench_press] == 100.0
+    assert program.get_best_exercise_values('W2D1')[bench_press] == 110.0
+    assert program.get_best_value_timeline().get_value(bench_press, 'W3D1') == 110.0
+
+    # Writes invalidate the cached timeline
+    program.add_best_exercise_value(bench_press, 112.0, from_session='W3D1')
+    assert program.get_best_exercise_values('W3D1')[bench_press] == 112.0
+    program.best_exercise_value_history = {bench_press: {'W2D1': 110.0, 'W4D1': 120.0}}
+    assert program.get_best_exercise_values('W3D1')[bench_press] == 110.0
+
+    # So do in-place edits of the best values and phases
+    program.best_exercise_values[bench_press] = 90.0
+    assert program.get_best_exercise_values('W1D1')[bench_press] == 90.0
+    program.best_exercise_value_history[bench_press]['W3D1'] = 115.0
+    assert program.get_best_exercise_values('W3D1')[bench_press] == 115.0
+    del program.best_exercise_value_history[bench_press]['W3D1']
+    program.best_exercise_values[bench_press] = 100.0
+    program.program_phases['Base'].reverse()
+    assert program.get_best_exercise_values('W1D1')[bench_press] == 110.0
+    program.program_phases['Base'].reverse()
+    assert program.get_best_exercise_values('W1D1')[bench_press] == 100.0
+
+    program.compute_values(ComputeConfig())
+    weights = {
+        session_id: session.workout_components[0].sets[0].weight
+        for session_id, session in program.workout_session_dict.items()
+    }
+    assert weights == {'W1D1': 50.0, 'W2D1': 55.0, 'W3D1': 55.0, 'W4D1': 60.0}
+    assert 'Bench Press: 110.0 (from W2D1)' in str(program)
+
+    file_path = tmp_path / 'program.json'
+    program.write_json_file(file_path)
+    assert Program.from_json_file(file_path) == program
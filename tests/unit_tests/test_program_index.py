@@ -0,0 +1,33 @@
+import os
+
+from pr_pro.program_index import build_program_index, read_program_index_entry
+
+
+def test_read_program_index_entry(example_program, tmp_path):
+    file_path = tmp_path / 'anna.json'
+    example_program.write_json_file(file_path)
+
+    entry = read_program_index_entry(file_path)
+    assert entry.key == 'anna'
+    assert entry.name == example_program.name
+    assert entry.session_ids == list(example_program.workout_session_dict.keys())
+    assert entry.program_phases == example_program.program_phases
+    assert entry.best_exercise_values['Deadlift'] == 90
+
+
+def test_build_program_index_reuses_unchanged_entries(
+    example_program, simple_example_program, tmp_path
+):
+    example_program.write_json_file(tmp_path / 'anna.json')
+    simple_example_program.write_json_file(tmp_path / 'ben.json')
+    (tmp_path / 'broken.json').write_text('{')
+
+    index = build_program_index(tmp_path)
+    assert [p.name for p in index] == ['anna.json', 'ben.json']
+
+    # Touch one file, only that one is read again
+    stat = os.stat(tmp_path / 'ben.json')
+    os.utime(tmp_path / 'ben.json', (stat.st_atime, stat.st_mtime + 10))
+    new_index = build_program_index(tmp_path, previous_index=index)
+    assert new_index[tmp_path / 'anna.json'] is index[tmp_path / 'anna.json']
+    assert new_index[tmp_path / 'ben.json'] is not index[tmp_path / 'ben.json']
@@ -0,0 +1,129 @@
+import io
+
+import pytest
+
+from pr_pro.configs import ComputeConfig
+from pr_pro.exercises.common import backsquat, deadlift, pullup
+from pr_pro.program import Program
+from pr_pro.progression import (
+    Deload,
+    Linear,
+    PercentageRamp,
+    ProgressionBlock,
+    SessionTemplate,
+    SetRepScheme,
+    Step,
+    Wave,
+)
+from pr_pro.workout_component import ExerciseGroup, SingleExercise
+
+
+@pytest.fixture
+def squat_component():
+    return SingleExercise(exercise=backsquat).add_repeating_set(
+        3, backsquat.create_set(5, weight=100)
+    )
+
+
+@pytest.fixture
+def group_component():
+    return ExerciseGroup(exercises=[deadlift, pullup]).add_repeating_group_sets(
+        3, {deadlift: deadlift.create_set(5, percentage=0.7), pullup: pullup.create_set(8)}
+    )
+
+
+def test_linear(squat_component):
+    progression = squat_component.with_progression(Linear('weight', 2.5, every=2))
+    assert [progression.for_week(w).sets[0].weight for w in range(1, 6)] == [
+        100,
+        100,
+        102.5,
+        102.5,
+        105,
+    ]
+    # The template is not modified
+    assert squat_component.sets[0].weight == 100
+
+
+def test_step_wave_and_ramp(squat_component):
+    assert squat_component.with_progression(Step('reps', [5, 3, 1])).for_week(4).sets[0].reps == 1
+    wave = squat_component.with_progression(Wave('weight', [0, 5, -5]))
+    assert [wave.for_week(w).sets[0].weight for w in range(1, 5)] == [100, 105, 95, 100]
+
+    ramp = PercentageRamp(0.6, 0.8, n_weeks=5, field='weight')
+    ramped = squat_component.with_progression(ramp)
+    assert ramped.for_week(3).sets[0].weight == pytest.approx(0.7)
+    assert ramped.for_week(8).sets[0].weight == pytest.approx(0.8)
+
+
+def test_set_rep_scheme_and_deload(squat_component):
+    progression = squat_component.with_progression(
+        SetRepScheme([(5, 5), (4, 6)]), Deload(every=3, factor=0.5, sets_factor=0.5)
+    )
+    week_2 = progression.for_week(2)
+    assert [s.reps for s in week_2.sets] == [6] * 4
+    week_3 = progression.for_week(3)
+    assert len(week_3.sets) == 2
+    assert week_3.sets[0].weight == 50
+    assert week_3.get_summary().n_sets == 2
+
+
+def test_group_exercise_rules(group_component):
+    progression = group_component.with_progression(
+        Linear('reps', 1), exercise_rules={deadlift: [Linear('percentage', 0.05)]}
+    )
+    week_3 = progression.for_week(3)
+    assert week_3.exercise_sets_dict[deadlift][0].percentage == pytest.approx(0.8)
+    assert week_3.exercise_sets_dict[deadlift][0].reps == 7
+    assert week_3.exercise_sets_dict[pullup][0].reps == 10
+
+    uneven = group_component.with_progression(exercise_rules={deadlift: [SetRepScheme([(2, 5)])]})
+    with pytest.raises(ValueError, match='different number of sets'):
+        uneven.for_week(1)
+
+
+def test_session_template_requires_week():
+    with pytest.raises(ValueError, match='must contain'):
+        SessionTemplate(id='D1', components=[])
+
+
+def test_block_generates_weeks_lazily(squat_component, group_component):
+    block = ProgressionBlock(
+        n_weeks=104,
+        sessions=[
+            SessionTemplate('W{week}D1', [squat_component.with_progression(Linear('weight', 1))]),
+            SessionTemplate('W{week}D2', [group_component.with_progression()]),
+        ],
+        rules=[Deload(every=4)],
+    )
+    assert len(block) == 104
+    assert not block._weeks
+
+    sessions = block.get_week(52)
+    assert [s.id for s in sessions] == ['W52D1', 'W52D2']
+    assert sessions[0].workout_components[0].sets[0].weight == pytest.approx(151 * 0.6)
+    assert block.get_week(52) is sessions
+    assert list(block._weeks) == [52]
+
+    # Iterating does not cache the generated weeks
+    ids = [s.id for s in block.iter_sessions(range(1, 3))]
+    assert ids == ['W1D1', 'W1D2', 'W2D1', 'W2D2']
+    assert list(block._weeks) == [52]
+
+    with pytest.raises(IndexError):
+        block.get_week(105)
+
+
+def test_block_add_to_program_and_write_text(squat_component):
+    block = ProgressionBlock(
+        n_weeks=3,
+        sessions=[SessionTemplate('W{week}D1', [squat_component.with_progression()])],
+    )
+    program = block.add_to_program(Program(name='Block').add_best_exercise_value(backsquat, 150))
+    assert list(program.workout_session_dict) == ['W1D1', 'W2D1', 'W3D1']
+    assert program.program_phases['Week 2'] == ['W2D1']
+    program.compute_values(ComputeConfig())
+
+    stream = io.StringIO()
+    block.write_text(stream)
+    assert stream.getvalue().startswith('--- W1D1 ---\nBacksquat with 3 sets:\n')
@@ -0,0 +1,140 @@
+import itertools
+
+import pytest
+
+from pr_pro.configs import ComputeConfig
+from pr_pro.exercise import RepsAndWeightsExercise, RepsExercise
+from pr_pro.exercises.common import backsquat, deadlift, pullup
+from pr_pro.program import Program
+from pr_pro.query import NUMERIC_FIELDS
+from pr_pro.workout_component import ExerciseGroup, SingleExercise
+from pr_pro.workout_session import WorkoutSession
+
+
+@pytest.fixture
+def program() -> Program:
+    session_1 = WorkoutSession(id='W1D1')
+    session_1.add_component(
+        SingleExercise(exercise=backsquat)
+        .add_set(backsquat.create_set(5, percentage=0.7))
+        .add_set(backsquat.create_set(3, percentage=0.85))
+    )
+    session_1.add_component(
+        ExerciseGroup(exercises=[deadlift, pullup]).add_repeating_group_sets(
+            2, {deadlift: deadlift.create_set(4, weight=120), pullup: pullup.create_set(8)}
+        )
+    )
+    session_2 = WorkoutSession(id='W2D1').add_component(
+        SingleExercise(exercise=backsquat).add_set(backsquat.create_set(2, percentage=0.9))
+    )
+    program = (
+        Program(name='Test')
+        .add_best_exercise_value(backsquat, 100)
+        .add_best_exercise_value(deadlift, 140)
+        .add_workout_session(session_1)
+        .add_workout_session(session_2)
+        .add_program_phase('Peak', ['W2D1'])
+    )
+    program.compute_values(ComputeConfig())
+    return program
+
+
+def test_query_sets(program: Program):
+    refs = program.query_sets(exercise=backsquat, percentage=(0.85, None))
+    assert [(r.session_id, r.component_index, r.set_index) for r in refs] == [
+        ('W1D1', 0, 1),
+        ('W2D1', 0, 0),
+    ]
+    assert refs[0].working_set is program.workout_session_dict['W1D1'].workout_components[0].sets[1]
+    assert len(program.query_sets(exercise='Backsquat', phase='Peak')) == 1
+
+    deadlift_refs = program.query_sets(exercise=[deadlift], week='Week 1', reps=(4, 4))
+    assert [(r.exercise, r.set_index) for r in deadlift_refs] == [(deadlift, 0), (deadlift, 1)]
+    assert len(program.query_sets(exercise_type=RepsExercise)) == 7
+    assert len(program.query_sets(exercise_type=RepsAndWeightsExercise, session='W1D1')) == 4
+    # Sets without the field never match a range
+    assert program.query_sets(exercise=pullup, weight=(None, None)) == []
+
+    assert program.query_sessions(relative_percentage=(0.9, None)) == ['W1D1', 'W2D1']
+    assert program.query_sessions(exercise=deadlift) == ['W1D1']
+
+    with pytest.raises(ValueError):
+        program.query_sets(load=(1, 2))
+    with pytest.raises(ValueError):
+        program.query_sets(phase='Unknown')
+
+
+def test_index_is_rebuilt_after_changes(program: Program):
+    index = program.get_set_index()
+    assert program.get_set_index() is index
+
+    program.workout_session_dict['W2D1'].workout_components[0].add_set(
+        backsquat.create_set(1, weight=95)
+    )
+    assert program.get_set_index() is not index
+    assert len(program.query_sets(session='W2D1', weight=(95, 95))) == 1
+
+    # In-place edits of sets and phases (with the same number of phases)
+    program.workout_session_dict['W2D1'].workout_components[0].sets[1].weight = 80
+    assert len(program.query_sets(weight=(80, 80))) == 1
+    program.program_phases['Peak'] = ['W1D1']
+    assert program.query_sessions(phase='Peak') == ['W1D1']
+
+
+def test_index_is_kept_after_edits_of_other_programs(program: Program):
+    other = program.model_copy(deep=True)
+    index = program.get_set_index()
+    other.compute_values(ComputeConfig())
+    other.workout_session_dict['W1D1'].workout_components[0].sets[0].reps = 6
+    assert program.get_set_index() is index
+
+
+def test_queries_match_brute_force(synthetic_program: Program):
+    program = synthetic_program
+    program.compute_values(ComputeConfig())
+    all_sets = [
+        (session.id, exercise, working_set)
+        for session in program.workout_session_dict.values()
+        for component in session.workout_components
+        for exercise, sets in (
+            {component.exercise: component.sets}
+            if isinstance(component, SingleExercise)
+            else component.exercise_sets_dict
+        ).items()
+        for working_set in sets
+    ]
+    exercises = list(dict.fromkeys(e for _, e, _ in all_sets))
+    phase, session_ids = next(iter(program.program_phases.items()))
+
+    filters = [
+        {'exercise': exercises[0]},
+        {'exercise_type': RepsAndWeightsExercise},
+        {'phase': phase},
+        {'weight': (50, 100)},
+        {'percentage': (0.75, None)},
+        {'reps': (None, 5)},
+    ]
+    for combination in itertools.chain(
+        itertools.combinations(filters, 1), itertools.combinations(filters, 2)
+    ):
+        query = {k: v for f in combination for k, v in f.items()}
+
+        def matches(session_id, exercise, working_set) -> bool:
+            if 'exercise' in query and exercise != query['exercise']:
+                return False
+            if 'exercise_type' in query and not isinstance(exercise, query['exercise_type']):
+                return False
+            if 'phase' in query and session_id not in session_ids:
+                return False
+            for field in NUMERIC_FIELDS:
+                if field in query:
+                    value = getattr(working_set, field, None)
+                    low, high = query[field]
+                    if value is None or (low is not None and value < low - 1e-9):
+                        return False
+                    if high is not None and value > high + 1e-9:
+                        return False
+            return True
+
+        expected = [id(s) for _, _, s in (t for t in all_sets if matches(*t))]
+        assert [id(r.working_set) for r in program.query_sets(**query)] == expected, query
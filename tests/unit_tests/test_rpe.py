@@ -0,0 +1,61 @@
+import pytest
+
+from pr_pro.configs import ComputeConfig, LoadingConfig
+from pr_pro.exercise import RepsRPEExercise
+from pr_pro.functions import Brzycki1RMCalculator, Epley1RMCalculator
+from pr_pro.rpe import RPEChart, get_rpe_chart
+from pr_pro.sets import RepsRPESet
+from pr_pro.workout_component import SingleExercise
+
+TABLE = {
+    1: {8: 0.92, 9: 0.96, 10: 1.0},
+    2: {8: 0.89, 9: 0.92, 10: 0.96},
+    3: {8: 0.86, 9: 0.89, 10: 0.92},
+}
+
+
+def test_chart_from_table():
+    chart = RPEChart.from_table(TABLE)
+    assert chart.get_percentage(2, 9) == 0.92
+    assert chart.get_percentage(2, 9.5) == pytest.approx(0.94)
+    assert chart.get_percentage(1.5, 8.5) == pytest.approx((0.92 + 0.96 + 0.89 + 0.92) / 4)
+    # Clipped to the grid
+    assert chart.get_percentage(6, 7) == 0.86
+
+    with pytest.raises(ValueError):
+        RPEChart.from_table({1: {8: 0.9, 9: 0.95}, 2: {8: 0.88}})
+
+
+def test_chart_from_calculator():
+    chart = get_rpe_chart(ComputeConfig(one_rm_calculator=Epley1RMCalculator()))
+    # 5 reps at RPE 8 are (about) a 7RM
+    assert chart.get_percentage(5, 8) == pytest.approx(
+        Epley1RMCalculator.max_weight_from_reps(1, 7)
+    )
+    assert RPEChart.from_calculator(Brzycki1RMCalculator()).get_percentage(1, 10) == pytest.approx(
+        1
+    )
+    assert get_rpe_chart(ComputeConfig(one_rm_calculator=Epley1RMCalculator())) is chart
+
+
+def test_rpe_sets_get_weights():
+    press = RepsRPEExercise(name='Press')
+    component = (
+        SingleExercise(exercise=press)
+        .add_set(press.create_set(5, rpe=8))
+        .add_set(RepsRPESet(reps=3, rpe=9, weight=45))
+    )
+    config = ComputeConfig(rpe_chart=RPEChart.from_table(TABLE), loading_config=LoadingConfig())
+    component.compute_values({press: 60.0}, config)
+
+    first, second = component.sets
+    assert first.percentage == 0.86
+    assert first.weight == pytest.approx(51.6)
+    assert first.loaded_weight == 52.5
+    assert second.percentage == pytest.approx(0.75)
+    assert 'rpe 8, weight 51.6, percentage 0.86' in str(first)
+
+    # Without best value, RPE sets are not computed
+    unknown = SingleExercise(exercise=press).add_set(press.create_set(5, rpe=8))
+    unknown.compute_values({}, config)
+    assert unknown.sets[0].weight is None
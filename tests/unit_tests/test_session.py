@@ -1,4 +1,5 @@
 from pr_pro.exercises.common import backsquat, deadlift, pullup
+from pr_pro.workout_component import SingleExercise
 
 
 def test_add_component(session_a, exercise_component):
@@ -50,3 +51,47 @@ def test_get_number_of_sets(session_a, exercise_component, exercise_group_compon
     assert session_a.get_number_of_sets() == 4
     session_a.add_component(exercise_group_component)
     assert session_a.get_number_of_sets() == 10  # 4 + 2*3
+
+
+def test_summary(session_a, exercise_component, exercise_group_component):
+    """Tests the session summary and that it is updated when components change."""
+    session_a.add_component(exercise_component).add_component(exercise_group_component)
+    summary = session_a.get_summary()
+    assert summary.tab_titles == ('Backsquat', 'Deadlift + Pullup')
+    assert summary.exercise_names == ('Backsquat', 'Deadlift', 'Pullup')
+    assert summary.volume == 4 * 5 + 3 * 5 + 3 * 8
+    assert summary.tonnage == 4 * 5 * 100 + 3 * 5 * 100
+    assert session_a.get_summary() is summary
+
+    exercise_component.add_set(backsquat.create_set(3, weight=120))
+    summary = session_a.get_summary()
+    assert summary.n_sets == 11
+    assert summary.tonnage == 4 * 5 * 100 + 3 * 5 * 100 + 3 * 120
+
+    # In-place edits of sets invalidate the summaries
+    exercise_component.sets[0].reps = 1
+    assert session_a.get_summary().volume == summary.volume - 4
+    exercise_group_component.exercise_sets_dict[deadlift][0].weight = 110
+    assert session_a.get_summary().tonnage == summary.tonnage - 4 * 100 + 5 * 10
+
+
+def test_counts_and_summary_after_in_place_edits(session_a, exercise_component):
+    """Tests that counts are live and replaced components rebuild the summary."""
+    session_a.add_component(exercise_component)
+    session_a.get_summary()
+    exercise_component.sets.append(backsquat.create_set(3, weight=120))
+    assert session_a.get_number_of_sets() == 5
+
+    # Same revision, but another component
+    replacement = SingleExercise(exercise=backsquat).add_set(backsquat.create_set(1, weight=150))
+    replacement._cache['revision'] = exercise_component.revision
+    session_a.workout_components[0] = replacement
+    assert session_a.get_summary().n_sets == 1
+
+
+def test_summary_does_not_affect_equality(session_a, exercise_component):
+    """Tests that cached summaries don't make otherwise equal sessions unequal."""
+    session_a.add_component(exercise_component)
+    session_copy = session_a.model_copy(deep=True)
+    session_a.get_summary()
+    assert session_a == session_copy
@@ -0,0 +1,40 @@
+from pr_pro.program import Program
+from pr_pro.session_index import SessionIndex
+from pr_pro.workout_session import WorkoutSession
+
+
+def test_session_index_order_and_phases(example_program):
+    index = example_program.get_session_index()
+    assert index.session_ids == ('W1D1', 'W1D2', 'W1D3', 'W2D1', 'W2D2', 'W2D3')
+    assert index.filter(phase='W2') == ('W2D1', 'W2D2', 'W2D3')
+    assert index.filter(week='Week 1') == ('W1D1', 'W1D2', 'W1D3')
+    assert index.filter(phase='W1', week='Week 2') == ()
+    assert index.phase_of_session['W2D2'] == 'W2'
+    assert example_program.get_session_index() is index
+
+
+def test_session_index_is_rebuilt_after_adding_sessions():
+    program = Program(name='Test').add_workout_session(WorkoutSession(id='A'))
+    assert program.get_session_index().session_ids == ('A',)
+    program.add_workout_session(WorkoutSession(id='B')).add_program_phase('P', ['B'])
+    # Sessions of phases come first
+    assert program.get_session_index().session_ids == ('B', 'A')
+
+    # In-place edits of phases and replaced sessions with the same counts
+    program.program_phases['P'] = ['A']
+    assert program.get_session_index().session_ids == ('A', 'B')
+    del program.workout_session_dict['B']
+    program.add_workout_session(WorkoutSession(id='C'))
+    assert program.get_session_index().session_ids == ('A', 'C')
+
+
+def test_search_and_pages():
+    session_ids = [f'W{w}D{d}' for w in range(1, 80) for d in range(1, 4)]
+    index = SessionIndex.build(session_ids, {})
+
+    assert index.search('w7', limit=4) == ['W7D1', 'W7D2', 'W7D3', 'W70D1']
+    assert index.search('D3', limit=2) == ['W1D3', 'W2D3']
+    assert index.search('', limit=2) == ['W1D1', 'W1D2']
+
+    assert SessionIndex.get_number_of_pages(index.session_ids, 20) == 12
+    assert SessionIndex.get_page(index.session_ids, 11, 20) == index.session_ids[220:]
@@ -0,0 +1,85 @@
+import datetime
+from typing import Any
+
+import pytest
+from pydantic import BaseModel, computed_field, field_serializer
+
+from pr_pro.sets import (
+    DurationSet,
+    PowerExerciseSet,
+    RepsAndWeightsSet,
+    RepsDistanceSet,
+    RepsRPESet,
+    RepsSet,
+    WorkingSet,
+    get_set_formatter,
+)
+
+
+class TempoSet(RepsSet):
+    tempo: str | None = None
+    extra: Any = None
+
+
+class Tempo(BaseModel):
+    eccentric: float
+    pause: int = 0
+
+
+class StructuredTempoSet(RepsSet):
+    tempo: Tempo | None = None
+    tempos: list[Tempo] = []
+
+    @computed_field
+    @property
+    def time_under_tension(self) -> float | None:
+        return None if self.tempo is None else self.reps * (self.tempo.eccentric + 1 / 3)
+
+
+class SerializedSet(RepsSet):
+    load: float = 1.23456
+
+    @field_serializer('load')
+    def serialize_load(self, load: float) -> str:
+        return f'{load:.1f} kg'
+
+
+def _reference_str(ws: WorkingSet) -> str:
+    # Formatting of WorkingSet.__str__ before the per-class formatters
+    formatted_items = []
+    for a, value in ws.model_dump().items():
+        if value is not None:
+            if isinstance(value, float):
+                formatted_items.append(f'{a} {round(value, 3)}')
+            else:
+                formatted_items.append(f'{a} {value}')
+    return ', '.join(formatted_items)
+
+
+@pytest.mark.parametrize(
+    'working_set',
+    [
+        RepsSet(reps=5),
+        RepsSet(reps=5, rest_between=datetime.timedelta(minutes=2)),
+        RepsRPESet(reps=3, rpe=8),
+        RepsAndWeightsSet(reps=5, percentage=0.7),
+        RepsAndWeightsSet(reps=5, weight=102.123456, percentage=0.8, relative_percentage=0.9),
+        PowerExerciseSet(reps=2, weight=60),
+        RepsDistanceSet(reps=4, distance=20.5),
+        DurationSet(duration=datetime.timedelta(seconds=45)),
+        TempoSet(reps=8, tempo='3010', extra=1.23456),
+        TempoSet(reps=8, extra=7),
+        TempoSet(reps=8, extra={'a': 1.23456}),
+        StructuredTempoSet(reps=5),
+        StructuredTempoSet(reps=5, tempo=Tempo(eccentric=3.3333), tempos=[Tempo(eccentric=2)]),
+        SerializedSet(reps=3),
+    ],
+)
+def test_set_str_matches_model_dump_formatting(working_set):
+    """Tests that the formatters produce the same output as formatting model_dump."""
+    assert str(working_set) == _reference_str(working_set)
+
+
+def test_formatter_is_built_once_per_class():
+    assert get_set_formatter(RepsSet) is get_set_formatter(RepsSet)
+    assert get_set_formatter(TempoSet) is not get_set_formatter(RepsSet)
@@ -0,0 +1,157 @@
+import atexit
+import json
+import sqlite3
+
+import pytest
+
+from pr_pro.storage import (
+    PERSISTED_KEYS_KEY,
+    JSONFileStateStore,
+    SQLiteStateStore,
+    migrate_json_state,
+)
+
+
+@pytest.fixture(params=['json', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'json':
+        store = JSONFileStateStore(tmp_path / 'app_state.json')
+    else:
+        store = SQLiteStateStore(tmp_path / 'app_state.db')
+    yield store
+    store.close()
+
+
+def test_set_and_load(store):
+    store.set('W1D1_Backsquat_0', True)
+    store.set('W1D1_Backsquat_comment', 'Felt heavy')
+    store.set('W1D2_Deadlift_0', False)
+
+    assert store.load() == {
+        'W1D1_Backsquat_0': True,
+        'W1D1_Backsquat_comment': 'Felt heavy',
+        'W1D2_Deadlift_0': False,
+    }
+    assert store.get('W1D1_Backsquat_comment') == 'Felt heavy'
+    assert store.get('missing', default='') == ''
+
+
+def test_load_by_prefix(store):
+    store.set_many({'W1D1_Backsquat_0': True, 'W1D10_Backsquat_0': True, 'W2D1_Row_0': False})
+
+    assert store.load('W1D1_') == {'W1D1_Backsquat_0': True}
+
+
+def test_batched_writes_are_visible_before_flush(tmp_path):
+    store = SQLiteStateStore(tmp_path / 'app_state.db', flush_interval=60, max_pending=3)
+    store.set('a', True)
+    store.set('b', True)
+
+    # Nothing written yet, but pending writes are visible to readers of the same store
+    assert store._load(None) == {}
+    assert store.load() == {'a': True, 'b': True}
+
+    # Reaching max_pending triggers a flush
+    store.set('c', False)
+    assert store._load(None) == {'a': True, 'b': True, 'c': False}
+    store.close()
+
+
+def test_close_flushes_pending_writes(tmp_path):
+    store = SQLiteStateStore(tmp_path / 'app_state.db', flush_interval=60)
+    store.set('a', 'comment')
+    store.close()
+
+    reopened = SQLiteStateStore(tmp_path / 'app_state.db')
+    assert reopened.load() == {'a': 'comment'}
+    reopened.close()
+
+
+def test_json_store_reads_legacy_file_layout(tmp_path):
+    file_path = tmp_path / 'app_state.json'
+    file_path.write_text(
+        json.dumps({PERSISTED_KEYS_KEY: ['W1D1_Backsquat_0'], 'W1D1_Backsquat_0': True, 'x': 1})
+    )
+
+    store = JSONFileStateStore(file_path)
+    assert store.load() == {'W1D1_Backsquat_0': True}
+
+    store.set('W1D1_Backsquat_1', True)
+    data = json.loads(file_path.read_text())
+    assert set(data[PERSISTED_KEYS_KEY]) == {'W1D1_Backsquat_0', 'W1D1_Backsquat_1'}
+    store.close()
+
+
+def test_namespaces_are_isolated(tmp_path):
+    store = SQLiteStateStore(tmp_path / 'app_state.db')
+    alice = store.with_namespace('alice', 'program_a')
+    bob = store.with_namespace('bob', 'program_a')
+
+    alice.set('W1D1_Backsquat_0', True)
+    bob.set('W1D1_Backsquat_0', False)
+
+    assert alice.load('W1D1_') == {'W1D1_Backsquat_0': True}
+    assert bob.load('W1D1_') == {'W1D1_Backsquat_0': False}
+    assert store.load() == {}
+    assert store.with_namespace('alice', 'program_a') is alice
+    assert store.get_namespaces() == [('alice', 'program_a'), ('bob', 'program_a')]
+    store.close()
+
+
+@pytest.mark.parametrize('backend', ['json', 'sqlite'])
+def test_namespaced_stores_are_flushed_by_their_backend(backend, tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, 'register', registered.append)
+    if backend == 'json':
+        store = JSONFileStateStore(tmp_path / 'app_state.json', flush_interval=60)
+    else:
+        store = SQLiteStateStore(tmp_path / 'app_state.db', flush_interval=60)
+    alice = store.with_namespace('alice', 'abc')
+    assert alice.with_namespace('bob', 'abc') is store.with_namespace('bob', 'abc')
+    alice.set('W1D1_Backsquat_0', True)
+
+    # Only the backend's store is registered at exit, which flushes the namespaced stores
+    assert registered == [store._flush_all]
+    store._flush_all()
+    assert alice._pending == {}
+    assert alice.load() == {'W1D1_Backsquat_0': True}
+    store.close()
+
+
+def test_json_namespace_file_names_are_safe(tmp_path):
+    store = JSONFileStateStore(tmp_path / 'app_state.json')
+    alice = store.with_namespace('alice', 'abc')
+    other = store.with_namespace('../alice', 'abc')
+    assert alice.file_path.name == 'app_state.alice.abc.json'
+    assert other.file_path.parent == tmp_path and other.file_path != alice.file_path
+
+    other.set('W1D1_Backsquat_0', True)
+    assert other.load() == {'W1D1_Backsquat_0': True}
+    assert alice.load() == {}
+    store.close()
+
+
+def test_sqlite_store_keeps_other_tables(tmp_path):
+    db_path = tmp_path / 'app_state.db'
+    connection = sqlite3.connect(db_path)
+    connection.execute('CREATE TABLE state (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+    connection.execute("INSERT INTO state VALUES ('W1D1_Backsquat_0', 'true')")
+    connection.commit()
+
+    store = SQLiteStateStore(db_path)
+    assert store.load() == {}
+    store.close()
+    assert connection.execute('SELECT COUNT(*) FROM state').fetchone() == (1,)
+    connection.close()
+
+
+def test_migrate_json_state(tmp_path):
+    json_store = JSONFileStateStore(tmp_path / 'app_state.json')
+    json_store.set_many({'W1D1_Backsquat_0': True, 'W1D1_Backsquat_comment': 'ok'})
+
+    store = SQLiteStateStore(tmp_path / 'app_state.db')
+    alice = store.with_namespace('alice', 'abc')
+    assert migrate_json_state(tmp_path / 'app_state.json', alice) == 2
+    assert alice.load() == {'W1D1_Backsquat_0': True, 'W1D1_Backsquat_comment': 'ok'}
+    store.close()
+    json_store.close()
@@ -0,0 +1,49 @@
+import pytest
+
+from pr_pro.configs import ComputeConfig
+from pr_pro.exercise import PowerExercise
+from pr_pro.program import Program
+from pr_pro.synthetic import SyntheticProgramConfig, generate_program
+
+
+def test_generate_program_is_reproducible(synthetic_program):
+    same = generate_program(SyntheticProgramConfig(n_sessions=24), seed=42)
+    assert same == synthetic_program
+    assert str(same) == str(synthetic_program)
+    assert generate_program(SyntheticProgramConfig(n_sessions=24), seed=43) != synthetic_program
+
+
+def test_generate_program_structure(synthetic_program):
+    assert len(synthetic_program.workout_session_dict) == 24
+    assert list(synthetic_program.workout_session_dict)[:4] == ['W1D1', 'W1D2', 'W1D3', 'W2D1']
+    # 3 sessions per week, 4 weeks per phase
+    assert list(synthetic_program.program_phases) == ['Phase 1', 'Phase 2']
+    assert len(synthetic_program.program_phases['Phase 1']) == 12
+
+    for session in synthetic_program.workout_session_dict.values():
+        assert 3 <= len(session.workout_components) <= 6
+
+
+def test_generate_program_n_sets():
+    config = SyntheticProgramConfig(n_sets=2000, sets_per_component=(5, 5))
+    program = generate_program(config)
+    n_sets = sum(s.get_number_of_sets() for s in program.workout_session_dict.values())
+    assert 2000 <= n_sets < 2000 + 6 * 5 * 3
+
+
+def test_generate_program_compute_and_json_round_trip(synthetic_program, tmp_path):
+    synthetic_program.compute_values(ComputeConfig())
+    file_path = tmp_path / 'synthetic.json'
+    synthetic_program.write_json_file(file_path)
+    assert Program.from_json_file(file_path) == synthetic_program
+
+
+def test_generate_program_exercise_types():
+    config = SyntheticProgramConfig(n_sessions=3, exercise_type_weights={PowerExercise: 1.0})
+    program = generate_program(config)
+    assert all(isinstance(e, PowerExercise) for e in program.best_exercise_values)
+
+
+def test_config_validation():
+    with pytest.raises(ValueError, match='n_exercises'):
+        SyntheticProgramConfig(n_exercises=5)
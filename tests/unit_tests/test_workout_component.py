@@ -123,3 +123,15 @@ class TestExerciseGroup:
 
         # Check original is unchanged
         assert prev_group.exercise_sets_dict[bench_press][0].reps == 10  # type: ignore
+
+
+def test_summary_after_from_prev_component():
+    """Tests that components derived from previous ones don't reuse a stale summary."""
+    prev_component = SingleExercise(exercise=backsquat)
+    prev_component.add_repeating_set(3, backsquat.create_set(reps=10, weight=100))
+    assert prev_component.get_summary().volume == 30
+
+    new_comp = SingleExercise.from_prev_component(prev_component, sets=+1, reps=-2)
+    assert new_comp.get_summary().n_sets == 4
+    assert new_comp.get_summary().volume == 32
+    assert new_comp.get_summary().tonnage == 3200
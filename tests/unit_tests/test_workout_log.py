@@ -0,0 +1,118 @@
+import datetime
+import io
+from pathlib import Path
+
+import pytest
+
+from pr_pro.configs import ComputeConfig
+from pr_pro.example import get_simple_example_program
+from pr_pro.program import Program
+from pr_pro.workout_log import PerformedSet, WorkoutLog
+
+
+@pytest.fixture
+def program() -> Program:
+    program = get_simple_example_program()
+    program.compute_values(ComputeConfig())
+    return program
+
+
+def test_append_and_reload(tmp_path: Path):
+    log = WorkoutLog(tmp_path)
+    timestamp = datetime.datetime(2025, 3, 1, 18, 30)
+    entries = [
+        PerformedSet('W1D1', 0, 'Backsquat', 0, reps=5, weight=57.5, timestamp=timestamp),
+        PerformedSet('W1D1', 1, 'Pushup', 1, reps=12, rpe=8),
+    ]
+    log.extend(entries)
+    log.flush()
+    log.append(PerformedSet('W1D2', 0, 'Backsquat', 0, reps=3))
+
+    # Unflushed entries are not persisted
+    reloaded = WorkoutLog(tmp_path)
+    assert reloaded.get_entries() == entries
+    assert reloaded.get_entries('W1D1')[1].rpe == 8
+    assert reloaded.get_entries('unknown') == []
+
+    log.flush()
+    assert len(WorkoutLog(tmp_path)) == 3
+
+
+def test_partially_written_entry_is_discarded(tmp_path: Path):
+    log = WorkoutLog(tmp_path)
+    log.append(PerformedSet('W1D1', 0, 'Backsquat', 0, reps=5))
+    log.flush()
+
+    # Simulates a crash while appending the second entry
+    with open(tmp_path / 'session.bin', 'ab') as f:
+        f.write(b'\x01\x00')
+
+    reloaded = WorkoutLog(tmp_path)
+    assert len(reloaded) == 1
+    reloaded.append(PerformedSet('W1D1', 0, 'Backsquat', 1, reps=4))
+    reloaded.flush()
+    assert [e.set_index for e in WorkoutLog(tmp_path).get_entries()] == [0, 1]
+
+
+def test_import_csv(program: Program):
+    source = io.StringIO(
+        'session,component,exercise,set,reps,weight,timestamp\n'
+        'W1D1,Backsquat,Backsquat,1,5,55,2025-03-01T18:00:00\n'
+        'W1D1,Backsquat,Backsquat,2,4,55,\n'
+        'W1D1,2,Pushup,1,10,,\n'
+    )
+    log = WorkoutLog()
+    assert log.import_csv(source, program=program, chunk_size=2) == 3
+
+    entries = log.get_entries()
+    assert entries[0].component_index == 0
+    assert entries[0].timestamp == datetime.datetime(2025, 3, 1, 18)
+    assert entries[1].reps == 4
+    assert entries[2].component_index == 1
+    assert entries[2].weight is None
+
+
+def test_import_csv_rejects_partial_reps():
+    log = WorkoutLog()
+    log.import_csv(io.StringIO('session,component,exercise,set,reps\nW1D1,1,Backsquat,1,5.0\n'))
+    assert log.get_entries()[0].reps == 5
+
+    with pytest.raises(ValueError, match='whole number'):
+        log.import_csv(io.StringIO('session,component,exercise,set,reps\nW1D1,1,Backsquat,1,5.5\n'))
+
+
+def test_adherence(program: Program):
+    log = WorkoutLog()
+    log.append(PerformedSet('W1D1', 0, 'Backsquat', 0, reps=5, weight=55))
+    log.append(PerformedSet('W1D1', 0, 'Backsquat', 1, reps=2, weight=55))
+    # Later entries of the same planned set supersede earlier ones
+    log.append(PerformedSet('W1D1', 0, 'Backsquat', 1, reps=5, weight=55))
+    # Not planned: does not count as performed set, but as volume
+    log.append(PerformedSet('W1D1', 0, 'Backsquat', 5, reps=1, weight=55))
+    log.append(PerformedSet('unknown', 0, 'Backsquat', 0, reps=5, weight=55))
+
+    adherence = log.get_adherence(program)
+    planned = program.get_workout_session_by_id('W1D1').get_summary()  # type: ignore
+    w1d1 = adherence['W1D1']
+    assert w1d1.planned_sets == planned.n_sets
+    assert w1d1.performed_sets == 2
+    assert w1d1.performed_volume == 11
+    assert w1d1.performed_tonnage == pytest.approx(11 * 55)
+    assert w1d1.set_ratio == pytest.approx(2 / planned.n_sets)
+    assert list(adherence) == list(program.workout_session_dict)
+
+    program.add_program_phase('Block', list(program.workout_session_dict))
+    assert log.get_adherence(program, by='phase')['Block'].performed_sets == 2
+
+
+def test_log_checked_sets(program: Program):
+    log = WorkoutLog()
+    state = {
+        'W1D1_Backsquat_0': True,
+        'W1D1_Backsquat_1': False,
+        'W1D1_Pendlay row_Pushup_0': True,
+    }
+    assert log.log_checked_sets(program, state) == 3
+    assert log.get_entries()[0].weight == pytest.approx(55)
+    assert [e.exercise for e in log.get_entries()[1:]] == ['Pendlay row', 'Pushup']
+    assert log.get_adherence(program)['W1D1'].performed_sets == 3